@@ -1,7 +1,6 @@
 #!/usr/env/python3
 
-from moose import MOOSEInput
-from variables import Variable, Variables, Order, Family
+from moose import MOOSEInput, Variable, Variables, Order, Family
 
 class MooseThermoMechanicalProblem():
     def __init__(self, dependent_input = ""):
@@ -22,12 +21,12 @@ class MooseThermoMechanicalProblem():
         self.moose.variables = variables
 
         #### make the global parameters
-        from global_parameters import GlobalParameters
+        from moose import GlobalParameters
         global_params = GlobalParameters(displacements=[disp_x,disp_y,disp_z], volumetric_locking_correction=True)
         self.moose.global_params = global_params
 
         #### make the mesh
-        from mesh import Mesh, MeshObjectTypes, TransformGenerator, TransformTypes
+        from moose import Mesh, MeshObjectTypes, TransformGenerator, TransformTypes
         mesh = Mesh()
         mesh.add_mesh_object("filemesh", type = MeshObjectTypes.FileMeshGenerator, \
             filename = "../divertor-monoblock.e")
@@ -37,7 +36,7 @@ class MooseThermoMechanicalProblem():
         self.moose.mesh = mesh
 
         #### make some aux_variables
-        from variables import AuxVariable, AuxVariables
+        from moose import AuxVariable, AuxVariables
         temperature = Variable(name="temperature", order = Order.FIRST, family = Family.LAGRANGE)
         temp_in_C = Variable(name="temp_in_C", order = Order.FIRST, family = Family.LAGRANGE)
         stress_xx = Variable(name="stress_xx_nodal", order = Order.FIRST, family = Family.MONOMIAL)
@@ -62,7 +61,7 @@ class MooseThermoMechanicalProblem():
         self.moose.aux_variables = aux_variables
 
         #### make some kernels
-        from kernels import Kernels, Kernel, ADHeatConduction, ADHeatConductionTimeDerivative, TensorMechanics, ADGravity
+        from moose import Kernels, Kernel, ADHeatConduction, ADHeatConductionTimeDerivative, TensorMechanics, ADGravity
         #heat = ADHeatConduction("heat-conduction", variable = temperature, thermal_conductivity = "thermal_conductivity")
         #heat_dt = ADHeatConductionTimeDerivative("heat-conduction-dt", variable = temperature, density = "density", \
         #        specific_heat="specific_heat")
@@ -80,8 +79,8 @@ class MooseThermoMechanicalProblem():
         self.moose.kernels = physics_kernels
 
         #### make some aux kernels
-        from kernels import AuxKernels, ParsedAux, ADRankTwoAux, ADRankTwoScalarAux, ScalarType
-        from functions import PolynomialFunction
+        from moose import AuxKernels, ParsedAux, ADRankTwoAux, ADRankTwoScalarAux, ScalarType
+        from moose import PolynomialFunction
         tempfunction = PolynomialFunction("",[0.0,0.0,0.0,temperature,],\
             coefficients=[0.,0.,0.,1.,-273.15])
 
@@ -107,11 +106,11 @@ class MooseThermoMechanicalProblem():
         self.moose.aux_kernels = aux_kernels
 
         #### Materials and Functions
-        from materials import Materials, Material, ADHeatConductionMaterial, \
+        from moose import Materials, Material, ADHeatConductionMaterial, \
             ADPiecewiseLinearInterpolationMaterial, ADComputeVariableIsotropicElasticityTensor, \
             ADComputeLinearElasticStress,ADComputeSmallStrain, ADComputeMeanThermalExpansionFunctionEigenstrain, \
             ADGenericFunctionMaterial
-        from functions import Functions, PiecewiseFunction, PolynomialFunction, PiecewiseLinear
+        from moose import Functions, PiecewiseFunction, PolynomialFunction, PiecewiseLinear
 
         materials = Materials()
         functions = Functions()
@@ -172,7 +171,7 @@ class MooseThermoMechanicalProblem():
         self.moose.functions = functions
 
         ####  boundary conditions
-        from boundary_conditions import BoundaryCondition, BoundaryConditions, BoundaryConditionTypes, ADNeumannBC, ADDirichletBC, ADConvectiveHeatFluxBC, Pressure
+        from moose import BoundaryCondition, BoundaryConditions, BoundaryConditionTypes, ADNeumannBC, ADDirichletBC, ADConvectiveHeatFluxBC, Pressure
         #heat_load = ADNeumannBC(name="heat_load",variable = temperature, boundary = "heat-load", value ="5e6")
         #htc_bc = ADConvectiveHeatFluxBC(name="htc_bc", variable=temperature, boundary = 'pressure-bc', heat_transfer_coefficient=htc_material, t_infinity=293.15)
         fixed_x = ADDirichletBC(name="fixed-x", variable=disp_x, boundary="fixed-disp", value=0.0)
@@ -191,7 +190,7 @@ class MooseThermoMechanicalProblem():
         self.moose.boundary_conditions = bcs
 
         #### post processors
-        from postprocessors import PostProcessor,PostProcessors,PostProcessorTypes, \
+        from moose import PostProcessor,PostProcessors,PostProcessorTypes, \
             ElementAverageValue, ElementExtremeValue
 
         min_temp = ElementExtremeValue("min_temp", variable = temp_in_C, value_type = "min")
@@ -215,8 +214,8 @@ class MooseThermoMechanicalProblem():
         self.moose.post_processors = postprocs
 
         #### multiapps
-        from executioner import ExectutionTypes
-        from multiapps import MultiApps, TransientMultiApp, AppTypes
+        from moose import ExectutionTypes
+        from moose import MultiApps, TransientMultiApp, AppTypes
         multi = MultiApps()
         thm = TransientMultiApp(name = "thm", app_type = AppTypes.ThermalHydraulicsApp, \
             input_files = [self.dependent_input], \
@@ -225,7 +224,7 @@ class MooseThermoMechanicalProblem():
         self.moose.multiapps = multi
 
         #### transfers
-        from transfers import MultiAppNearestNodeTransfer,Transfers
+        from moose import MultiAppNearestNodeTransfer,Transfers
         trans = Transfers()
         t_solid = Variable(name = 'T_solid', order = Order.FIRST, family = Family.LAGRANGE )
         transfer = MultiAppNearestNodeTransfer(name = "T_from_thm", source_variable = t_solid, \
@@ -234,7 +233,7 @@ class MooseThermoMechanicalProblem():
         self.moose.transfers = trans
 
         #### executioner
-        from executioner import Executioner
+        from moose import Executioner
         exec = Executioner()
         solve_options = {}
         solve_options["automatic_scaling"] = "true"
@@ -255,7 +254,7 @@ class MooseThermoMechanicalProblem():
         self.moose.executioner = exec
 
         #### outputs
-        from outputs import Outputs
+        from moose import Outputs
         output = Outputs(exodus=True, csv=True)
         self.moose.outputs = output
 
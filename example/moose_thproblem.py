@@ -1,7 +1,6 @@
 #!/usr/env/python3
 
-from moose import MOOSEInput
-from variables import Variable, Variables, Order, Family
+from moose import MOOSEInput, Variable, Variables, Order, Family
 
 class MooseTHMProblem():
     def __init__(self):
@@ -15,7 +14,7 @@ class MooseTHMProblem():
         t_solid = Variable(name = "T_solid", order = 1, family = 1)
 
         #### make the fluid properties
-        from fluidproperties import FluidProperties, FluidProperty, SimpleFluidProperties, StiffenedGasFluidProperties
+        from moose import FluidProperties, FluidProperty, SimpleFluidProperties, StiffenedGasFluidProperties
         fluid_properties = FluidProperties()
         #fluid = SimpleFluidProperties(name = "water", bulk_modulus = 2.0e9, \
         #    cp = 4194, cv = 4186, density0 = 1000, fp_type = "single-phase-fp", \
@@ -28,18 +27,18 @@ class MooseTHMProblem():
         self.moose.fluid_properties = fluid_properties
 
         #### closures 
-        from closures import Closures, Closures1PhaseSimple
+        from moose import Closures, Closures1PhaseSimple
         closures = Closures()
         simple_fluid = Closures1PhaseSimple(name="simple_closure")
         closures.closures[simple_fluid.name] = simple_fluid
         self.moose.closures = closures
 
         #### Materials and Functions
-        from materials import Materials, Material, ADHeatConductionMaterial, \
+        from moose import Materials, Material, ADHeatConductionMaterial, \
             ADPiecewiseLinearInterpolationMaterial, ADComputeVariableIsotropicElasticityTensor, \
             ADComputeLinearElasticStress,ADComputeSmallStrain, ADComputeMeanThermalExpansionFunctionEigenstrain, \
             ADGenericFunctionMaterial
-        from functions import Functions, PiecewiseFunction, PolynomialFunction, PiecewiseLinear
+        from moose import Functions, PiecewiseFunction, PolynomialFunction, PiecewiseLinear
 
         materials = Materials()
         functions = Functions()
@@ -68,7 +67,7 @@ class MooseTHMProblem():
         self.moose.materials = materials
 
         # add some components
-        from components import Components, HeatStructureFromFile3D, \
+        from moose import Components, HeatStructureFromFile3D, \
             HSBoundaryRadiation, HSBoundaryHeatFlux, FlowChannel1Phase, \
             InletMassFlowRateTemperature1Phase, Outlet1Phase, \
             HeatTransferFromHeatStructure3D1Phase
@@ -109,7 +108,7 @@ class MooseTHMProblem():
         self.moose.components = comps
 
         #### post processors
-        from postprocessors import PostProcessor,PostProcessors,PostProcessorTypes, \
+        from moose import PostProcessor,PostProcessors,PostProcessorTypes, \
             ElementAverageValue, ElementExtremeValue
 
         blocks = ""
@@ -131,7 +130,7 @@ class MooseTHMProblem():
         self.moose.post_processors = postprocs
 
         #### executioner
-        from executioner import Executioner
+        from moose import Executioner
         exec = Executioner()
         solve_options = {}
         solve_options["type"] = "Transient"
@@ -150,7 +149,7 @@ class MooseTHMProblem():
         self.moose.executioner = exec
 
         #### outputs
-        from outputs import Outputs
+        from moose import Outputs
         output = Outputs(exodus=True, csv=True)
         self.moose.outputs = output
 
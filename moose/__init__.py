@@ -0,0 +1,93 @@
+#!/usr/env/python3
+
+""" The public classes of every module, as attributes of the package:
+moose.MOOSEInput, moose.Kernels and so on. Each module is imported the
+first time one of its names is used, so import moose itself loads
+nothing else and costs next to no time at startup.
+"""
+
+# the public names of each module
+_modules = {
+    'batch': ('WorkerReport', 'BatchReport', 'write_batch'),
+    'block': ('Block',),
+    'boundary_conditions': ('BoundaryConditionTypes', 'BoundaryCondition',
+        'ADDirichletBC', 'ADNeumannBC', 'ADConvectiveHeatFluxBC', 'Pressure',
+        'BoundaryConditions'),
+    'closures': ('ClosureType', 'Closure', 'Closures1PhaseSimple',
+        'Closures1PhaseNone', 'Closures'),
+    'components': ('ComponentType', 'Component', 'HeatStructureFromFile3D',
+        'HeatTransferFromExternalAppTemperature1Phase',
+        'HeatTransferFromSpecifiedTemperature1Phase', 'HSBoundaryRadiation',
+        'HSBoundaryHeatFlux', 'FlowChannel1Phase',
+        'InletMassFlowRateTemperature1Phase', 'Outlet1Phase',
+        'VolumeJunction1Phase', 'JunctionOneToOne1Phase',
+        'HeatTransferFromHeatStructure3D1Phase', 'Components'),
+    'csvtail': ('csv_filename', 'PostprocessorCSV', 'CSVWatcher'),
+    'executioner': ('ExectutionTypes', 'Executioner'),
+    'exodus': ('NetCDFVariable', 'NetCDFHeader', 'ExodusSet', 'ExodusInfo',
+        'read_exodus'),
+    'fluidproperties': ('FluidPropertyTypes', 'FluidProperty',
+        'SimpleFluidProperties', 'IdealGasFluidProperties',
+        'StiffenedGasFluidProperties', 'FluidProperties'),
+    'functions': ('MooseFunctionTypes', 'PiecewiseFunction',
+        'PolynomialFunction', 'GenericFunction', 'ParsedFunction',
+        'PiecewiseLinear', 'Functions'),
+    'global_parameters': ('GlobalParameters',),
+    'instrument': ('WriteStats', 'WriteProfile', 'ProfilingWriter'),
+    'kernels': ('ScalarType', 'AuxKernelTypes', 'KernelTypes', 'Kernel',
+        'ADHeatConduction', 'ADHeatConductionTimeDerivative',
+        'TensorMechanics', 'ADGravity', 'AuxKernel', 'ParsedAux',
+        'ADRankTwoAux', 'ADRankTwoScalarAux', 'Kernels', 'AuxKernels'),
+    'library': ('PropertyUse', 'MaterialLibrary'),
+    'manifest': ('HashManifest',),
+    'materials': ('MaterialTypes', 'Material',
+        'ADPiecewiseLinearInterpolationMaterial', 'ADParsedMaterial',
+        'ADHeatConductionMaterial',
+        'ADComputeVariableIsotropicElasticityTensor',
+        'ADComputeMeanThermalExpansionFunctionEigenstrain',
+        'ADComputeSmallStrain', 'ADComputeLinearElasticStress',
+        'ADGenericFunctionMaterial', 'Materials'),
+    'mesh': ('MeshObjectTypes', 'TransformTypes', 'MeshObject',
+        'FileMeshGenerator', 'TransformGenerator', 'Mesh'),
+    'moose': ('MOOSEInput',),
+    'multiapps': ('MultiAppTypes', 'AppTypes', 'MultiApp', 'CentroidMultiApp',
+        'FullSolveMultiApp', 'TransientMultiApp', 'MultiApps'),
+    'outputs': ('Outputs',),
+    'postprocessors': ('PostProcessorTypes', 'PostProcessor',
+        'NodalExtremeValue', 'ElementExtremeValue', 'ElementAverageValue',
+        'PostProcessors'),
+    'reader': ('HITSyntaxError', 'HITNode', 'parse_hit', 'RawParameter',
+        'HITReader'),
+    'render': ('RenderCache', 'Renderable', 'RenderDict'),
+    'results': ('file_digest', 'canonical', 'input_tree', 'fingerprint',
+        'output_prefix', 'ResultCache'),
+    'runner': ('RunResult', 'Runner'),
+    'snapshot': ('write_snapshot', 'read_snapshot'),
+    'sweep': ('SamplerTypes', 'ScaleTypes', 'Parameter', 'sobol', 'Sweep',
+        'read_manifest'),
+    'tables': ('as_table', 'table_digest', 'Simplification', 'simplify_table'),
+    'transfers': ('TransferType', 'Transfer', 'MultiAppNearestNodeTransfer',
+        'Transfers'),
+    'validate': ('Problem',),
+    'variables': ('Order', 'Family', 'Variable', 'AuxVariable', 'Variables',
+        'AuxVariables'),
+    'writer': ('TableFiles', 'BlockFiles', 'HITWriter'),}
+
+_names = {name: module for module, names in _modules.items() for name in names}
+
+__all__ = sorted(_names)
+
+def __getattr__(name):
+    # importlib itself is only loaded once something is used
+    import importlib
+    if name in _names:
+        value = getattr(importlib.import_module(f'{__name__}.{_names[name]}'), name)
+        # found by the usual lookup from now on
+        globals()[name] = value
+        return value
+    if name in _modules:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    return sorted(set(globals()) | set(_names) | set(_modules))
@@ -0,0 +1,140 @@
+#!/usr/env/python3
+
+""" Writing many variants of one base MOOSEInput across a pool of worker
+processes. The base input is pickled once per worker, when the worker
+starts; each task then carries only a chunk of variant descriptions, the
+file name and the path: value changes to make to a clone of the base, so
+the cost of sending work does not grow with the size of the model.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# the base input of this worker process, set by _start_worker
+_base = None
+
+def _start_worker(base):
+    global _base
+    _base = base
+
+def _write_chunk(chunk, base = None, table_dir = None, table_threshold = 1000,
+                 skip_unchanged = False, split_dir = None):
+    # write each (filename, values) of chunk; returns what this worker did
+    base = _base if base is None else base
+    start = time.perf_counter()
+    size = 0
+    skipped = 0
+    for filename, values in chunk:
+        variant = base.clone()
+        for path, value in values.items():
+            variant.set(path, value)
+        if variant.write(filename, table_dir, table_threshold, skip_unchanged, split_dir):
+            size = size + os.path.getsize(filename)
+        else:
+            skipped = skipped + 1
+    return os.getpid(), len(chunk) - skipped, size, time.perf_counter() - start, skipped
+
+class WorkerReport():
+    def __init__(self, pid):
+        self.pid = pid
+        self.files = 0
+        self.skipped = 0
+        self.bytes = 0
+        self.seconds = 0.
+
+    def files_per_second(self):
+        return self.files/self.seconds if self.seconds > 0 else 0.
+
+    def megabytes_per_second(self):
+        return self.bytes/1e6/self.seconds if self.seconds > 0 else 0.
+
+class BatchReport():
+    """ files and bytes written by each worker and the time it spent
+    writing them, and the wall time of the whole batch """
+    def __init__(self):
+        self.workers = {}
+        self.seconds = 0.
+
+    def add(self, pid, files, size, seconds, skipped = 0):
+        if pid not in self.workers.keys():
+            self.workers[pid] = WorkerReport(pid)
+        worker = self.workers[pid]
+        worker.files = worker.files + files
+        worker.skipped = worker.skipped + skipped
+        worker.bytes = worker.bytes + size
+        worker.seconds = worker.seconds + seconds
+
+    def files(self):
+        return sum(worker.files for worker in self.workers.values())
+
+    def skipped(self):
+        return sum(worker.skipped for worker in self.workers.values())
+
+    def files_per_second(self):
+        return self.files()/self.seconds if self.seconds > 0 else 0.
+
+    def as_dict(self):
+        return {'seconds': self.seconds, 'files': self.files(), 'skipped': self.skipped(),
+                'files_per_second': self.files_per_second(),
+                'workers': [{'pid': w.pid, 'files': w.files, 'skipped': w.skipped,
+                             'bytes': w.bytes,
+                             'seconds': w.seconds,
+                             'files_per_second': w.files_per_second()}
+                            for w in self.workers.values()]}
+
+    def __str__(self):
+        string = f'{self.files()} files in {self.seconds:.2f} s, {self.files_per_second():.1f} files/s'
+        if self.skipped():
+            string += f', {self.skipped()} unchanged'
+        string += '\n'
+        for worker in self.workers.values():
+            string += f'  worker {worker.pid}: {worker.files} files, ' \
+                      f'{worker.files_per_second():.1f} files/s, {worker.megabytes_per_second():.1f} MB/s\n'
+        return string
+
+def _chunks(variants, chunksize):
+    chunk = []
+    for variant in variants:
+        chunk.append(variant)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def write_batch(base, variants, workers = None, chunksize = 16, table_dir = None,
+                table_threshold = 1000, skip_unchanged = False, split_dir = None):
+    """ write a clone of base for each (filename, values) of variants, values
+    being a dict of path: value as taken by MOOSEInput.set. workers is the
+    number of processes, os.cpu_count() if None, or 0 to write in this
+    process; chunksize is the number of variants sent to a worker at once.
+    variants is read as it is needed, so it may be a generator of any
+    length. table_dir, table_threshold, skip_unchanged and split_dir are
+    passed to MOOSEInput.write; files left unchanged are counted as skipped.
+    Returns a BatchReport """
+    report = BatchReport()
+    start = time.perf_counter()
+    if workers == 0:
+        for chunk in _chunks(variants, chunksize):
+            report.add(*_write_chunk(chunk, base, table_dir, table_threshold, skip_unchanged,
+                                      split_dir))
+        report.seconds = time.perf_counter() - start
+        return report
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                             initargs=(base,)) as executor:
+        pending = set()
+        for chunk in _chunks(variants, chunksize):
+            # keep a couple of chunks queued per worker, no more
+            if len(pending) >= 2*workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    report.add(*future.result())
+            pending.add(executor.submit(_write_chunk, chunk, None, table_dir, table_threshold,
+                                        skip_unchanged, split_dir))
+        for future in pending:
+            report.add(*future.result())
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,232 @@
+#!/usr/env/python3
+
+""" Benchmarks of building, writing and reading synthetic models of a given
+scale: kernels over a number of blocks, materials per block with tables of
+table_points points, and a chain of THM components, along with import
+moose, validating the model and adding kernels by add_many against
+add_kernel. Each benchmark reports its best time over repeat runs and the
+peak memory traced over one more, and the results are written as JSON to
+compare between releases:
+
+    python -m moose.benchmark --scale medium --output results.json
+
+Scales are the presets in scales, or any of their sizes set on the command
+line, e.g. --table-points 1000000.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from moose.moose import MOOSEInput
+from moose.mesh import Mesh
+from moose.variables import Variables
+from moose.kernels import Kernels
+from moose.functions import Functions, PiecewiseLinear
+from moose.materials import Materials
+from moose.components import Components, FlowChannel1Phase, \
+    InletMassFlowRateTemperature1Phase, Outlet1Phase
+from moose.render import render_cache
+from moose.tables import as_table, format_table, numpy
+
+# the sizes of the model at each preset scale
+scales = {
+    'small': {'kernels': 100, 'blocks': 10, 'materials_per_block': 4,
+              'components': 50, 'table_points': 1000},
+    'medium': {'kernels': 1000, 'blocks': 50, 'materials_per_block': 10,
+               'components': 500, 'table_points': 10000},
+    'large': {'kernels': 10000, 'blocks': 200, 'materials_per_block': 20,
+              'components': 5000, 'table_points': 100000},
+}
+
+# the table sizes of the table benchmark
+table_sizes = (10**3, 10**4, 10**5, 10**6)
+
+def build_model(kernels, blocks, materials_per_block, components, table_points):
+    """ a MOOSEInput of the given sizes. Each block has a PiecewiseLinear
+    table of table_points points shared by its materials """
+    moose = MOOSEInput()
+    moose.mesh = Mesh()
+    moose.mesh.add_mesh_object("mesh", 1, filename="mesh.e")
+    moose.variables = Variables()
+    moose.variables.add_variable("temperature", 1, 1, "")
+    temperature = moose.variables.variables["temperature"]
+
+    moose.kernels = Kernels()
+    for idx in range(kernels):
+        moose.kernels.add_kernel(f'heat_{idx}', 1, temperature, f'block_{idx % blocks}',
+                                 thermal_conductivity='thermal_conductivity')
+
+    moose.functions = Functions()
+    moose.materials = Materials()
+    x = as_table([300. + 0.1*i for i in range(table_points)])
+    for block in range(blocks):
+        y = as_table([1. + 1e-3*block + 1e-4*i for i in range(table_points)])
+        table = PiecewiseLinear(f'k_{block}', x=x, y=y)
+        moose.functions.functions[table.name] = table
+        for idx in range(materials_per_block):
+            moose.materials.add_material(f'material_{block}_{idx}', 3, f'block_{block}',
+                                         specific_heat=table, thermal_conductivity=table,
+                                         variable=temperature)
+
+    moose.components = Components()
+    pipes = [FlowChannel1Phase(f'pipe_{idx}', A=1e-3, length=1., n_elems=10,
+                               position=[idx, 0, 0]) for idx in range(components)]
+    for pipe in pipes:
+        moose.components.components[pipe.name] = pipe
+    if pipes:
+        inlet = InletMassFlowRateTemperature1Phase('inlet', input=pipes[0], m_dot=1.)
+        outlet = Outlet1Phase('outlet', input=pipes[-1], pressure=1e5)
+        moose.components.components.update({inlet.name: inlet, outlet.name: outlet})
+    return moose
+
+def kernel_rows(rows):
+    """ columns of rows ADHeatConduction kernels, as taken by add_many """
+    return {'name': [f'k{i}' for i in range(rows)], 'type': ['ADHeatConduction']*rows,
+            'variable': ['temperature']*rows, 'block': [f'b{i}' for i in range(rows)],
+            'thermal_conductivity': ['k']*rows}
+
+def _add_many(variables, data):
+    Kernels().add_many(data, references={'variable': variables.variables})
+
+def _add_kernel(variables, data):
+    kernels = Kernels()
+    temperature = variables.variables['temperature']
+    for name, block in zip(data['name'], data['block']):
+        kernels.add_kernel(name, 1, temperature, block, thermal_conductivity='k')
+
+def measure(function, repeat = 3):
+    """ the best time of repeat calls of function, the peak memory traced
+    over one more, and what the last call returned """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = function()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak, value
+
+def _write(moose):
+    stream = io.StringIO()
+    moose.write(stream)
+    return stream.getvalue()
+
+def _write_cold(moose):
+    # a write with every render cache empty, as of a new model
+    enabled = render_cache.enabled
+    render_cache.enabled = False
+    try:
+        return _write(moose)
+    finally:
+        render_cache.enabled = enabled
+
+# the time and peak memory of import moose, in a new interpreter
+_import = 'import sys, time, tracemalloc\n' \
+          'if sys.argv[1] == "trace": tracemalloc.start()\n' \
+          'start = time.perf_counter()\n' \
+          'import moose\n' \
+          'print(time.perf_counter() - start, tracemalloc.get_traced_memory()[1])\n'
+
+def _import_moose(repeat):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ, PYTHONPATH=root)
+    def run(mode):
+        # from root, as with -c the working directory is searched first
+        output = subprocess.run([sys.executable, '-c', _import, mode], cwd=root,
+                                env=environment, capture_output=True, text=True,
+                                check=True).stdout
+        return [float(value) for value in output.split()]
+    seconds = min(run('time')[0] for _ in range(repeat))
+    return seconds, int(run('trace')[1])
+
+def _read(text):
+    moose = MOOSEInput()
+    moose.read(io.StringIO(text))
+    return moose
+
+def run(sizes, repeat = 3, tables = table_sizes):
+    """ run every benchmark on a model of sizes, a dict as in scales;
+    returns a list of results, each a dict of name, seconds, peak_bytes and
+    rates """
+    seconds, peak = _import_moose(repeat)
+    results = [{'name': 'import', 'seconds': seconds, 'peak_bytes': peak}]
+    objects = sizes['kernels'] + sizes['blocks']*(sizes['materials_per_block'] + 1) \
+        + sizes['components']
+
+    seconds, peak, moose = measure(lambda: build_model(**sizes), repeat)
+    results.append({'name': 'construct', 'seconds': seconds, 'peak_bytes': peak,
+                    'objects': objects, 'objects_per_second': objects/seconds})
+
+    for name, write in (('write_cold', _write_cold), ('write_warm', _write)):
+        _write(moose)
+        seconds, peak, text = measure(lambda: write(moose), repeat)
+        results.append({'name': name, 'seconds': seconds, 'peak_bytes': peak,
+                        'bytes': len(text), 'mb_per_second': len(text)/1e6/seconds})
+
+    seconds, peak, _ = measure(lambda: _read(text), repeat)
+    results.append({'name': 'read', 'seconds': seconds, 'peak_bytes': peak,
+                    'bytes': len(text), 'mb_per_second': len(text)/1e6/seconds})
+
+    seconds, peak, _ = measure(lambda: moose.validate(), repeat)
+    results.append({'name': 'validate', 'seconds': seconds, 'peak_bytes': peak,
+                    'objects': objects, 'objects_per_second': objects/seconds})
+
+    variables = Variables()
+    variables.add_variable('temperature', 1, 1, '')
+    data = kernel_rows(sizes['kernels'])
+    for name, add in (('add_many', _add_many), ('add_kernel', _add_kernel)):
+        seconds, peak, _ = measure(lambda: add(variables, data), repeat)
+        results.append({'name': name, 'seconds': seconds, 'peak_bytes': peak,
+                        'rows': sizes['kernels'], 'rows_per_second': sizes['kernels']/seconds})
+
+    for points in tables:
+        data = as_table([300. + 0.1*i for i in range(points)])
+        seconds, peak, text = measure(lambda: format_table(data), repeat)
+        results.append({'name': 'format_table', 'points': points, 'seconds': seconds,
+                        'peak_bytes': peak, 'points_per_second': points/seconds})
+    return results
+
+def environment():
+    """ what the results were measured on """
+    return {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+            'platform': platform.platform(), 'numpy': numpy.__version__ if numpy else None,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description='benchmark building, writing and reading models')
+    parser.add_argument('--scale', choices=sorted(scales), default='small')
+    for size in scales['small']:
+        parser.add_argument('--' + size.replace('_', '-'), type=int, dest=size)
+    parser.add_argument('--table-sizes', type=int, nargs='*', default=list(table_sizes))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='file to write the results to as JSON')
+    args = parser.parse_args(argv)
+
+    sizes = dict(scales[args.scale])
+    for size in sizes:
+        if getattr(args, size) is not None:
+            sizes[size] = getattr(args, size)
+    results = run(sizes, args.repeat, args.table_sizes)
+    report = {'environment': environment(), 'scale': args.scale, 'sizes': sizes,
+              'repeat': args.repeat, 'results': results}
+    for result in results:
+        label = result['name'] + (f" {result['points']}" if 'points' in result else '')
+        print(f"{label:<22} {result['seconds']*1000:10.2f} ms {result['peak_bytes']/1e6:10.2f} MB peak")
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    return report
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
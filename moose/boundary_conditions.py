@@ -1,6 +1,8 @@
 #!/usr/env/python3
 
 from enum import IntEnum, auto
+from moose.render import Renderable
+import moose.bulk as bulk
 
 class BoundaryConditionTypes(IntEnum):
     ADDirichletBC  = auto()
@@ -8,13 +10,15 @@ class BoundaryConditionTypes(IntEnum):
     ADConvectiveHeatFluxBC = auto()
     Pressure = auto()
 
-class BoundaryCondition:
+class BoundaryCondition(Renderable):
+    __slots__ = ('name', 'variable', 'boundary')
     def __init__(self, name = "", variable = None, boundary = "", **kwargs):
         self.name = name
         self.variable = variable
         self.boundary = boundary
 
 class ADDirichletBC(BoundaryCondition):
+    __slots__ = ('bc_type', 'value')
     def __init__(self, name = "", variable = None, boundary = "", **kwargs):
         super().__init__(name,variable,boundary)
         self.bc_type = BoundaryConditionTypes.ADDirichletBC
@@ -30,11 +34,13 @@ class ADDirichletBC(BoundaryCondition):
         return string
 
 class ADNeumannBC(ADDirichletBC):
+    __slots__ = ()
     def __init__(self, name = "", variable = None, boundary = "", **kwargs):
         super().__init__(name,variable,boundary,**kwargs)
         self.bc_type = BoundaryConditionTypes.ADNeumannBC
 
 class ADConvectiveHeatFluxBC(BoundaryCondition):
+    __slots__ = ('bc_type', 'heat_transfer_coefficient', 't_infinity')
     def __init__(self, name = "", variable = None, boundary = "", **kwargs):
         super().__init__(name,variable,boundary,**kwargs)
         self.bc_type = BoundaryConditionTypes.ADConvectiveHeatFluxBC
@@ -56,6 +62,7 @@ class ADConvectiveHeatFluxBC(BoundaryCondition):
         return string       
 
 class Pressure(BoundaryCondition): 
+    __slots__ = ('bc_type', 'pressure_value', 'displacements')
     def __init__(self, name = "", variable = None, boundary = "", **kwargs):
         super().__init__(name,variable,boundary,**kwargs)
         self.bc_type = BoundaryConditionTypes.Pressure
@@ -74,7 +81,14 @@ class Pressure(BoundaryCondition):
         string += '[]\n'
         return string  
 
-class BoundaryConditions:
+class BoundaryConditions(Renderable):
+    # the class of each boundary condition type, for add_boundary_condition
+    # and add_many
+    registry = {BoundaryConditionTypes.ADDirichletBC: ADDirichletBC,
+        BoundaryConditionTypes.ADNeumannBC: ADNeumannBC,
+        BoundaryConditionTypes.ADConvectiveHeatFluxBC: ADConvectiveHeatFluxBC,
+        BoundaryConditionTypes.Pressure: Pressure}
+
     def __init__(self):
         self.name = "BCs"
         self.boundary_conditions = {}
@@ -82,22 +96,28 @@ class BoundaryConditions:
     def add_boundary_condition(self,name,type,variable,boundary,**kwargs):
         if name in self.boundary_conditions.keys():
             print(f'BC name {name} already in use')
-        if type == BoundaryConditionTypes.ADDirichletBC:
-            bc = ADDirichletBC(name,variable,boundary,**kwargs)
-            self.boundary_conditions[name] = bc
-        elif type == BoundaryConditionTypes.ADNeumannBC:
-            bc = ADNeumannBC(name,variable,boundary,**kwargs)
-            self.boundary_conditions[name] = bc
-        elif type == BoundaryConditionTypes.ADConvectiveHeatFluxBC:
-            bc = ADConvectiveHeatFluxBC(name,variable,boundary,**kwargs)
-            self.boundary_conditions[name] = bc    
-        elif type == BoundaryConditionTypes.Pressure:
-            bc = Pressure(name,variable,boundary,**kwargs)
-            self.boundary_conditions[name] = bc  
+        if type not in self.registry.keys():
+            raise ValueError(f'unknown boundary condition type {type}')
+        self.boundary_conditions[name] = self.registry[type](name,variable,boundary,**kwargs)
+
+    def add_many(self, data, references = None):
+        """ add a boundary condition for each row of data, see moose.bulk;
+        returns them """
+        return bulk.add_many(self.boundary_conditions, data, BoundaryConditionTypes,
+            self.registry, _construct_bc, references)
+
+    def children(self):
+        return self.boundary_conditions
+
+    def write_hit(self, writer):
+        writer.write_collection(self.name, self.boundary_conditions.values())
 
     def __str__(self):
         string = f'[{self.name}]\n'
         for bc in self.boundary_conditions.keys():
             string += self.boundary_conditions[bc].__str__()
         string += f'[]\n'
-        return string
\ No newline at end of file
+        return string
+
+def _construct_bc(cls, bc_type, name, kwargs):
+    return cls(name, kwargs.pop('variable', None), kwargs.pop('boundary', ""), **kwargs)
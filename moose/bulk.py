@@ -0,0 +1,122 @@
+#!/usr/env/python3
+
+""" Adding many objects to a collection at once from columnar data: a dict
+of equal length columns (lists, tuples, array('d') or NumPy arrays), a
+NumPy record array, a pandas DataFrame, or a list of row dicts. Every row
+is checked before any object is made, and all the problems found are
+raised together in one ValueError. The objects are then made in one pass
+and added to the collection with a single invalidation of its cache.
+
+Each row needs a name and a type, an enum member, its value or its name.
+Other columns become keyword arguments of the class the collection's
+registry holds for the type; a None or NaN cell is left out, so rows of
+different types can share one table. Columns named in references hold
+names to look up, e.g. {'variable': moose.variables.variables}.
+"""
+
+# problems listed in full before the rest are counted
+max_problems = 20
+
+def columns_of(data):
+    """ data as a dict of column name: list of values """
+    if hasattr(data, 'dtype') and getattr(data.dtype, 'names', None):
+        # a NumPy record or structured array
+        return {name: data[name].tolist() for name in data.dtype.names}
+    if hasattr(data, 'to_dict') and hasattr(data, 'columns'):
+        # a pandas DataFrame
+        return {name: _values(data[name]) for name in data.columns}
+    if isinstance(data, (list, tuple)):
+        names = []
+        for row in data:
+            names.extend(key for key in row.keys() if key not in names)
+        return {name: [row.get(name) for row in data] for name in names}
+    return {name: _values(values) for name, values in data.items()}
+
+def _values(column):
+    if hasattr(column, 'tolist'):
+        return column.tolist()
+    return list(column)
+
+def _missing(value):
+    # None, or NaN as pandas and NumPy mark empty cells
+    return value is None or value != value
+
+def _type_of(value, types):
+    if isinstance(value, types):
+        return value
+    if isinstance(value, str):
+        return types[value]
+    return types(value)
+
+def add_many(children, data, types, registry, construct, references = None):
+    """ make an object for each row of data and add it to children, the
+    dict of a collection. types is the type enum, registry the class for
+    each type, and construct(cls, type, name, kwargs) makes one object.
+    Returns the list of objects made """
+    columns = columns_of(data)
+    references = references or {}
+    problems = []
+    for column in ('name', 'type'):
+        if column not in columns.keys():
+            problems.append(f'missing column {column}')
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        problems.append(f'columns have different lengths {sorted(lengths)}')
+    if problems:
+        raise ValueError('; '.join(problems))
+
+    names = columns.pop('name')
+    type_column = columns.pop('type')
+    rows = len(names)
+    row_types = [None]*rows
+    seen = set()
+    for idx in range(rows):
+        name = names[idx]
+        if name in seen or name in children:
+            problems.append(f'row {idx}: name {name} already in use')
+        seen.add(name)
+        try:
+            row_types[idx] = _type_of(type_column[idx], types)
+        except (KeyError, ValueError):
+            problems.append(f'row {idx}: unknown type {type_column[idx]}')
+            continue
+        if row_types[idx] not in registry.keys():
+            problems.append(f'row {idx}: type {row_types[idx].name} cannot be added')
+    for column, lookup in references.items():
+        for idx, value in enumerate(columns.get(column, ())):
+            if isinstance(value, str) and value not in lookup:
+                problems.append(f'row {idx}: no {column} named {value}')
+    if problems:
+        _raise(problems)
+
+    # parameters the classes require are checked as the objects are made;
+    # nothing is added unless every row makes an object
+    for column, lookup in references.items():
+        if column in columns.keys():
+            columns[column] = [lookup[value] if isinstance(value, str) else value
+                               for value in columns[column]]
+    objects = []
+    items = list(columns.items())
+    for idx in range(rows):
+        kwargs = {}
+        for column, values in items:
+            value = values[idx]
+            if not _missing(value):
+                kwargs[column] = value
+        row_type = row_types[idx]
+        try:
+            objects.append(construct(registry[row_type], row_type, names[idx], kwargs))
+        except KeyError as error:
+            problems.append(f'row {idx}: missing parameter {error}')
+        except (AttributeError, TypeError, ValueError) as error:
+            problems.append(f'row {idx}: {error}')
+    if problems:
+        _raise(problems)
+    children.update(zip(names, objects))
+    return objects
+
+def _raise(problems):
+    message = '; '.join(problems[:max_problems])
+    if len(problems) > max_problems:
+        message += f'; and {len(problems) - max_problems} more'
+    raise ValueError(message)
@@ -1,12 +1,14 @@
 #!/usr/env/python3
 
 from enum import IntEnum, auto
+from moose.render import Renderable
 
 class ClosureType(IntEnum):
     Closures1PhaseNone = auto()
     Closures1PhaseSimple = auto()
     
-class Closure:
+class Closure(Renderable):
+    __slots__ = ('name', 'type')
     def __init__(self, name = ""):
         self.name = name
 
@@ -17,20 +19,28 @@ class Closure:
         return string
 
 class Closures1PhaseSimple(Closure):
+    __slots__ = ()
     def __init__(self, name):
         super().__init__(name)
         self.type = ClosureType.Closures1PhaseSimple
 
 class Closures1PhaseNone(Closure):
+    __slots__ = ()
     def __init__(self, name):
         super().__init__(name)
         self.type = ClosureType.Closures1PhaseNone
 
-class Closures:
+class Closures(Renderable):
     def __init__(self):
         self.name = "Closures"
         self.closures = {}
 
+    def children(self):
+        return self.closures
+
+    def write_hit(self, writer):
+        writer.write_collection(self.name, self.closures.values())
+
     def __str__(self):
         string =  f'[{self.name}]\n'
         for closure in self.closures.keys():
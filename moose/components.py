@@ -1,6 +1,8 @@
 #!/usr/env/python3
 
 from enum import IntEnum, auto
+from moose.render import Renderable, refers
+import moose.bulk as bulk
 
 class ComponentType(IntEnum):
     ElbowPipe1Phase = auto()
@@ -57,7 +59,7 @@ class ComponentType(IntEnum):
     TotalPower = auto()
     VolumeJunction1Phase = auto()
 
-class Component:
+class Component(Renderable):
     def __init__(self, name = "", **kwargs):
         self.name = name
 
@@ -75,12 +77,12 @@ class Component:
             if key not in objects:
                 data = self.__dict__[key]
                 if isinstance(data,list):
-                    if hasattr(data[0], '__dict__'):
+                    if refers(data[0]):
                         data = [x.name for x in data]
                     else:
                         data = [str(x) for x in data]
                     data = ' '.join(data)
-                if hasattr(data, '__dict__'):
+                if refers(data):
                     data = data.name
                 string += f'{key}="{data}"\n'
 
@@ -195,14 +197,44 @@ class HeatTransferFromHeatStructure3D1Phase(Component):
         self.hs = heat_structure
         self.type = ComponentType.HeatTransferFromHeatStructure3D1Phase
 
-class Components:
+class Components(Renderable):
     def __init__(self):
         self.name = "Components"
         self.components = {}
 
+    def add_component(self, name, type, **kwargs):
+        """ add a component of type, made by the class of that name if there
+        is one, or a Component with kwargs as its parameters """
+        if name in self.components.keys():
+            print(f'component name {name} already in use')
+        component_type = ComponentType[type] if isinstance(type, str) else ComponentType(type)
+        self.components[name] = _construct_component(self.registry[component_type],
+            component_type, name, kwargs)
+
+    def add_many(self, data, references = None):
+        """ add a component for each row of data, see moose.bulk; returns
+        them """
+        return bulk.add_many(self.components, data, ComponentType, self.registry,
+            _construct_component, references)
+
+    def children(self):
+        return self.components
+
+    def write_hit(self, writer):
+        writer.write_collection(self.name, self.components.values())
+
     def __str__(self):
         string =  f'[{self.name}]\n'
         for component in self.components.keys():
             string += self.components[component].__str__()
         string += '[]\n'
-        return string
\ No newline at end of file
+        return string
+
+def _construct_component(cls, component_type, name, kwargs):
+    if cls is Component:
+        return Component(name, type=component_type, **kwargs)
+    return cls(name=name, **kwargs)
+
+# the class of each component type, for add_component and add_many
+Components.registry = {component_type: globals().get(component_type.name, Component)
+    for component_type in ComponentType}
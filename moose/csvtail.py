@@ -0,0 +1,180 @@
+#!/usr/env/python3
+
+""" Following the postprocessor CSV files MOOSE writes with csv=true while
+it runs. A PostprocessorCSV remembers how far into its file it has read and
+on each poll() parses only the rows added since, into float64 column
+buffers grown by doubling: NumPy arrays when NumPy is installed, array('d')
+otherwise. Columns are named by the postprocessors declared, with time
+first. Lines that are not a row of the header, short or ragged as when
+MOOSE restarts, are skipped and kept in bad_rows. A CSVWatcher polls many
+files from one thread, checking each with a stat and reading only those
+that have grown.
+"""
+
+import os
+import time
+from array import array
+
+from moose.tables import numpy
+
+def csv_filename(input_file, outputs = None):
+    """ the CSV file MOOSE writes for input_file: file_base.csv if outputs
+    sets file_base, or the name of the input with _out.csv """
+    directory = os.path.dirname(input_file)
+    file_base = outputs.outputs.get('file_base') if outputs is not None else None
+    if file_base:
+        return os.path.join(directory, f'{file_base}.csv')
+    return os.path.join(directory, os.path.splitext(os.path.basename(input_file))[0] + '_out.csv')
+
+class _Column():
+    # a float64 buffer with room to grow
+    def __init__(self, capacity):
+        if numpy is not None:
+            self.data = numpy.empty(capacity, dtype=numpy.float64)
+        else:
+            self.data = array('d')
+        self.length = 0
+
+    def extend(self, values):
+        if numpy is None:
+            self.data.extend(values)
+            self.length = len(self.data)
+            return
+        end = self.length + len(values)
+        if end > len(self.data):
+            grown = numpy.empty(max(end, 2*len(self.data)), dtype=numpy.float64)
+            grown[:self.length] = self.data[:self.length]
+            self.data = grown
+        self.data[self.length:end] = values
+        self.length = end
+
+    def values(self):
+        # the values read so far, a view with NumPy and a copy of the
+        # array('d') otherwise; rows read later are not in either
+        return self.data[:self.length]
+
+class PostprocessorCSV():
+    """ the rows of the CSV file filename, for the postprocessors declared
+    in post_processors, a PostProcessors or a list of names, or for every
+    column if None. Nothing is read until poll() """
+    def __init__(self, filename, post_processors = None, capacity = 1024):
+        self.filename = filename
+        if post_processors is not None and hasattr(post_processors, 'children'):
+            post_processors = list(post_processors.children().keys())
+        self.names = None if post_processors is None else ['time'] + list(post_processors)
+        self.capacity = capacity
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self.rows = 0
+        self.header = None
+        self.missing = []
+        # the lines that could not be read as a row of the header
+        self.bad_rows = []
+        self._indices = None
+        self._columns = {}
+        self._identity = None
+
+    def _start(self, header):
+        # resolve the columns to keep from the header line
+        self.header = header
+        positions = {name: idx for idx, name in enumerate(header)}
+        names = header if self.names is None else self.names
+        self.missing = [name for name in names if name not in positions]
+        kept = [name for name in names if name in positions]
+        self._indices = [positions[name] for name in kept]
+        self._columns = {name: _Column(self.capacity) for name in kept}
+
+    def poll(self):
+        """ read the rows added to the file since the last poll; returns the
+        number of new rows. A file that was replaced or truncated, as by a
+        rerun, is read again from the start """
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return 0
+        identity = (stat.st_dev, stat.st_ino)
+        if self._identity is not None and (identity != self._identity or stat.st_size < self.offset):
+            self._reset()
+        self._identity = identity
+        if stat.st_size == self.offset:
+            return 0
+        with open(self.filename, 'rb') as file:
+            file.seek(self.offset)
+            data = file.read(stat.st_size - self.offset)
+        # only whole lines are read, the rest waits for the next poll
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            return 0
+        lines = data[:end].decode(errors='replace').splitlines()
+        if self.header is None:
+            self._start([name.strip() for name in lines.pop(0).split(',')])
+        rows = []
+        width = len(self.header)
+        for line in lines:
+            if not line:
+                continue
+            row = line.split(',')
+            try:
+                if len(row) != width:
+                    raise ValueError
+                rows.append([float(row[idx]) for idx in self._indices])
+            except ValueError:
+                # a short or ragged row, as MOOSE writes while restarting,
+                # is left out rather than stopping the rows after it
+                self.bad_rows.append(line)
+        for idx, column in enumerate(self._columns.values()):
+            column.extend([row[idx] for row in rows])
+        # the offset moves on once the rows are kept
+        self.offset = self.offset + end
+        self.rows = self.rows + len(rows)
+        return len(rows)
+
+    def columns(self):
+        """ a dict of column name: values read so far; NumPy arrays on the
+        buffers read into, or copies as array('d') without NumPy, so they do
+        not change as more rows are read """
+        return {name: column.values() for name, column in self._columns.items()}
+
+    def __getitem__(self, name):
+        return self._columns[name].values()
+
+    def last(self):
+        """ the last row read as a dict of column name: value, None if no
+        row has been read """
+        if self.rows == 0:
+            return None
+        return {name: float(column.data[self.rows - 1]) for name, column in self._columns.items()}
+
+class CSVWatcher():
+    """ PostprocessorCSVs for many files, polled together """
+    def __init__(self):
+        self.tails = {}
+
+    def add(self, filename, post_processors = None, capacity = 1024):
+        tail = PostprocessorCSV(filename, post_processors, capacity)
+        self.tails[filename] = tail
+        return tail
+
+    def remove(self, filename):
+        del self.tails[filename]
+
+    def poll(self):
+        """ poll every file; returns a dict of filename: new rows for the
+        files that had any """
+        updates = {}
+        for filename, tail in self.tails.items():
+            rows = tail.poll()
+            if rows:
+                updates[filename] = rows
+        return updates
+
+    def watch(self, callback, interval = 1.0, stop = None):
+        """ poll every interval seconds, calling callback(updates) when any
+        file has new rows, until stop() returns true """
+        while stop is None or not stop():
+            updates = self.poll()
+            if updates:
+                callback(updates)
+            time.sleep(interval)
@@ -18,6 +18,9 @@ class Executioner():
         self.name = "Executioner"
         self.solve_objects = kwargs
 
+    def parameters(self):
+        return self.solve_objects
+
     def __str__(self):
         string =  f'[{self.name}]\n'
         for key in self.solve_objects.keys():
@@ -0,0 +1,253 @@
+#!/usr/env/python3
+
+""" The metadata of an Exodus II mesh, read from the header of its NetCDF
+file: the element blocks, side sets and node sets with their ids, names and
+sizes, and the numbers of nodes and elements. The file is memory mapped and
+only the header and the small name and id variables are read, so the time
+taken does not depend on the size of the coordinates and connectivity;
+a mesh of many GB is read as fast as a small one.
+
+NetCDF classic, 64-bit offset and 64-bit data (CDF-1, 2 and 5) files are
+read. NetCDF-4 files, which are HDF5, are not.
+"""
+
+import functools
+import math
+import mmap
+import os
+import struct
+
+# NetCDF header tags
+_ABSENT = 0
+_DIMENSION = 10
+_VARIABLE = 11
+_ATTRIBUTE = 12
+
+# the struct format and size of each NetCDF type
+_types = {1: ('b', 1), 2: ('c', 1), 3: ('h', 2), 4: ('i', 4), 5: ('f', 4), 6: ('d', 8),
+          7: ('B', 1), 8: ('H', 2), 9: ('I', 4), 10: ('q', 8), 11: ('Q', 8)}
+_CHAR = 2
+
+class NetCDFVariable():
+    """ a variable of a NetCDF header: its dimensions by name, attributes,
+    type and where its data starts in the file """
+    def __init__(self, name, dimensions, attributes, nc_type, vsize, begin):
+        self.name = name
+        self.dimensions = dimensions
+        self.attributes = attributes
+        self.nc_type = nc_type
+        self.vsize = vsize
+        self.begin = begin
+
+class NetCDFHeader():
+    """ the dimensions, attributes and variables of a NetCDF classic file,
+    each a dict by name. The file stays mapped for values() until close() """
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < 8:
+                raise ValueError(f'{filename} is not a NetCDF file')
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except (struct.error, IndexError, KeyError) as error:
+            self.close()
+            raise ValueError(f'{filename} has a malformed NetCDF header: {error}')
+        except ValueError:
+            self.close()
+            raise
+
+    def _parse(self):
+        magic = self._map[:4]
+        if magic == b'\x89HDF':
+            raise ValueError(f'{self.filename} is NetCDF-4 (HDF5), only NetCDF classic '
+                             f'files are read')
+        if magic[:3] != b'CDF' or magic[3] not in (1, 2, 5):
+            raise ValueError(f'{self.filename} is not a NetCDF file')
+        self.version = magic[3]
+        # counts are 8 bytes in CDF-5, offsets 8 bytes in CDF-2 and 5
+        self._count = '>q' if self.version == 5 else '>i'
+        self._offset = '>i' if self.version == 1 else '>q'
+        self._position = 4
+        self.records = self._read(self._count)
+
+        self.dimensions = {}
+        names = []
+        for _ in range(self._list(_DIMENSION)):
+            name = self._name()
+            self.dimensions[name] = self._read(self._count)
+            names.append(name)
+        self.attributes = self._attributes()
+        self.variables = {}
+        for _ in range(self._list(_VARIABLE)):
+            name = self._name()
+            dimensions = [names[self._read(self._count)] for _ in range(self._read(self._count))]
+            attributes = self._attributes()
+            nc_type = self._read('>i')
+            # the size is 2**32 - 1 for a larger variable of CDF-2
+            vsize = self._read('>q' if self.version == 5 else '>I')
+            begin = self._read(self._offset)
+            self.variables[name] = NetCDFVariable(name, dimensions, attributes, nc_type,
+                                                  vsize, begin)
+
+    def _read(self, fmt):
+        value = struct.unpack_from(fmt, self._map, self._position)[0]
+        self._position = self._position + struct.calcsize(fmt)
+        return value
+
+    def _list(self, tag):
+        # the number of elements of a list of tag, 0 if it is absent
+        found = self._read('>i')
+        count = self._read(self._count)
+        if found == _ABSENT and count == 0:
+            return 0
+        if found != tag:
+            raise ValueError(f'{self.filename} has a malformed NetCDF header: '
+                             f'tag {found} where {tag} was expected')
+        return count
+
+    def _name(self):
+        length = self._read(self._count)
+        name = bytes(self._map[self._position:self._position + length]).decode()
+        self._position = self._position + _padded(length)
+        return name
+
+    def _attributes(self):
+        attributes = {}
+        for _ in range(self._list(_ATTRIBUTE)):
+            name = self._name()
+            nc_type = self._read('>i')
+            count = self._read(self._count)
+            attributes[name] = self._values(nc_type, count, self._position)
+            self._position = self._position + _padded(count*_types[nc_type][1])
+        return attributes
+
+    def _values(self, nc_type, count, position):
+        code, size = _types[nc_type]
+        if nc_type == _CHAR:
+            return bytes(self._map[position:position + count]).split(b'\0', 1)[0].decode()
+        values = struct.unpack_from(f'>{count}{code}', self._map, position)
+        return values[0] if count == 1 else list(values)
+
+    def dimension(self, name, default = 0):
+        return self.dimensions.get(name, default)
+
+    def values(self, name):
+        """ the data of the variable name, which must not be a record
+        variable: a list of numbers, or of strings for a 2D char variable,
+        each row up to its first null """
+        variable = self.variables[name]
+        shape = [self.dimensions[dimension] for dimension in variable.dimensions]
+        if variable.dimensions and self.dimensions[variable.dimensions[0]] == 0:
+            raise ValueError(f'{name} is a record variable')
+        if variable.nc_type == _CHAR and len(shape) == 2:
+            rows, length = shape
+            data = self._map[variable.begin:variable.begin + rows*length]
+            return [bytes(data[i*length:(i+1)*length]).split(b'\0', 1)[0].decode()
+                    for i in range(rows)]
+        count = math.prod(shape)
+        values = self._values(variable.nc_type, count, variable.begin)
+        return values if isinstance(values, (list, str)) else [values]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def _padded(length):
+    # length rounded up to a multiple of 4
+    return (length + 3) & ~3
+
+class ExodusSet():
+    """ an element block, side set or node set: its id, name, which may be
+    empty, and number of elements, sides or nodes. element_type is set for
+    blocks only """
+    def __init__(self, id, name, count, element_type = None):
+        self.id = id
+        self.name = name
+        self.count = count
+        self.element_type = element_type
+
+    def __repr__(self):
+        return f'ExodusSet({self.id!r}, {self.name!r}, {self.count!r}, {self.element_type!r})'
+
+class ExodusInfo():
+    """ the metadata of an Exodus II file """
+    def __init__(self, filename, title, dimension, nodes, elements, blocks, side_sets, node_sets):
+        self.filename = filename
+        self.title = title
+        self.dimension = dimension
+        self.nodes = nodes
+        self.elements = elements
+        self.blocks = blocks
+        self.side_sets = side_sets
+        self.node_sets = node_sets
+
+    def block_names(self):
+        """ the names and ids of the blocks as MOOSE takes them in block= """
+        return _set_names(self.blocks)
+
+    def boundary_names(self):
+        """ the names and ids of the side and node sets as MOOSE takes them
+        in boundary= """
+        return _set_names(self.side_sets + self.node_sets)
+
+    def __str__(self):
+        string = f'{self.filename}: {self.dimension}D, {self.nodes} nodes, {self.elements} elements\n'
+        for title, sets in (('block', self.blocks), ('side set', self.side_sets),
+                            ('node set', self.node_sets)):
+            for exodus_set in sets:
+                string += f'  {title} {exodus_set.id} {exodus_set.name}: {exodus_set.count}'
+                if exodus_set.element_type:
+                    string += f' {exodus_set.element_type}'
+                string += '\n'
+        return string
+
+def _set_names(sets):
+    names = []
+    for exodus_set in sets:
+        names.append(str(exodus_set.id))
+        if exodus_set.name:
+            names.append(exodus_set.name)
+    return names
+
+def _sets(header, count, names, ids, size, element_type = None):
+    # the ExodusSets of one kind; size and element_type are formatted with
+    # the 1-based index of each set to give the dimension and variable names
+    number = header.dimension(count)
+    if number == 0:
+        return []
+    set_names = header.values(names) if names in header.variables else [''] * number
+    set_ids = header.values(ids) if ids in header.variables else list(range(1, number + 1))
+    sets = []
+    for idx in range(number):
+        kind = None
+        if element_type is not None:
+            connect = header.variables.get(element_type.format(idx + 1))
+            kind = connect.attributes.get('elem_type') if connect else None
+        sets.append(ExodusSet(set_ids[idx], set_names[idx],
+                              header.dimension(size.format(idx + 1)), kind))
+    return sets
+
+@functools.lru_cache(maxsize=64)
+def _read_exodus(filename, size, mtime):
+    with NetCDFHeader(filename) as header:
+        title = header.attributes.get('title', '')
+        return ExodusInfo(filename, title, header.dimension('num_dim'),
+            header.dimension('num_nodes'), header.dimension('num_elem'),
+            _sets(header, 'num_el_blk', 'eb_names', 'eb_prop1', 'num_el_in_blk{}', 'connect{}'),
+            _sets(header, 'num_side_sets', 'ss_names', 'ss_prop1', 'num_side_ss{}'),
+            _sets(header, 'num_node_sets', 'ns_names', 'ns_prop1', 'num_nod_ns{}'))
+
+def read_exodus(filename):
+    """ the ExodusInfo of filename, kept until the file changes """
+    filename = os.path.abspath(filename)
+    stat = os.stat(filename)
+    return _read_exodus(filename, stat.st_size, stat.st_mtime_ns)
@@ -1,6 +1,7 @@
 #!/usr/env/python3
 
 from enum import IntEnum,auto
+from moose.render import Renderable, refers
 
 class FluidPropertyTypes(IntEnum):
     BrineFluidProperties = auto()
@@ -25,7 +26,7 @@ class FluidPropertyTypes(IntEnum):
     TwoPhaseFluidProperties = auto()
     Water97FluidProperties = auto()
 
-class FluidProperty:
+class FluidProperty(Renderable):
     def __init__(self, name = "", **kwargs):
         self.name = name
         # set the kwargs into names        
@@ -41,7 +42,7 @@ class FluidProperty:
                 if isinstance(data,list):
                     data = [str(x) for x in data]
                     data = ' '.join(data)
-                if hasattr(data, '__dict__'):
+                if refers(data):
                     data = data.name
                 string += f'{key}={data}\n'
         string += '[]\n'
@@ -62,11 +63,17 @@ class StiffenedGasFluidProperties(FluidProperty):
         super().__init__(name,**kwargs)
         self.type = FluidPropertyTypes.StiffenedGasFluidProperties
 
-class FluidProperties:
+class FluidProperties(Renderable):
     def __init__(self):
         self.name = "FluidProperties"
         self.fluidproperties = {}
 
+    def children(self):
+        return self.fluidproperties
+
+    def write_hit(self, writer):
+        writer.write_collection(self.name, self.fluidproperties.values())
+
     def __str__(self):
         string = f'[{self.name}]\n'
         for fluid in self.fluidproperties.keys():
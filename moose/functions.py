@@ -2,36 +2,38 @@
 
 from enum import IntEnum, auto
 from moose.variables import Variable
+from moose.render import Renderable, refers
+from moose.tables import as_table, is_buffer, format_table, simplify_table, table_length
 
 class MooseFunctionTypes(IntEnum):
     PiecewiseLinear = auto()
     ParsedFunction = auto()
 
-class PiecewiseFunction:
-    def __init__(self, name = "", x_data = None, y_data = None):
+class PiecewiseFunction(Renderable):
+    """ x and y data given as NumPy arrays or array('d') are held as float64
+    buffers, see moose.tables; precision, as in '.8g', limits the digits
+    written """
+    __slots__ = ('name', 'x_data', 'y_data', 'precision')
+    def __init__(self, name = "", x_data = None, y_data = None, precision = None):
         self.name = name
-        self.x_data = x_data
-        self.y_data = y_data
+        self.x_data = as_table(x_data) if is_buffer(x_data) else x_data
+        self.y_data = as_table(y_data) if is_buffer(y_data) else y_data
+        self.precision = precision
 
     def __str__(self):
-
-        if isinstance(self.x_data,list):
-            if isinstance(self.x_data[0],(int,float)):
-                x_str = [ str(x) for x in self.x_data]
-                y_str = [ str(x) for x in self.y_data]
-                string  = 'x="' + ' '.join(x_str) + '"\n'
-                string += 'y="' + ' '.join(y_str) + '"\n'
-            elif isinstance(self.x_data[0],str):  
-                string  = 'x="' + ' '.join(x_str) + '"\n'
-                string += 'y="' + ' '.join(y_str) + '"\n'
-
-        if isinstance(self.x_data,str):
-            string  = 'x="' + self.x_data + '"\n'
-            string += 'y="' + self.y_data + '"\n'
-            
+        string  = 'x="' + format_table(self.x_data, self.precision) + '"\n'
+        string += 'y="' + format_table(self.y_data, self.precision) + '"\n'
         return string
 
-class PolynomialFunction:
+    def simplify(self, tolerance, relative = False):
+        """ drop the points not needed to stay within tolerance of the
+        table, see moose.tables.simplify_table; returns the Simplification """
+        self.x_data, self.y_data, report = simplify_table(self.x_data, self.y_data,
+                                                          tolerance, relative)
+        return report
+
+class PolynomialFunction(Renderable):
+    __slots__ = ('name', 'coefficients', 'arguments')
     def __init__(self, name = "", arguments = [None,None,None,None], coefficients = [0,0,0,0,0]):
         self.name = name
         self.coefficients = coefficients
@@ -61,7 +63,10 @@ class PolynomialFunction:
         string = ' '.join(str(x) for x in self.coefficients)
         return string
 
-class GenericFunction:
+class GenericFunction(Renderable):
+    # attributes that are not written as parameters
+    hidden = ("name", "type")
+
     def __init__(self, name = "", **kwargs):
         self.name = name
 
@@ -70,24 +75,30 @@ class GenericFunction:
             self.__setattr__(arg, kwargs[arg])
     
     def __str__(self):
+        return self.block_text(self.hidden)
+
+    def block_text(self, hidden, extra = ""):
+        # the block with every attribute not in hidden as a parameter,
+        # followed by the parameter lines of extra
         string =  f'[{self.name}]\n'
         string += f'type={self.type.name}\n'
         
-        objects = ["name", "type"]
-        
         for key in self.__dict__.keys():
-            if key not in objects:
+            if key not in hidden:
                 data = self.__dict__[key]
-                if isinstance(data,list):
-                    if hasattr(data[0], '__dict__'):
+                if is_buffer(data):
+                    data = format_table(data, getattr(self, 'precision', None))
+                elif isinstance(data,list):
+                    if refers(data[0]):
                         data = [x.name for x in data]
                     else:
                         data = [str(x) for x in data]
                     data = ' '.join(data)
-                if hasattr(data, '__dict__'):
+                if refers(data):
                     data = data.name
                 string += f'{key}="{data}"\n'
 
+        string += extra
         string += '[]\n'
         return string
 
@@ -108,15 +119,45 @@ class ParsedFunction(GenericFunction):
         return string
 
 class PiecewiseLinear(GenericFunction):
-    def __init__(self,name = "", **kwargs):
+    """ x and y given as NumPy arrays or array('d') are held as float64
+    buffers like those of PiecewiseFunction """
+    hidden = ("name", "type", "precision")
+
+    def __init__(self,name = "", precision = None, **kwargs):
+        for key in ('x', 'y'):
+            if is_buffer(kwargs.get(key)):
+                kwargs[key] = as_table(kwargs[key])
         super().__init__(name, **kwargs)
         self.type = MooseFunctionTypes.PiecewiseLinear
-
-class Functions:
+        self.precision = precision
+
+    def write_hit(self, writer):
+        # a table longer than the writer's TableFiles threshold is written to
+        # a csv file of x, y rows, see moose.writer.TableFiles
+        tables = writer.tables
+        if tables is None or table_length(self.x) < tables.threshold:
+            writer.write_text(self.__str__())
+            return
+        data_file = tables.write(self.x, self.y)
+        writer.write_text(self.block_text(self.hidden + ('x', 'y', 'data_file', 'format'),
+                                          f'data_file="{data_file}"\nformat=columns\n'))
+
+    def simplify(self, tolerance, relative = False):
+        """ as PiecewiseFunction.simplify, for the x and y of this function """
+        self.x, self.y, report = simplify_table(self.x, self.y, tolerance, relative)
+        return report
+
+class Functions(Renderable):
     def __init__(self):
         self.name = "Functions"
         self.functions = {}
 
+    def children(self):
+        return self.functions
+
+    def write_hit(self, writer):
+        writer.write_collection(self.name, self.functions.values())
+
     def __str__(self):
         string  = f'[{self.name}]\n'
         for func in self.functions.keys():
@@ -5,14 +5,17 @@ class GlobalParameters():
         self.name = "GlobalParams"
         self.members = kwargs
 
+    def parameters(self):
+        return self.members
+
     def __str__(self):
         string =  f'[{self.name}]\n'
         for key in self.members.keys():
             if key == "displacements":
                 displacements =  ' '.join([x.name for x in self.members["displacements"]])
                 string += f'displacements="{displacements}"\n'
-            if key == "volumetric_locking_correction":
-                string += f'volumetric_locking_correction=true\n'
+            elif type(self.members[key]) is bool:
+                string += f'{key}={str(self.members[key]).lower()}\n'
             else:
                 string += f'{key}="{self.members[key]}"\n'
         string += '[]\n'
@@ -0,0 +1,161 @@
+#!/usr/env/python3
+
+""" Timing MOOSEInput.write. Within a WriteProfile every write records the
+wall time, bytes and number of objects of each top level block and of each
+object type:
+
+    with WriteProfile() as profile:
+        moose.write('input.i')
+    print(profile)
+    profile.write_json('profile.json')
+
+An object's time and bytes are its own, less those of the objects written
+within it, so the figures of the types add up to the whole write; those of
+a block include everything in it. An object whose render cache was still
+good is counted with the bytes of its cached text and no time of its own,
+the time taken to reuse it going to the object it was written in. A
+callback given to the profile is called with an event dict as each object
+is written, to feed another metrics collector.
+
+Outside a profile, writes use a plain HITWriter and nothing is recorded or
+checked per object.
+"""
+
+import json
+import time
+
+from moose.render import Renderable, render_cache
+from moose.writer import HITWriter
+
+# the WriteProfile in use, if any
+active = None
+
+class WriteStats():
+    __slots__ = ('count', 'seconds', 'bytes')
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.
+        self.bytes = 0
+
+    def add(self, seconds, size):
+        self.count = self.count + 1
+        self.seconds = self.seconds + seconds
+        self.bytes = self.bytes + size
+
+    def as_dict(self):
+        return {'count': self.count, 'seconds': self.seconds, 'bytes': self.bytes}
+
+class WriteProfile():
+    """ WriteStats of each top level block and object type over the writes
+    made within it, and of the writes as a whole """
+    def __init__(self, callback = None):
+        self.callback = callback
+        self.blocks = {}
+        self.types = {}
+        self.total = WriteStats()
+        self._previous = None
+
+    def __enter__(self):
+        global active
+        self._previous = active
+        active = self
+        return self
+
+    def __exit__(self, *args):
+        global active
+        active = self._previous
+        self._previous = None
+
+    def writer(self, writer):
+        # a ProfilingWriter in place of writer for one write
+        return ProfilingWriter(writer.stream, writer.indent, writer.tables, self)
+
+    def _record(self, block, obj, own_seconds, own_bytes, cached, depth):
+        self.total.add(own_seconds, own_bytes)
+        self.blocks.setdefault(block, WriteStats()).add(own_seconds, own_bytes)
+        self.types.setdefault(type(obj).__name__, WriteStats()).add(own_seconds, own_bytes)
+        if self.callback is not None:
+            self.callback({'block': block, 'type': type(obj).__name__,
+                           'name': getattr(obj, 'name', None), 'depth': depth,
+                           'seconds': own_seconds, 'bytes': own_bytes, 'cached': cached})
+
+    def as_dict(self):
+        """ the profile as plain dicts, the blocks by name and the types by
+        class name """
+        return {'total': self.total.as_dict(),
+                'blocks': {name: stats.as_dict() for name, stats in self.blocks.items()},
+                'types': {name: stats.as_dict() for name, stats in self.types.items()}}
+
+    def write_json(self, filename):
+        with open(filename, 'w') as file:
+            json.dump(self.as_dict(), file, indent=2)
+
+    def __str__(self):
+        string = f'{self.total.count} objects, {self.total.bytes} bytes in ' \
+                 f'{self.total.seconds*1000:.2f} ms\n'
+        for title, table in (('block', self.blocks), ('type', self.types)):
+            string += f'{title:<40} {"count":>8} {"ms":>10} {"bytes":>12}\n'
+            for name, stats in sorted(table.items(), key=lambda item: -item[1].seconds):
+                string += f'{name:<40} {stats.count:>8} {stats.seconds*1000:>10.2f} {stats.bytes:>12}\n'
+        return string
+
+class ProfilingWriter(HITWriter):
+    """ a HITWriter that records each object it writes in a WriteProfile """
+    def __init__(self, stream, indent = 2, tables = None, profile = None):
+        super().__init__(stream, indent, tables)
+        self.profile = profile
+        # [block, bytes written so far, time and bytes of the children of
+        # each object being written], shared by the branches of this writer
+        self.state = [None, 0, []]
+
+    def write_line(self, line):
+        if self.depth > 0:
+            line = ' '*(self.indent*self.depth) + line
+        self.state[1] = self.state[1] + len(line.encode()) + 1
+        self.stream.write(line + '\n')
+
+    def write_text(self, text):
+        text = self.format_text(text)
+        self.state[1] = self.state[1] + len(text.encode())
+        self.stream.write(text)
+
+    def write_object(self, obj):
+        state = self.state
+        frames = state[2]
+        depth = len(frames)
+        if depth == 0:
+            state[0] = getattr(obj, 'name', None) or type(obj).__name__
+        frame = [0., 0]
+        frames.append(frame)
+        written = state[1]
+        cached = False
+        start = time.perf_counter()
+        if render_cache.enabled and isinstance(obj, Renderable):
+            cache = getattr(obj, '_render_cache', None)
+            pieces = obj.write_rendered(self)
+            seconds = time.perf_counter() - start
+            cached = cache is not None and obj._render_cache is cache
+            if cached:
+                frame[1] = self._cached_children(cache, depth + 1)
+            size = sum(len(piece.encode()) for piece in pieces)
+            # what render wrote to its pieces is counted as size
+            state[1] = written + size
+        else:
+            super().write_object(obj)
+            seconds = time.perf_counter() - start
+            size = state[1] - written
+        frames.pop()
+        if frames:
+            frames[-1][0] = frames[-1][0] + seconds
+            frames[-1][1] = frames[-1][1] + size
+        self.profile._record(state[0], obj, seconds - frame[0], size - frame[1], cached, depth)
+
+    def _cached_children(self, cache, depth):
+        # record the children of a cached render; returns their bytes
+        total = 0
+        for child, child_cache in cache[2]:
+            size = sum(len(piece.encode()) for piece in child_cache[1])
+            inner = self._cached_children(child_cache, depth + 1)
+            self.profile._record(self.state[0], child, 0., size - inner, True, depth)
+            total = total + size
+        return total
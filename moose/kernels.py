@@ -1,6 +1,8 @@
 #!/usr/env/python3
 
 from enum import IntEnum, auto
+from moose.render import Renderable
+import moose.bulk as bulk
 
 class ScalarType(IntEnum):
     VonMisesStress = auto()
@@ -33,7 +35,8 @@ class KernelTypes(IntEnum):
     TensorMechanics = auto()
     ADGravity = auto()
     
-class Kernel():
+class Kernel(Renderable):
+    __slots__ = ('name', 'variable', 'block')
     def __init__(self, name = "", variable = None, block = None,
             **kwargs):
         self.name = name
@@ -41,6 +44,7 @@ class Kernel():
         self.block = block
 
 class ADHeatConduction(Kernel):
+    __slots__ = ('kernel_type', 'thermal_conductivity')
     def __init__(self, name = "", variable = None, block = None,
             **kwargs):
         super().__init__(name, variable, block, **kwargs)
@@ -64,6 +68,7 @@ class ADHeatConduction(Kernel):
         return string       
 
 class ADHeatConductionTimeDerivative(Kernel):
+    __slots__ = ('kernel_type', 'density_name', 'specific_heat')
     def __init__(self, name = "", variable = None, block = None,
             **kwargs):
         super().__init__(name, variable, block, **kwargs)
@@ -94,6 +99,7 @@ class ADHeatConductionTimeDerivative(Kernel):
         return string          
 
 class TensorMechanics(Kernel):
+    __slots__ = ('kernel_type', 'displacements', 'generate_output', 'eigenstrain_names')
     def __init__(self, name = "", variable = None, block = None,
             **kwargs):
         super().__init__(name, variable, block, **kwargs)
@@ -124,6 +130,7 @@ class TensorMechanics(Kernel):
         return string  
 
 class ADGravity(Kernel):
+    __slots__ = ('kernel_type', 'value')
     def __init__(self, name = "", variable = None, block = None,
             **kwargs):
         super().__init__(name, variable, block, **kwargs)
@@ -142,11 +149,13 @@ class ADGravity(Kernel):
         return string  
 
 class AuxKernel(Kernel):
+    __slots__ = ()
     def __init__(self, name = "", variable = None, block = None,
             **kwargs):
         super().__init__(name,variable,block,**kwargs)
 
 class ParsedAux(AuxKernel):
+    __slots__ = ('aux_kernel_type', 'function', 'args')
     def __init__(self, name = "", variable = None, block = None,
             **kwargs):
         super().__init__(name,variable,block,**kwargs) 
@@ -159,11 +168,16 @@ class ParsedAux(AuxKernel):
         string += f'type={self.aux_kernel_type.name}\n'
         string += f'variable={self.variable.name}\n'
         string += f'{self.function.__str__()}'
-        string += f'args={self.args.name}\n'
+        if isinstance(self.args, list):
+            args = ' '.join([x.name for x in self.args])
+            string += f'args="{args}"\n'
+        else:
+            string += f'args={self.args.name}\n'
         string += '[]\n'
         return string
 
 class ADRankTwoAux(AuxKernel):
+    __slots__ = ('aux_kernel_type', 'rank_two_tensor', 'index_i', 'index_j')
     def __init__(self, name = "", variable = None, block = None,
             **kwargs):
         super().__init__(name,variable,block,**kwargs)   
@@ -183,6 +197,7 @@ class ADRankTwoAux(AuxKernel):
         return string
 
 class ADRankTwoScalarAux(AuxKernel):
+    __slots__ = ('aux_kernel_type', 'rank_two_tensor', 'scalar_type')
     def __init__(self, name = "", variable = None, block = None,
             **kwargs):
         super().__init__(name,variable,block,**kwargs)   
@@ -203,7 +218,14 @@ class ADRankTwoScalarAux(AuxKernel):
         string += '[]\n'        
         return string
 
-class Kernels():
+class Kernels(Renderable):
+    # the class of each kernel type, for add_kernel and add_many
+    kernel_types = KernelTypes
+    registry = {KernelTypes.ADHeatConduction: ADHeatConduction,
+        KernelTypes.ADHeatConductionTimeDerivative: ADHeatConductionTimeDerivative,
+        KernelTypes.TensorMechanics: TensorMechanics,
+        KernelTypes.ADGravity: ADGravity}
+
     def __init__(self):
         self.name = "Kernels"
         self.kernels = {}
@@ -212,17 +234,22 @@ class Kernels():
         if name in self.kernels.keys():
             print(f'kernel name {name} already in use')
 
-        if type == KernelTypes.ADHeatConduction:
-            kernel = ADHeatConduction(name,variable,block, **kwargs)
-        elif type == KernelTypes.ADHeatConductionTimeDerivative:
-            kernel = ADHeatConductionTimeDerivative(name,variable,block, **kwargs)
-        elif type == KernelTypes.TensorMechanics:
-            kernel = TensorMechanics(name,variable,block, **kwargs)
-        elif type == KernelTypes.ADGravity:
-            kernel = ADGravity(name,variable,block, **kwargs)
-   
+        if type not in self.registry.keys():
+            raise ValueError(f'unknown kernel type {type}')
+        kernel = self.registry[type](name,variable,block, **kwargs)
         self.kernels[name] = kernel
-            
+
+    def add_many(self, data, references = None):
+        """ add a kernel for each row of data, see moose.bulk; returns them """
+        return bulk.add_many(self.kernels, data, self.kernel_types, self.registry,
+            _construct_kernel, references)
+
+    def children(self):
+        return self.kernels
+
+    def write_hit(self, writer):
+        writer.write_collection(self.name, self.kernels.values())
+
     def __str__(self):
         string = f'[{self.name}]\n'
         for kernel in self.kernels.keys():
@@ -231,6 +258,11 @@ class Kernels():
         return string
 
 class AuxKernels(Kernels):
+    kernel_types = AuxKernelTypes
+    registry = {AuxKernelTypes.ParsedAux: ParsedAux,
+        AuxKernelTypes.ADRankTwoAux: ADRankTwoAux,
+        AuxKernelTypes.ADRankTwoScalarAux: ADRankTwoScalarAux}
+
     def __init__(self):
         super().__init__()
         self.name = 'AuxKernels'
@@ -239,11 +271,10 @@ class AuxKernels(Kernels):
         if name in self.kernels.keys():
             print(f'aux kernel name {name} already in use')
 
-        if type == AuxKernelTypes.ParsedAux:
-            kernel = ParsedAux(name,variable,block, **kwargs)
-        elif type == AuxKernelTypes.ADRankTwoAux:
-            kernel = ADRankTwoAux(name,variable,block, **kwargs)
-        elif type == AuxKernelTypes.ADRankTwoScalarAux:
-            kernel = ADRankTwoScalarAux(name,variable,block, **kwargs)
+        if type not in self.registry.keys():
+            raise ValueError(f'unknown aux kernel type {type}')
+        kernel = self.registry[type](name,variable,block, **kwargs)
+        self.kernels[name] = kernel
 
-        self.kernels[name] = kernel  
+def _construct_kernel(cls, kernel_type, name, kwargs):
+    return cls(name, kwargs.pop('variable', None), kwargs.pop('block', None), **kwargs)
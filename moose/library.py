@@ -0,0 +1,277 @@
+#!/usr/env/python3
+
+""" A library of material properties kept in a directory of files, one
+alloy per CSV or JSON file and any number per HDF5 file or snapshot. The
+directory is indexed by listing it, and a file is only read when a
+property of one of its alloys is first used, so using one alloy out of a
+large library reads that alloy alone. Each table is read once and kept,
+as float64 buffers, read-only when NumPy is installed since a table may be
+held by any number of models.
+
+Files of an alloy, named by the alloy:
+    alloy.csv   a first column of temperatures and a column per property,
+                named in a header row; an empty cell is no value
+    alloy.json  {"property": {"x": [...], "y": [...]}, ...}
+Files of any number of alloys:
+    name.h5     a group per alloy, holding a group per property with x and
+                y datasets; a file whose groups are all properties is one
+                alloy named by the file. Read with h5py, if installed
+    name.snap   a snapshot of a dict of alloy: property: [x, y], as written
+                by MaterialLibrary.write_snapshot; with NumPy its tables
+                are memory mapped, so processes share them in the page
+                cache and only the pages used are read. Without NumPy the
+                whole snapshot is read when the library is indexed
+
+Property names are matched without case, spaces, - or _, so a library's
+"specificheat" is the specific_heat of the mapping. The mapping says how
+each property is used in a model, see add_alloy.
+"""
+
+import csv
+import json
+import os
+from enum import IntEnum, auto
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+from moose.tables import as_table, numpy
+from moose.functions import Functions, PiecewiseFunction, PiecewiseLinear
+from moose.materials import Materials, ADPiecewiseLinearInterpolationMaterial
+import moose.snapshot as snapshot
+
+class PropertyUse(IntEnum):
+    # an ADPiecewiseLinearInterpolationMaterial declaring the property
+    INTERPOLATION = auto()
+    # a PiecewiseLinear function, for the materials that take one
+    FUNCTION = auto()
+
+# how each property is used: the library property, and the use with the
+# name of the property in MOOSE
+default_mapping = {
+    'density': (PropertyUse.INTERPOLATION, 'density'),
+    'specific_heat': (PropertyUse.INTERPOLATION, 'specific_heat'),
+    'thermal_conductivity': (PropertyUse.INTERPOLATION, 'thermal_conductivity'),
+    'youngs_modulus': (PropertyUse.INTERPOLATION, 'youngs_modulus'),
+    'thermal_expansion': (PropertyUse.FUNCTION, 'thermal_expansion'),
+}
+
+def _key(name):
+    # a property name as it is matched
+    return name.lower().replace('_', '').replace('-', '').replace(' ', '')
+
+def _read_only(data):
+    data = as_table(data)
+    if numpy is not None:
+        data.flags.writeable = False
+    return data
+
+class _CSVFile():
+    # one alloy, read whole on first use
+    def __init__(self, path):
+        self.path = path
+
+    def load(self, alloy):
+        with open(self.path, newline='') as file:
+            rows = list(csv.reader(file))
+        header = [name.strip() for name in rows[0]]
+        tables = {}
+        for column, name in enumerate(header[1:], 1):
+            x = []
+            y = []
+            for row in rows[1:]:
+                if column < len(row) and row[column].strip():
+                    x.append(float(row[0]))
+                    y.append(float(row[column]))
+            tables[name] = (_read_only(x), _read_only(y))
+        return tables
+
+class _JSONFile(_CSVFile):
+    def load(self, alloy):
+        with open(self.path, 'r') as file:
+            data = json.load(file)
+        return {name: (_read_only(table['x']), _read_only(table['y']))
+                for name, table in data.items()}
+
+class _HDF5File():
+    # alloys read a property at a time, from a file kept open
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def alloys(self, stem):
+        with h5py.File(self.path, 'r') as file:
+            groups = [name for name in file.keys() if isinstance(file[name], h5py.Group)]
+            if groups and all('x' in file[name] for name in groups):
+                return {stem: None}
+            return {name: name for name in groups}
+
+    def load(self, group):
+        if self.file is None:
+            self.file = h5py.File(self.path, 'r')
+        group = self.file if group is None else self.file[group]
+        return {name: _HDF5Table(group[name]) for name in group.keys()}
+
+class _HDF5Table():
+    # the datasets of a property, read when it is first used
+    def __init__(self, group):
+        self.group = group
+
+    def read(self):
+        return _read_only(self.group['x'][()]), _read_only(self.group['y'][()])
+
+class _SnapshotFile():
+    def __init__(self, path):
+        self.path = path
+        self.data = None
+
+    def alloys(self, stem):
+        self.data = snapshot.read_snapshot(self.path)
+        if not isinstance(self.data, dict):
+            raise ValueError(f'{self.path} is not a snapshot of a library')
+        return {name: name for name in self.data}
+
+    def load(self, alloy):
+        return {name: (_read_only(x), _read_only(y))
+                for name, (x, y) in self.data[alloy].items()}
+
+class MaterialLibrary():
+    """ the alloys of the property files in directory and its
+    subdirectories, each alloy named by its file, or its group in an HDF5
+    file or snapshot. HDF5 files and snapshots that cannot be read, or HDF5
+    files without h5py, are listed in skipped with the reason """
+    def __init__(self, directory):
+        self.directory = directory
+        self.index = {}
+        self.skipped = []
+        self._loaded = {}
+        self._functions = {}
+        for root, _, names in os.walk(directory):
+            for filename in sorted(names):
+                self._add(os.path.join(root, filename))
+
+    def _add(self, path):
+        stem, extension = os.path.splitext(os.path.basename(path))
+        extension = extension.lower()
+        if extension == '.csv':
+            alloys = {stem: (_CSVFile(path), stem)}
+        elif extension == '.json':
+            alloys = {stem: (_JSONFile(path), stem)}
+        elif extension in ('.h5', '.hdf5'):
+            if h5py is None:
+                self.skipped.append((path, 'h5py is not installed'))
+                return
+            source = _HDF5File(path)
+        elif extension == '.snap':
+            source = _SnapshotFile(path)
+        else:
+            return
+        if extension != '.csv' and extension != '.json':
+            # a file that cannot be read is left out, not the library
+            try:
+                alloys = {alloy: (source, part) for alloy, part in source.alloys(stem).items()}
+            except (OSError, ValueError) as error:
+                self.skipped.append((path, str(error)))
+                return
+        for alloy in alloys:
+            if alloy in self.index:
+                raise ValueError(f'alloy {alloy} is in both {self.index[alloy][0].path} '
+                                 f'and {path}')
+        self.index.update(alloys)
+
+    def __getstate__(self):
+        # the directory only; each process indexes it again and reads the
+        # tables it uses itself
+        return {'directory': self.directory}
+
+    def __setstate__(self, state):
+        self.__init__(state['directory'])
+
+    def alloys(self):
+        return list(self.index)
+
+    def __contains__(self, alloy):
+        return alloy in self.index
+
+    def _tables(self, alloy):
+        tables = self._loaded.get(alloy)
+        if tables is None:
+            if alloy not in self.index:
+                raise KeyError(f'alloy {alloy} is not in the library {self.directory}')
+            source, part = self.index[alloy]
+            tables = self._loaded[alloy] = {_key(name): table
+                                            for name, table in source.load(part).items()}
+        return tables
+
+    def properties(self, alloy):
+        """ the names of the properties of alloy, as matched """
+        return list(self._tables(alloy))
+
+    def table(self, alloy, property):
+        """ the x, y float64 buffers of property of alloy """
+        tables = self._tables(alloy)
+        key = _key(property)
+        if key not in tables:
+            raise KeyError(f'alloy {alloy} has no property {property}')
+        table = tables[key]
+        if isinstance(table, _HDF5Table):
+            table = tables[key] = table.read()
+        return table
+
+    def function(self, alloy, property):
+        """ a PiecewiseFunction of property of alloy, the same object for
+        every use """
+        memo = (alloy, _key(property))
+        function = self._functions.get(memo)
+        if function is None:
+            x, y = self.table(alloy, property)
+            function = self._functions[memo] = PiecewiseFunction(f'{alloy}-{property}', x, y)
+        return function
+
+    def material_dictionary(self, blocks):
+        """ {block: {property: PiecewiseFunction}} for blocks, a dict of
+        block: alloy, as taken by the make_input of the examples """
+        return {block: {name: self.function(alloy, name) for name in self.properties(alloy)}
+                for block, alloy in blocks.items()}
+
+    def add_alloy(self, moose, alloy, block, variable, mapping = None, name = None):
+        """ add the objects for the properties of alloy used on block to
+        moose, as mapping says, default_mapping if None: materials to
+        moose.materials and functions to moose.functions, made if need be.
+        Objects are named name-property, name being block if None, and
+        properties of the alloy not in the mapping are left out. Returns
+        a dict of property: the object made for it """
+        mapping = default_mapping if mapping is None else mapping
+        name = block if name is None else name
+        available = set(self.properties(alloy))
+        made = {}
+        for property, (use, moose_property) in mapping.items():
+            if _key(property) not in available:
+                continue
+            if use == PropertyUse.INTERPOLATION:
+                if moose.materials is None:
+                    moose.materials = Materials()
+                obj = ADPiecewiseLinearInterpolationMaterial(name=f'{name}-{property}',
+                    block=block, data=self.function(alloy, property),
+                    property=moose_property, variable=variable)
+                moose.materials.materials[obj.name] = obj
+            else:
+                if moose.functions is None:
+                    moose.functions = Functions()
+                x, y = self.table(alloy, property)
+                obj = PiecewiseLinear(f'{name}-{moose_property}-function', x=x, y=y)
+                moose.functions.functions[obj.name] = obj
+            made[property] = obj
+        return made
+
+    def write_snapshot(self, filename, alloys = None):
+        """ write the tables of alloys, all if None, to a snapshot that a
+        library indexing it reads without parsing, see moose.snapshot """
+        alloys = self.alloys() if alloys is None else alloys
+        data = {}
+        for alloy in alloys:
+            data[alloy] = {property: list(self.table(alloy, property))
+                           for property in self.properties(alloy)}
+        snapshot.write_snapshot(data, filename)
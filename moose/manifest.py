@@ -0,0 +1,62 @@
+#!/usr/env/python3
+
+""" A HashManifest records the digest of each input written through it,
+with the size and mtime the file had once written, so a later run can skip
+writing an input that has not changed without reading the file back: the
+input's digest, from MOOSEInput.digest, is compared with the manifest and
+the file is only checked with a stat. A file changed or removed since is
+written again.
+"""
+
+import json
+import os
+
+class HashManifest():
+    def __init__(self, filename):
+        self.filename = filename
+        self.entries = {}
+        self.written = 0
+        self.skipped = 0
+        if os.path.exists(filename):
+            with open(filename, 'r') as file:
+                self.entries = json.load(file)
+
+    def _unchanged(self, path, digest):
+        entry = self.entries.get(path)
+        if entry is None or entry[0] != digest:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return [stat.st_size, stat.st_mtime_ns] == entry[1:]
+
+    def write(self, moose, filename, table_dir = None, table_threshold = 1000):
+        """ write moose to filename unless the manifest shows the file
+        already holds it; returns whether the file was written """
+        path = os.path.abspath(filename)
+        digest = moose.digest(filename, table_dir, table_threshold)
+        if self._unchanged(path, digest):
+            self.skipped = self.skipped + 1
+            return False
+        moose.write(filename, table_dir, table_threshold)
+        stat = os.stat(path)
+        self.entries[path] = [digest, stat.st_size, stat.st_mtime_ns]
+        self.written = self.written + 1
+        return True
+
+    def write_all(self, inputs, table_dir = None, table_threshold = 1000):
+        """ write each (filename, moose) of inputs as write() does, then
+        save the manifest; returns the number of files written """
+        written = 0
+        for filename, moose in inputs:
+            if self.write(moose, filename, table_dir, table_threshold):
+                written = written + 1
+        self.save()
+        return written
+
+    def save(self):
+        temporary = f'{self.filename}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(self.entries, file)
+        os.replace(temporary, self.filename)
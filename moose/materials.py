@@ -1,6 +1,9 @@
 #!/usr/env/python3
 
 from enum import IntEnum, auto
+from moose.render import Renderable
+from moose.functions import PiecewiseFunction
+import moose.bulk as bulk
 
 class MaterialTypes(IntEnum):
     ADPiecewiseLinearInterpolationMaterial  = auto()
@@ -12,15 +15,21 @@ class MaterialTypes(IntEnum):
     ADComputeLinearElasticStress = auto()
     ADGenericFunctionMaterial = auto()
 
-class Material(object):
+class Material(Renderable):
+    __slots__ = ('name', 'block')
     def __init__(self, name = "", block = ""):
         self.name = name
         self.block = block
 
 class ADPiecewiseLinearInterpolationMaterial(Material):
+    __slots__ = ('material_type', 'data', 'property', 'variable')
     def __init__(self, name = "", block = "", **kwargs):
         super().__init__(name , block)    
-        self.data = kwargs.pop('data')
+        # the table is data, a PiecewiseFunction, or given as x and y
+        if 'data' in kwargs.keys():
+            self.data = kwargs.pop('data')
+        else:
+            self.data = PiecewiseFunction(name, kwargs.pop('x'), kwargs.pop('y'))
         self.material_type = MaterialTypes.ADPiecewiseLinearInterpolationMaterial 
         self.property = kwargs.pop('property')
         self.variable = kwargs.pop('variable')
@@ -36,7 +45,11 @@ class ADPiecewiseLinearInterpolationMaterial(Material):
         string += '[]\n'
         return string  
 
+    def simplify(self, tolerance, relative = False):
+        return self.data.simplify(tolerance, relative)
+
 class ADParsedMaterial(Material):
+    __slots__ = ('material_type', 'data', 'property', 'variable')
     def __init__(self, name = "", block = "", **kwargs):
         super().__init__(name , block)    
         self.data = kwargs.pop('data')
@@ -56,6 +69,7 @@ class ADParsedMaterial(Material):
         return string          
 
 class ADHeatConductionMaterial(Material):
+    __slots__ = ('material_type', 'variable', 'specific_heat', 'thermal_conductivity')
     def __init__(self, name = "", block = "", **kwargs):
         super().__init__(name , block)    
         self.material_type = MaterialTypes.ADHeatConductionMaterial 
@@ -75,6 +89,7 @@ class ADHeatConductionMaterial(Material):
         return string
 
 class ADComputeVariableIsotropicElasticityTensor(Material):
+    __slots__ = ('material_type', 'poissons_ratio', 'youngs_modulus')
     def __init__(self, name = "", block = "", **kwargs):
         super().__init__(name,block)
         self.material_type = MaterialTypes.ADComputeVariableIsotropicElasticityTensor
@@ -92,6 +107,9 @@ class ADComputeVariableIsotropicElasticityTensor(Material):
         return string
 
 class ADComputeMeanThermalExpansionFunctionEigenstrain(Material):
+    __slots__ = ('material_type', 'thermal_expansion',
+        'thermal_expansion_function_reference_temperature',
+        'stress_free_temperature', 'variable', 'eigenstrain_name')
     def __init__(self, name = "", block = "", **kwargs):
         super().__init__(name,block)
         self.material_type = MaterialTypes.ADComputeMeanThermalExpansionFunctionEigenstrain
@@ -115,6 +133,7 @@ class ADComputeMeanThermalExpansionFunctionEigenstrain(Material):
         return string
 
 class ADComputeSmallStrain(Material):
+    __slots__ = ('material_type', 'displacements', 'eigenstrain_names')
     def __init__(self, name = "", block = "", **kwargs):
         super().__init__(name,block)
         self.material_type = MaterialTypes.ADComputeSmallStrain
@@ -133,6 +152,7 @@ class ADComputeSmallStrain(Material):
         return string
 
 class ADComputeLinearElasticStress(Material):
+    __slots__ = ('material_type',)
     def __init__(self, name = "", block = "", **kwargs):
         super().__init__(name,block)
         self.material_type = MaterialTypes.ADComputeLinearElasticStress
@@ -146,6 +166,7 @@ class ADComputeLinearElasticStress(Material):
         return string
 
 class ADGenericFunctionMaterial(Material):
+    __slots__ = ('material_type', 'prop_names', 'prop_values')
     def __init__(self, name = "", block = "", **kwargs):
         super().__init__(name,block)
         self.material_type = MaterialTypes.ADGenericFunctionMaterial
@@ -164,7 +185,17 @@ class ADGenericFunctionMaterial(Material):
         string += '[]\n'
         return string
 
-class Materials:
+class Materials(Renderable):
+    # the class of each material type, for add_material and add_many
+    registry = {MaterialTypes.ADPiecewiseLinearInterpolationMaterial: ADPiecewiseLinearInterpolationMaterial,
+        MaterialTypes.ADParsedMaterial: ADParsedMaterial,
+        MaterialTypes.ADHeatConductionMaterial: ADHeatConductionMaterial,
+        MaterialTypes.ADComputeVariableIsotropicElasticityTensor: ADComputeVariableIsotropicElasticityTensor,
+        MaterialTypes.ADComputeMeanThermalExpansionFunctionEigenstrain: ADComputeMeanThermalExpansionFunctionEigenstrain,
+        MaterialTypes.ADComputeSmallStrain: ADComputeSmallStrain,
+        MaterialTypes.ADComputeLinearElasticStress: ADComputeLinearElasticStress,
+        MaterialTypes.ADGenericFunctionMaterial: ADGenericFunctionMaterial}
+
     def __init__(self):
         self.name = "Materials"
         self.materials = {}
@@ -172,27 +203,21 @@ class Materials:
     def add_material(self,name = "",type = None, block = "", **kwargs):
         if name in self.materials.keys():
             print(f'Material name {name} already in use')
-        if MaterialTypes(type) == MaterialTypes.ADPiecewiseLinearInterpolationMaterial:
-            material = ADPiecewiseLinearInterpolationMaterial(name,block,**kwargs)
-            self.materials[name] = material
-        elif MaterialTypes(type) == MaterialTypes.ADParsedMaterial:
-            material = ADParsedMaterial(name,block,**kwargs)
-            self.materials[name] = material
-        elif MaterialTypes(type) == MaterialTypes.ADHeatConductionMaterial:
-            material = ADHeatConductionMaterial(name,block,**kwargs)
-            self.materials[name] = material
-        elif MaterialTypes(type) == MaterialTypes.ADComputeVariableIsotropicElasticityTensor:
-            material = ADComputeVariableIsotropicElasticityTensor(name,block,**kwargs)
-            self.materials[name] = material
-        elif MaterialTypes(type) == MaterialTypes.ADComputeMeanThermalExpansionFunctionEigenstrain:
-            material = ADComputeMeanThermalExpansionFunctionEigenstrain(name,block,**kwargs)
-            self.materials[name] = material
-        elif MaterialTypes(type) == MaterialTypes.ADComputeSmallStrain:
-            material = ADComputeSmallStrain(name,block,**kwargs)
-            self.materials[name] = material
-        elif MaterialTypes(type) == MaterialTypes.ADComputeLinearElasticStress:
-            material = ADComputeLinearElasticStress(name,block,**kwargs)
-            self.materials[name] = material
+        cls = self.registry.get(MaterialTypes(type))
+        if cls is None:
+            raise ValueError(f'unknown material type {type}')
+        self.materials[name] = cls(name,block,**kwargs)
+
+    def add_many(self, data, references = None):
+        """ add a material for each row of data, see moose.bulk; returns them """
+        return bulk.add_many(self.materials, data, MaterialTypes, self.registry,
+            _construct_material, references)
+
+    def children(self):
+        return self.materials
+
+    def write_hit(self, writer):
+        writer.write_collection(self.name, self.materials.values())
 
     def __str__(self):
         string = f'[{self.name}]\n'
@@ -200,3 +225,6 @@ class Materials:
             string += self.materials[material].__str__()
         string += f'[]\n'
         return string
+
+def _construct_material(cls, material_type, name, kwargs):
+    return cls(name, kwargs.pop('block', ""), **kwargs)
@@ -1,6 +1,10 @@
 #!/usr/env/python3
 
+import os
 from enum import IntEnum, auto
+from moose.render import Renderable
+import moose.bulk as bulk
+from moose.exodus import read_exodus
 
 class MeshObjectTypes(IntEnum):
     FileMeshGenerator = auto()
@@ -13,11 +17,13 @@ class TransformTypes(IntEnum):
     ROTATE = auto()
     SCALE = auto()
 
-class MeshObject():
+class MeshObject(Renderable):
+    __slots__ = ('name',)
     def __init__(self, name = "", **kwargs):
         self.name = name
 
 class FileMeshGenerator(MeshObject):
+    __slots__ = ('mesh_object_type', 'filename', 'clear_spline_nodes')
     def __init__(self, name = "", **kwargs):
         super().__init__(name, **kwargs)
         self.mesh_object_type = MeshObjectTypes.FileMeshGenerator
@@ -26,6 +32,15 @@ class FileMeshGenerator(MeshObject):
         if 'clear_spline_nodes' in kwargs.keys():
             self.clear_spline_nodes = True
     
+    def exodus(self, directory = None):
+        """ the ExodusInfo of the mesh file, its blocks, side sets and node
+        sets, read from its header only, see moose.exodus. A relative
+        filename is taken from directory, that of the input, if given """
+        filename = self.filename
+        if directory is not None:
+            filename = os.path.join(directory, filename)
+        return read_exodus(filename)
+
     def __str__(self):
         string  = f'[{self.name}]\n'
         string += f'type={self.mesh_object_type.name}\n'
@@ -36,6 +51,7 @@ class FileMeshGenerator(MeshObject):
         return string
 
 class TransformGenerator(MeshObject):
+    __slots__ = ('mesh_object_type', 'input', 'transform', 'vector_value')
 
     def __init__(self, name = "", **kwargs):
         super().__init__(name, **kwargs)
@@ -68,12 +84,27 @@ class TransformGenerator(MeshObject):
         string += '[]\n'
         return string
 
-class Mesh():
+class Mesh(Renderable):
+    # the class of each mesh object type, for add_mesh_object and add_many
+    registry = {MeshObjectTypes.FileMeshGenerator: FileMeshGenerator,
+        MeshObjectTypes.TransformGenerator: TransformGenerator}
+
     def __init__(self):
         self.name = "Mesh"
         self.mesh_objects = {}
         self.second_order = False
-        
+
+    def children(self):
+        return self.mesh_objects
+
+    def write_hit(self, writer):
+        writer.open_block(self.name)
+        for mesh in self.mesh_objects.values():
+            writer.write_object(mesh)
+        if self.second_order:
+            writer.write_line('second_order=true')
+        writer.close_block()
+
     def __str__(self):
         string  = f'[{self.name}]\n'
         for mesh in self.mesh_objects.keys():
@@ -88,11 +119,15 @@ class Mesh():
     def add_mesh_object(self, name = "", type = None, **kwargs):
         if name in self.mesh_objects.keys():
             print (f'name {name} already in use')
+        if type not in self.registry.keys():
+            raise ValueError(f'unknown mesh object type {type}')
+        self.mesh_objects[name] = self.registry[type](name=name, **kwargs)
 
-        if type == MeshObjectTypes.FileMeshGenerator:
-            mesh = FileMeshGenerator(name=name, **kwargs)
-        elif type == MeshObjectTypes.TransformGenerator:
-            mesh = TransformGenerator(name=name, **kwargs)
-        
-        self.mesh_objects[name] = mesh
-        
\ No newline at end of file
+    def add_many(self, data, references = None):
+        """ add a mesh object for each row of data, see moose.bulk; returns
+        them """
+        return bulk.add_many(self.mesh_objects, data, MeshObjectTypes, self.registry,
+            _construct_mesh_object, references)
+
+def _construct_mesh_object(cls, mesh_type, name, kwargs):
+    return cls(name=name, **kwargs)
@@ -1,26 +1,32 @@
 #!/usr/env/python3
 
-import re
+import copy
+import fnmatch
+import hashlib
+import os
+import weakref
 
-def indent(string):
-    new_string = string.split('\n')
-    indent_count = 0
-    for idx,line in enumerate(new_string):
-        increments = re.findall('\[.+?\]',line)
-        decrements = re.findall('\[\]',line)
-        
-        if decrements:
-            indent_count = indent_count - 2
-
-        if indent_count > 0:
-            new_string[idx] = " "*indent_count + line
-
-        if increments:
-            indent_count = indent_count + 2
-
-    return '\n'.join(new_string)
+from moose.render import Renderable, render_cache, attributes, refers, write_pieces
+from moose.writer import HITWriter, TableFiles, BlockFiles
+from moose.reader import HITReader, HITNode, expand_includes, rebase_files
+from moose.tables import buffer_types, table_digest
+import moose.instrument as instrument
+import moose.snapshot as snapshot
+import moose.results as results
+from moose.validate import validate
 
 class MOOSEInput():
+    # the attribute holding each top level block, by its HIT name
+    block_attributes = {"Mesh": "mesh", "GlobalParams": "global_params",
+        "Variables": "variables", "AuxVariables": "aux_variables",
+        "Closures": "closures", "Components": "components",
+        "Kernels": "kernels", "AuxKernels": "aux_kernels",
+        "Functions": "functions", "BCs": "boundary_conditions",
+        "FluidProperties": "fluid_properties", "Materials": "materials",
+        "MultiApps": "multiapps", "Transfers": "transfers",
+        "Postprocessors": "post_processors", "Problem": "problem",
+        "Executioner": "executioner", "Outputs": "outputs"}
+
     def __init__(self):
         self.global_params = None
         self.mesh = None
@@ -40,31 +46,485 @@ class MOOSEInput():
         self.problem = None
         self.executioner = None
         self.outputs = None
+        # blocks read from an input that the object model does not know
+        self.extra_blocks = []
+        # objects only this input refers to since it was cloned, see clone()
+        self._owned = weakref.WeakSet()
+        self._shared = False
+
+    def __getstate__(self):
+        # the blocks only; a loaded input shares its objects with no clone
+        return {name: value for name, value in self.__dict__.items() if name[0] != '_'}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._owned = weakref.WeakSet()
+        self._shared = False
+
+    def blocks(self):
+        # the top level blocks in the order they are written
+        blocks = [self.mesh, self.global_params, self.variables,
+            self.aux_variables, self.closures, self.components, self.kernels,
+            self.aux_kernels, self.functions, self.boundary_conditions,
+            self.fluid_properties, self.materials, self.multiapps,
+            self.transfers, self.post_processors, self.problem,
+            self.executioner, self.outputs] + self.extra_blocks
+        return [block for block in blocks if block]
+
+    def clone(self):
+        """ a copy of this input that shares every block and object with it.
+        Get anything to change in either input through edit() or set(),
+        which copy the objects on the path to it first; changing a shared
+        object in place changes both inputs """
+        clone = MOOSEInput.__new__(MOOSEInput)
+        clone.__dict__.update(self.__dict__)
+        clone.extra_blocks = list(self.extra_blocks)
+        clone._owned = weakref.WeakSet()
+        clone._shared = True
+        self._owned = weakref.WeakSet()
+        self._shared = True
+        return clone
+
+    def edit(self, block, *path):
+        """ the object found by following path from the top level block
+        attribute, e.g. edit("materials", "cucrzr-density", "data"). Once
+        this input has been cloned, each object on the way that may be
+        shared with a clone is copied and the copy put in its place, so
+        only the path to an edit is duplicated. Other objects that refer
+        to a copied object still refer to the original """
+        obj = getattr(self, block)
+        if self._is_shared(obj):
+            obj = self._copy(obj)
+            setattr(self, block, obj)
+        for key in path:
+            child = _lookup(obj, key)
+            if self._is_shared(child):
+                child = self._copy(child)
+                _assign(obj, key, child)
+            obj = child
+        return obj
+
+    def _is_shared(self, obj):
+        if not self._shared:
+            return False
+        if not refers(obj) and not isinstance(obj, (list, dict) + buffer_types):
+            # numbers, strings and enums are never changed in place
+            return False
+        return obj not in self._owned
+
+    def _copy(self, obj):
+        new = copy.copy(obj)
+        # plain objects such as the Executioner keep their parameters in a
+        # dict or list that is copied along with them
+        if not isinstance(obj, Renderable) and hasattr(new, '__dict__'):
+            for key, value in new.__dict__.items():
+                if isinstance(value, (dict, list)):
+                    new.__dict__[key] = copy.copy(value)
+        if hasattr(new, '__weakref__'):
+            self._owned.add(new)
+        return new
+
+    def get(self, path):
+        """ the object or parameter at a HIT path such as
+        "Materials/cucrzr-density/data" or "Executioner/dt". After the block
+        and object names the parts are attribute names, or parameter names
+        of blocks that hold a parameter dict. Each part is one dict lookup
+        in the block table or a collection, so the cost does not grow with
+        the size of the model """
+        parts = path.split('/')
+        if parts[0] not in self.block_attributes.keys():
+            raise KeyError(path)
+        obj = getattr(self, self.block_attributes[parts[0]])
+        try:
+            if obj is None:
+                raise KeyError(parts[0])
+            for key in parts[1:]:
+                obj = _lookup(obj, key)
+        except KeyError:
+            raise KeyError(path) from None
+        return obj
+
+    def glob(self, pattern):
+        """ a dict of path: value for every existing path matching pattern,
+        where each part may use the wildcards of fnmatch, e.g.
+        "Materials/*/block" """
+        parts = pattern.split('/')
+        matches = {}
+        blocks = [name for name in self.block_attributes.keys()
+            if getattr(self, self.block_attributes[name]) is not None]
+        for name in _match(blocks, parts[0]):
+            self._glob(getattr(self, self.block_attributes[name]), name,
+                parts[1:], matches)
+        return matches
+
+    def _glob(self, obj, path, parts, matches):
+        if not parts:
+            matches[path] = obj
+            return
+        if _is_pattern(parts[0]):
+            keys = _match(_names(obj), parts[0])
+        else:
+            keys = [parts[0]]
+        for key in keys:
+            try:
+                child = _lookup(obj, key)
+            except KeyError:
+                continue
+            self._glob(child, f'{path}/{key}', parts[1:], matches)
+
+    def set(self, path, value):
+        """ set the object or parameter at path, or at every existing path
+        matching a pattern, copying anything shared with a clone on the way
+        as edit() does. Returns the paths that were set """
+        if _is_pattern(path):
+            paths = list(self.glob(path).keys())
+        else:
+            paths = [path]
+        for path in paths:
+            parts = path.split('/')
+            if parts[0] not in self.block_attributes.keys():
+                raise KeyError(path)
+            block = self.block_attributes[parts[0]]
+            if len(parts) == 1:
+                setattr(self, block, value)
+                continue
+            try:
+                parent = self.edit(block, *parts[1:-1])
+            except (KeyError, AttributeError):
+                raise KeyError(path) from None
+            _assign(parent, parts[-1], value)
+        return paths
+
+    def simplify_tables(self, tolerance, relative = False):
+        """ simplify every piecewise linear table in functions and materials
+        to within tolerance, see moose.tables.simplify_table. Returns a dict
+        of path: Simplification """
+        reports = {}
+        if self.functions is not None:
+            for key, function in list(self.functions.functions.items()):
+                if hasattr(function, 'simplify') and hasattr(function, 'x'):
+                    function = self.edit("functions", key)
+                    reports[f'Functions/{key}'] = function.simplify(tolerance, relative)
+        if self.materials is not None:
+            for key, material in list(self.materials.materials.items()):
+                if hasattr(getattr(material, 'data', None), 'simplify'):
+                    data = self.edit("materials", key, "data")
+                    reports[f'Materials/{key}'] = data.simplify(tolerance, relative)
+        return reports
+
+    def deduplicate_tables(self):
+        """ share tables that are the same in more than one place. A
+        PiecewiseLinear function with the same table and parameters as one
+        before it is removed from [Functions] and the objects referring to
+        it are pointed at the first. ADPiecewiseLinearInterpolationMaterials
+        with the same table, property and variable are merged into the first
+        of them, which is given all of their blocks; MOOSE reads the table of
+        this material inline, so it cannot refer to a function instead.
+        Returns a dict of removed name: kept name for functions and
+        materials """
+        replaced = {}
+        if self.functions is not None:
+            kept = {}
+            duplicates = {}
+            for key, function in self.functions.functions.items():
+                if not hasattr(function, 'simplify') or not hasattr(function, 'x'):
+                    continue
+                params = [(name, value) for name, value in attributes(function)
+                    if name not in ('name', 'x', 'y')]
+                digest = (table_digest(function.x, function.y), repr(params))
+                if digest in kept.keys():
+                    duplicates[id(function)] = kept[digest]
+                    replaced[key] = kept[digest].name
+                else:
+                    kept[digest] = function
+            if duplicates:
+                functions = self.edit("functions").functions
+                for name in replaced.keys():
+                    del functions[name]
+                self._replace_references(duplicates)
+
+        if self.materials is not None:
+            kept = {}
+            merged = {}
+            for key, material in self.materials.materials.items():
+                data = getattr(material, 'data', None)
+                if not hasattr(data, 'simplify') or not material.block:
+                    continue
+                digest = (type(material), table_digest(data.x_data, data.y_data),
+                    material.property, material.variable.name, getattr(data, 'precision', None))
+                if digest in kept.keys():
+                    merged.setdefault(kept[digest], []).append(key)
+                else:
+                    kept[digest] = key
+            materials = self.edit("materials").materials if merged else {}
+            for key, others in merged.items():
+                blocks = materials[key].block.split()
+                for other in others:
+                    blocks.extend(block for block in materials[other].block.split()
+                        if block not in blocks)
+                    del materials[other]
+                    replaced[other] = key
+                material = self.edit("materials", key)
+                material.block = ' '.join(blocks)
+        return replaced
+
+    def _replace_references(self, replacements):
+        # point attributes of objects in any block that refer to an object
+        # whose id is in replacements at its replacement
+        def replace(value):
+            if id(value) in replacements.keys():
+                return replacements[id(value)]
+            if isinstance(value, list) and any(id(x) in replacements.keys() for x in value):
+                return [replacements.get(id(x), x) for x in value]
+            return value
+
+        for block in self.block_attributes.values():
+            collection = getattr(self, block)
+            if collection is None or not hasattr(collection, 'children'):
+                continue
+            for key, obj in list(collection.children().items()):
+                changes = {}
+                for name, value in attributes(obj):
+                    new = replace(value)
+                    if new is not value:
+                        changes[name] = new
+                if changes:
+                    obj = self.edit(block, key)
+                    for name, value in changes.items():
+                        setattr(obj, name, value)
+
+    def write_hit(self, writer):
+        for block in self.blocks():
+            writer.write_object(block)
+
+    def validate(self, blocks = None, boundaries = None, variables = ()):
+        """ the problems with the references between the objects of this
+        input, as a list of moose.validate.Problem, empty if there are none.
+        blocks and boundaries, the names of those of the mesh, are checked
+        only if given; variables are any made by MOOSE itself, as by
+        thermal hydraulics components """
+        return validate(self, blocks, boundaries, variables)
+
+    def fingerprint(self, directory = None):
+        """ a sha256 hex digest of this input that does not depend on the
+        order of its objects or how its numbers are written, and takes the
+        files it names by their content, found from directory or the
+        working directory; see moose.results """
+        return results.fingerprint(self, directory)
+
+    def _writer(self, stream, filename, table_dir, table_threshold):
+        # a HITWriter to stream writing large tables to table_dir, with
+        # data_file paths relative to filename if it is a path
+        tables = None
+        if table_dir is not None:
+            reference = table_dir
+            if filename is not None and not hasattr(filename, 'write'):
+                directory = os.path.dirname(os.path.abspath(filename))
+                reference = os.path.relpath(os.path.abspath(table_dir), directory)
+            tables = TableFiles(table_dir, table_threshold, reference)
+        writer = HITWriter(stream, tables=tables)
+        if instrument.active is not None and stream is not None:
+            # within a WriteProfile, see moose.instrument
+            writer = instrument.active.writer(writer)
+        return writer
+
+    def write(self, filename, table_dir = None, table_threshold = 1000, skip_unchanged = False,
+              split_dir = None):
+        """ write the input to filename, which may also be an open file or
+        any object with a write method. With table_dir, PiecewiseLinear
+        tables of table_threshold or more points are written once each to
+        csv files there and read by MOOSE through data_file. With
+        skip_unchanged, a file that already holds the same bytes is left
+        as it is, mtime and all. With split_dir, each top level block is
+        written to a file of its own there, named by a hash of its text,
+        and filename holds only the !include of each; the relative paths of
+        file parameters are made relative to split_dir, as MOOSE finds them
+        from the file they are in. A block file already there is not
+        written again, so inputs sharing blocks share files; see
+        BlockFiles.prune to remove those no input includes any more.
+        Returns whether the file was written """
+        if split_dir is not None:
+            return self._write_split(filename, split_dir, table_dir, table_threshold,
+                                     skip_unchanged)
+        if hasattr(filename, 'write'):
+            self.write_hit(self._writer(filename, filename, table_dir, table_threshold))
+            return True
+        if not skip_unchanged:
+            with open(filename,'w') as file:
+                self.write_hit(self._writer(file, filename, table_dir, table_threshold))
+            return True
+
+        lines = _Lines()
+        self.write_hit(self._writer(lines, filename, table_dir, table_threshold))
+        data = [piece.encode() for piece in lines.pieces]
+        if _same_file(filename, data):
+            return False
+        with open(filename,'wb') as file:
+            file.writelines(data)
+        return True
+
+    def _write_split(self, filename, split_dir, table_dir, table_threshold, skip_unchanged):
+        reference = split_dir
+        directory = '.'
+        if not hasattr(filename, 'write'):
+            directory = os.path.dirname(os.path.abspath(filename))
+            reference = os.path.relpath(os.path.abspath(split_dir), directory)
+        files = BlockFiles(split_dir, reference)
+        writer = self._writer(None, filename, table_dir, table_threshold)
+        lines = []
+        for block in self.blocks():
+            cached = render_cache.enabled and isinstance(block, Renderable)
+            if cached:
+                pieces = block.render(writer)
+            else:
+                pieces = _Lines()
+                writer.stream = pieces
+                writer.write_object(block)
+                pieces = pieces.pieces
+            # MOOSE finds the files a block file names from its directory
+            rebased = [rebase_files(piece, directory, split_dir) for piece in pieces]
+            if cached and all(new is old for new, old in zip(rebased, pieces)):
+                digest = block.digest(writer).hex()
+            else:
+                digest = hashlib.sha256(''.join(rebased).encode()).hexdigest()
+            lines.append(f'!include {files.write(block.name, digest, rebased)}\n')
+        if hasattr(filename, 'write'):
+            write_pieces(filename, lines)
+            return True
+        data = [line.encode() for line in lines]
+        if skip_unchanged and _same_file(filename, data):
+            return False
+        with open(filename, 'wb') as file:
+            file.writelines(data)
+        return True
+
+    def digest(self, filename = None, table_dir = None, table_threshold = 1000):
+        """ a sha256 hex digest of the text write() would write with the
+        same arguments. It is made from a digest per top level block, each
+        kept until the block changes, so the digest of a clone with one
+        changed block only hashes that block again """
+        writer = self._writer(None, filename, table_dir, table_threshold)
+        digest = hashlib.sha256()
+        for block in self.blocks():
+            if render_cache.enabled and isinstance(block, Renderable):
+                digest.update(block.digest(writer))
+            else:
+                lines = _Lines()
+                writer.stream = lines
+                writer.write_object(block)
+                digest.update(hashlib.sha256(''.join(lines.pieces).encode()).digest())
+        return digest.hexdigest()
+
+    def read(self, filename, compact_arrays = False):
+        # filename may also be an open file or any object with a read method;
+        # compact_arrays reads x/y tables into float64 buffers rather than
+        # text, see moose.tables
+        if hasattr(filename, 'read'):
+            text = filename.read()
+        else:
+            with open(filename,'r') as file:
+                text = file.read()
+        if '!include' in text:
+            directory = '.' if hasattr(filename, 'read') else os.path.dirname(filename)
+            text = expand_includes(text, directory)
+        HITReader(self, compact_arrays).read(text)
+
+    def write_snapshot(self, filename):
+        """ save this input as a binary snapshot, see moose.snapshot """
+        snapshot.write_snapshot(self, filename)
+
+    @classmethod
+    def read_snapshot(cls, filename, mmap_tables = True):
+        """ the input saved to the snapshot filename by write_snapshot """
+        moose = snapshot.read_snapshot(filename, mmap_tables)
+        if not isinstance(moose, cls):
+            raise ValueError(f'{filename} holds a {type(moose).__name__}, not a {cls.__name__}')
+        return moose
+
+class _Lines():
+    # a stream keeping what is written to it as a list of pieces
+    def __init__(self):
+        self.pieces = []
+
+    def write(self, text):
+        self.pieces.append(text)
+
+    def writelines(self, pieces):
+        self.pieces.extend(pieces)
+
+def _same_file(filename, data):
+    # whether the file holds the bytes of the pieces of data, comparing
+    # sizes first and sha256 digests only if the sizes are the same
+    try:
+        if os.path.getsize(filename) != sum(len(piece) for piece in data):
+            return False
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return False
+    expected = hashlib.sha256()
+    for piece in data:
+        expected.update(piece)
+    return digest.digest() == expected.digest()
+
+def _is_pattern(path):
+    return any(x in path for x in '*?[')
+
+def _match(names, pattern):
+    return [name for name in names if fnmatch.fnmatchcase(name, pattern)]
+
+def _names(obj):
+    # the names one level below obj in a path
+    if isinstance(obj, HITNode):
+        return [child.name for child in obj.children] + list(obj.params.keys())
+    if hasattr(obj, 'children'):
+        return list(obj.children().keys())
+    if hasattr(obj, 'parameters'):
+        return list(obj.parameters().keys())
+    if refers(obj):
+        return [key for key, value in attributes(obj) if not key.startswith('_')]
+    return []
+
+def _lookup(obj, key):
+    # the child, parameter or attribute called key of obj
+    if isinstance(obj, HITNode):
+        for child in obj.children:
+            if child.name == key:
+                return child
+        return obj.params[key]
+    if hasattr(obj, 'children'):
+        children = obj.children()
+        if key in children:
+            return children[key]
+    if hasattr(obj, 'parameters'):
+        parameters = obj.parameters()
+        if key in parameters:
+            return parameters[key]
+    if key.startswith('_'):
+        raise KeyError(key)
+    try:
+        return getattr(obj, key)
+    except AttributeError:
+        raise KeyError(key) from None
 
-    def write(self, filename):
-        file = open(filename,'w')
-        # first the mesh block
-        if self.mesh: file.write(indent(self.mesh.__str__()))
-        if self.global_params: file.write(indent(self.global_params.__str__()))
-        if self.variables: file.write(indent(self.variables.__str__()))
-        if self.aux_variables: file.write(indent(self.aux_variables.__str__()))
-        if self.closures: file.write(indent(self.closures.__str__()))
-        if self.components: file.write(indent(self.components.__str__()))
-        if self.kernels: file.write(indent(self.kernels.__str__()))
-        if self.aux_kernels: file.write(indent(self.aux_kernels.__str__()))
-        if self.functions: file.write(indent(self.functions.__str__()))
-        if self.boundary_conditions: file.write(indent(self.boundary_conditions.__str__()))
-        if self.fluid_properties: file.write(indent(self.fluid_properties.__str__()))
-        if self.materials: file.write(indent(self.materials.__str__()))
-        if self.multiapps: file.write(indent(self.multiapps.__str__()))
-        if self.transfers: file.write(indent(self.transfers.__str__()))
-        if self.post_processors: file.write(indent(self.post_processors.__str__()))
-        if self.executioner: file.write(indent(self.executioner.__str__()))
-        if self.outputs: file.write(indent(self.outputs.__str__()))
-
-        file.close()
-
-    def read(self, filename):
-        file = open(filename,'r')
-        file.close()
-    
+def _assign(obj, key, value):
+    # set the child, parameter or attribute called key of obj; a new key
+    # on a collection or parameter block is a new child or parameter
+    if isinstance(obj, HITNode):
+        for idx, child in enumerate(obj.children):
+            if child.name == key:
+                obj.children[idx] = value
+                return
+        obj.params[key] = value
+    elif hasattr(obj, 'children') and (key in obj.children() or not hasattr(obj, key)):
+        obj.children()[key] = value
+    elif hasattr(obj, 'parameters') and (key in obj.parameters() or not hasattr(obj, key)):
+        obj.parameters()[key] = value
+    else:
+        try:
+            setattr(obj, key, value)
+        except AttributeError:
+            # a class with __slots__ has no attribute of that name
+            raise KeyError(key) from None
@@ -1,6 +1,7 @@
 #!/usr/env/python3
 
 from enum import IntEnum, auto
+from moose.render import Renderable, refers
 
 class MultiAppTypes(IntEnum):
     CentroidMultiApp = auto()
@@ -12,7 +13,7 @@ class AppTypes(IntEnum):
     CombinedTestApp = auto()
     ThermalHydraulicsApp = auto()
 
-class MultiApp:
+class MultiApp(Renderable):
     def __init__(self, name = "", input_files = [], **kwargs):
         self.name = name
         self.input_files = input_files
@@ -30,7 +31,7 @@ class MultiApp:
                 if isinstance(data,list):
                     data = [str(x) for x in data]
                     data = ' '.join(data)
-                if hasattr(data, '__dict__'):
+                if refers(data):
                     data = data.name
                 string += f'{key}={data}\n'
         string += '[]\n'
@@ -51,11 +52,17 @@ class TransientMultiApp(MultiApp):
         super().__init__(name,input_files,**kwargs)  
         self.type = MultiAppTypes.TransientMultiApp  
 
-class MultiApps:
+class MultiApps(Renderable):
     def __init__(self):
         self.name = "MultiApps"
         self.multiapps = {}
 
+    def children(self):
+        return self.multiapps
+
+    def write_hit(self, writer):
+        writer.write_collection(self.name, self.multiapps.values())
+
     def __str__(self):
         string = f'[{self.name}]\n'
         for multiapp in self.multiapps.keys():
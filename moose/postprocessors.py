@@ -1,13 +1,15 @@
 #!/usr/env/python3
 
 from enum import IntEnum, auto
+from moose.render import Renderable, refers
+import moose.bulk as bulk
 
 class PostProcessorTypes(IntEnum):
     NodalExtremeValue = auto()
     ElementExtremeValue = auto()    
     ElementAverageValue = auto()  
 
-class PostProcessor():
+class PostProcessor(Renderable):
     def __init__(self, name = "", variable = None, block = "", **kwargs):
         self.name = name
         self.variable = variable
@@ -27,12 +29,12 @@ class PostProcessor():
             if key not in objects:
                 data = self.__dict__[key]
                 if isinstance(data,list):
-                    if hasattr(data[0], '__dict__'):
+                    if refers(data[0]):
                         data = [x.name for x in data]
                     else:
                         data = [str(x) for x in data]
                     data = ' '.join(data)
-                if hasattr(data, '__dict__'):
+                if refers(data):
                     data = data.name
                 string += f'{key}="{data}"\n'
 
@@ -54,14 +56,42 @@ class ElementAverageValue(PostProcessor):
         super().__init__(name,variable,block,**kwargs)
         self.type = PostProcessorTypes.ElementAverageValue
     
-class PostProcessors():
+class PostProcessors(Renderable):
+    # the class of each postprocessor type, for add_post_processor and
+    # add_many
+    registry = {PostProcessorTypes.NodalExtremeValue: NodalExtremeValue,
+        PostProcessorTypes.ElementExtremeValue: ElementExtremeValue,
+        PostProcessorTypes.ElementAverageValue: ElementAverageValue}
+
     def __init__(self):
         self.name = "Postprocessors"
         self.post_processors = {}
 
+    def add_post_processor(self, name, type, variable = None, block = "", **kwargs):
+        if name in self.post_processors.keys():
+            print(f'postprocessor name {name} already in use')
+        if type not in self.registry.keys():
+            raise ValueError(f'unknown postprocessor type {type}')
+        self.post_processors[name] = self.registry[type](name, variable, block, **kwargs)
+
+    def add_many(self, data, references = None):
+        """ add a postprocessor for each row of data, see moose.bulk; returns
+        them """
+        return bulk.add_many(self.post_processors, data, PostProcessorTypes,
+            self.registry, _construct_post_processor, references)
+
+    def children(self):
+        return self.post_processors
+
+    def write_hit(self, writer):
+        writer.write_collection(self.name, self.post_processors.values())
+
     def __str__(self):
         string =  f'[{self.name}]\n'
         for key in self.post_processors.keys():
             string += self.post_processors[key].__str__()
         string += '[]\n'
-        return string
\ No newline at end of file
+        return string
+
+def _construct_post_processor(cls, pp_type, name, kwargs):
+    return cls(name, kwargs.pop('variable', None), kwargs.pop('block', ""), **kwargs)
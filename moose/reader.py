@@ -0,0 +1,574 @@
+#!/usr/env/python3
+
+""" A HITReader loads a HIT input back into the object model. The text is
+tokenized in a single pass into a tree of HITNodes, which is then turned
+into the Mesh, Variables, Kernels, Materials, ... objects of a MOOSEInput.
+Blocks or types the object model does not know are kept as HITNodes so they
+are written back out unchanged, and so is any object that, as built, would
+not write back every parameter and sub-block it was read from with the
+same value: a Variable with an initial_condition, a kernel with a
+parameter the model has no attribute for, an Executioner with a
+TimeStepper.
+
+The tokenizer is a single compiled regular expression, so large inline
+x/y tables are consumed by the regex engine rather than character by
+character in Python. The target is 50 MB/s or better on table heavy
+inputs: a synthetic 50 MB input of 2000 point PiecewiseLinear tables reads
+at around 95 MB/s, or 35 MB/s with compact_arrays. Inputs made of many
+small blocks are bound by object construction and the check of what each
+object writes instead, at a few MB/s.
+moose.benchmark measures the rate of reading.
+"""
+
+import io
+import os
+import re
+
+from moose.tables import parse_table
+from moose.writer import HITWriter
+from moose.variables import Variables, AuxVariables, Variable, Order, Family
+from moose.global_parameters import GlobalParameters
+from moose.mesh import Mesh, MeshObjectTypes, TransformTypes
+from moose.kernels import Kernels, AuxKernels, KernelTypes, AuxKernelTypes, \
+    ScalarType, ADHeatConduction, ADHeatConductionTimeDerivative, \
+    TensorMechanics, ADGravity, ParsedAux, ADRankTwoAux, ADRankTwoScalarAux
+from moose.functions import Functions, GenericFunction, PiecewiseFunction, \
+    PiecewiseLinear, MooseFunctionTypes
+from moose.materials import Materials, MaterialTypes, \
+    ADPiecewiseLinearInterpolationMaterial, ADParsedMaterial, \
+    ADHeatConductionMaterial, ADComputeVariableIsotropicElasticityTensor, \
+    ADComputeMeanThermalExpansionFunctionEigenstrain, ADComputeSmallStrain, \
+    ADComputeLinearElasticStress, ADGenericFunctionMaterial
+from moose.boundary_conditions import BoundaryConditions, \
+    BoundaryConditionTypes, ADDirichletBC, ADNeumannBC, \
+    ADConvectiveHeatFluxBC, Pressure
+import moose.components as components
+import moose.closures as closures
+import moose.fluidproperties as fluidproperties
+import moose.multiapps as multiapps
+import moose.postprocessors as postprocessors
+import moose.transfers as transfers
+from moose.executioner import Executioner
+from moose.outputs import Outputs
+
+# each match is one block header or parameter, together with the whitespace
+# and comments in front of it
+_TOKEN = re.compile(r'''
+    (?:\s+|\#[^\n]*)*
+    (?: \[([^\]\s]*)\]
+      | ([^\s=\[\]\#"']+)[ \t]*=[ \t]*
+        (?: "([^"]*)"
+          | '([^']*)'
+          | ((?:\$\{[^}]*\}|[^\s\#\[\]"'])*) )
+      | (\S) )
+''', re.VERBOSE | re.DOTALL)
+
+class HITSyntaxError(ValueError):
+    pass
+
+_INCLUDE = re.compile(r'^[ \t]*!include[ \t]+(\S+)[ \t]*$', re.MULTILINE)
+
+# the parameters that name files, relative to the file they are in
+file_parameters = ('file', 'data_file', 'input_files', 'positions_file', 'filename')
+_FILES = re.compile(r'''^([ \t]*(?:%s)[ \t]*=[ \t]*)("[^"]*"|'[^']*'|[^\s\#"']+)'''
+                    % '|'.join(file_parameters), re.MULTILINE)
+
+def rebase_files(text, source, target):
+    """ text with the relative paths of its file parameters, relative to the
+    directory source, made relative to the directory target instead """
+    source = os.path.abspath(source)
+    target = os.path.abspath(target)
+    if source == target or not _FILES.search(text):
+        return text
+    def rebase(match):
+        value = match.group(2)
+        quote = value[0] if value[0] in '"\'' else ''
+        paths = value[1:-1].split() if quote else [value]
+        paths = [path if os.path.isabs(path) or '${' in path
+                 else os.path.relpath(os.path.join(source, path), target) for path in paths]
+        return f'{match.group(1)}{quote}{" ".join(paths)}{quote}'
+    return _FILES.sub(rebase, text)
+
+def expand_includes(text, directory):
+    """ text with each !include line replaced by the text of the file it
+    names, relative to directory, and the includes in that in turn. The
+    file parameters of an included file are relative to it, so they are
+    made relative to directory """
+    def include(match):
+        path = os.path.join(directory, match.group(1))
+        with open(path, 'r') as file:
+            included = expand_includes(file.read(), os.path.dirname(path))
+        return rebase_files(included, os.path.dirname(path), directory)
+    return _INCLUDE.sub(include, text)
+
+class HITNode():
+    def __init__(self, name = ""):
+        self.name = name
+        self.params = {}
+        self.children = []
+
+    def __str__(self):
+        string = f'[{self.name}]\n'
+        for key in self.params.keys():
+            value = self.params[key]
+            if value == "" or any(x.isspace() for x in value):
+                value = f'"{value}"'
+            string += f'{key}={value}\n'
+        for child in self.children:
+            string += child.__str__()
+        string += '[]\n'
+        return string
+
+def parse_hit(text):
+    """ tokenize text into a root HITNode whose children are the top level
+    blocks """
+    root = HITNode()
+    stack = [root]
+    for match in _TOKEN.finditer(text):
+        name, key, double, single, bare, error = match.groups()
+        if key is not None:
+            if double is not None:
+                value = double
+            elif single is not None:
+                value = single
+            else:
+                value = bare
+            # quoted values continued over several lines are joined, the
+            # line breaks and indentation are not part of the value
+            if '\n' in value:
+                value = ' '.join(value.split())
+            stack[-1].params[key] = value
+        elif name is not None:
+            if name == '' or name == '../':
+                if len(stack) == 1:
+                    raise HITSyntaxError(_where(text, match, 'unmatched []'))
+                stack.pop()
+            else:
+                if name.startswith('./'):
+                    name = name[2:]
+                node = HITNode(name)
+                stack[-1].children.append(node)
+                stack.append(node)
+        elif error is not None:
+            raise HITSyntaxError(_where(text, match, f'unexpected {error!r}'))
+    if len(stack) > 1:
+        raise HITSyntaxError(f'block [{stack[-1].name}] is never closed')
+    return root
+
+def _same_value(value, written):
+    if value == written or value.split() == written.split():
+        return True
+    try:
+        # numbers, such as a table read into floats and written again
+        return [float(x) for x in value.split()] == [float(x) for x in written.split()]
+    except ValueError:
+        return False
+
+def _same(node, written):
+    # whether written, a HITNode, keeps everything in node: each parameter
+    # with the same value, and each sub-block
+    if node.name != written.name or len(node.children) != len(written.children):
+        return False
+    for key, value in node.params.items():
+        other = written.params.get(key)
+        if other is None or not _same_value(value, other):
+            return False
+    return all(_same(child, other) for child, other in zip(node.children, written.children))
+
+def _written(obj, depth):
+    # obj as written at depth, read back as a list of HITNodes; written
+    # without the render cache, which would keep a copy of the text
+    stream = io.StringIO()
+    writer = HITWriter(stream)
+    writer.depth = depth
+    if hasattr(obj, 'write_hit'):
+        obj.write_hit(writer)
+    else:
+        writer.write_text(obj.__str__())
+    return parse_hit(stream.getvalue()).children
+
+def _wrapped(name, node):
+    # node as the only sub-block of a block name
+    wrapper = HITNode(name)
+    wrapper.children.append(node)
+    return wrapper
+
+def _where(text, match, message):
+    line = text.count('\n', 0, match.end()) + 1
+    return f'line {line}: {message}'
+
+class RawParameter():
+    """ a parameter whose value is kept as the text read from the input,
+    for objects that hold an expression object we cannot reconstruct """
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+    def __str__(self):
+        return f'{self.name}="{self.value}"\n'
+
+class HITReader():
+    # the top level blocks in the order they are built, so references to
+    # variables, functions and mesh objects resolve to already built objects
+    block_order = ["Mesh", "Variables", "AuxVariables", "GlobalParams",
+        "FluidProperties", "Closures", "Functions", "Components", "Kernels",
+        "AuxKernels", "BCs", "Materials", "MultiApps", "Transfers",
+        "Postprocessors", "Problem", "Executioner", "Outputs"]
+
+    def __init__(self, moose, compact_arrays = False):
+        self.moose = moose
+        self.compact_arrays = compact_arrays
+        self.stub_variables = {}
+        self.stub_functions = {}
+
+    def read(self, text):
+        root = parse_hit(text)
+        nodes = {}
+        for node in root.children:
+            if node.name in self.block_order and node.name not in nodes:
+                nodes[node.name] = node
+            else:
+                self.moose.extra_blocks.append(node)
+
+        for name in self.block_order:
+            if name in nodes:
+                builder = getattr(self, '_read_' + name.lower())
+                builder(nodes[name])
+
+    def variable(self, name):
+        for variables in [self.moose.variables, self.moose.aux_variables]:
+            if variables and name in variables.variables.keys():
+                return variables.variables[name]
+        # variables created by MOOSE itself, e.g. by thermal hydraulics
+        # components, are not declared in the input
+        if name not in self.stub_variables.keys():
+            self.stub_variables[name] = Variable(name = name)
+        return self.stub_variables[name]
+
+    def _variables(self, names):
+        # a variable, or a list of them for several names
+        names = names.split()
+        if len(names) == 1:
+            return self.variable(names[0])
+        return [self.variable(name) for name in names]
+
+    def function(self, name):
+        if self.moose.functions and name in self.moose.functions.functions.keys():
+            return self.moose.functions.functions[name]
+        if name not in self.stub_functions.keys():
+            self.stub_functions[name] = GenericFunction(name)
+        return self.stub_functions[name]
+
+    def kept(self, obj, node, depth = 1):
+        """ obj if writing it keeps every parameter and sub-block of node, the
+        node it was read from, and node itself otherwise """
+        if obj is node:
+            return obj
+        written = _written(obj, depth)
+        if len(written) == 1 and _same(node, written[0]):
+            return obj
+        return node
+
+    def compact(self, obj, tables):
+        # with compact_arrays, tables, a dict of attribute: text, read into
+        # float64 buffers on obj; done once obj is kept, so the check of
+        # what it writes copies the text rather than formatting numbers
+        if self.compact_arrays:
+            for name, text in tables.items():
+                setattr(obj, name, parse_table(text))
+
+    def _read_mesh(self, node):
+        mesh = Mesh()
+        for child in node.children:
+            params = child.params
+            mesh_type = params.get('type')
+            if mesh_type == MeshObjectTypes.FileMeshGenerator.name:
+                kwargs = {'filename': params['file']}
+                if params.get('clear_spline_nodes') == 'true':
+                    kwargs['clear_spline_nodes'] = True
+                mesh.add_mesh_object(child.name, MeshObjectTypes.FileMeshGenerator, **kwargs)
+            elif mesh_type == MeshObjectTypes.TransformGenerator.name:
+                mesh.add_mesh_object(child.name, MeshObjectTypes.TransformGenerator,
+                    input = mesh.mesh_objects[params['input']],
+                    transform = TransformTypes[params['transform']],
+                    vector_value = params['vector_value'].split())
+            else:
+                mesh.mesh_objects[child.name] = child
+            mesh.mesh_objects[child.name] = self.kept(mesh.mesh_objects[child.name], child)
+        mesh.second_order = node.params.get('second_order') == 'true'
+        self.moose.mesh = self.kept(mesh, node, 0)
+
+    def _read_variables(self, node, variables = None):
+        if variables is None:
+            variables = Variables()
+            self.moose.variables = variables
+        for child in node.children:
+            params = child.params
+            variables.add_variable(child.name,
+                Order[params.get('order', 'FIRST')],
+                Family[params.get('family', 'LAGRANGE')],
+                params.get('block', ''))
+            variables.variables[child.name] = self.kept(variables.variables[child.name], child)
+
+    def _read_auxvariables(self, node):
+        self.moose.aux_variables = AuxVariables()
+        self._read_variables(node, self.moose.aux_variables)
+
+    def _read_globalparams(self, node):
+        members = dict(node.params)
+        if 'displacements' in members.keys():
+            members['displacements'] = [self.variable(x) for x in members['displacements'].split()]
+        for key, value in members.items():
+            if value in ('true', 'false'):
+                members[key] = value == 'true'
+        self.moose.global_params = self.kept(GlobalParameters(**members), node, 0)
+
+    def _read_kernels(self, node):
+        kernels = Kernels()
+        for child in node.children:
+            params = dict(child.params)
+            kernel_type = params.pop('type', None)
+            block = params.pop('block', None)
+            if kernel_type is None and child.name == 'TensorMechanics':
+                kernel = TensorMechanics(child.name, None, block,
+                    displacements = [self.variable(x) for x in params['displacements'].split()],
+                    generate_output = params['generate_output'].split(),
+                    eigenstrain_names = params['eigenstrain_names'])
+            elif kernel_type == KernelTypes.ADHeatConduction.name:
+                kernel = ADHeatConduction(child.name, self.variable(params.pop('variable')),
+                    block, **params)
+            elif kernel_type == KernelTypes.ADHeatConductionTimeDerivative.name:
+                kernel = ADHeatConductionTimeDerivative(child.name,
+                    self.variable(params.pop('variable')), block, **params)
+            elif kernel_type == KernelTypes.ADGravity.name:
+                kernel = ADGravity(child.name, self.variable(params.pop('variable')),
+                    block, **params)
+            else:
+                kernel = child
+            kernels.kernels[child.name] = self.kept(kernel, child)
+        self.moose.kernels = kernels
+
+    def _read_auxkernels(self, node):
+        aux_kernels = AuxKernels()
+        for child in node.children:
+            params = child.params
+            kernel_type = params.get('type')
+            if kernel_type == AuxKernelTypes.ParsedAux.name:
+                kernel = ParsedAux(child.name, self.variable(params['variable']), None,
+                    function = RawParameter('function', params['function']),
+                    args = self._variables(params['args']))
+            elif kernel_type == AuxKernelTypes.ADRankTwoAux.name:
+                kernel = ADRankTwoAux(child.name, self.variable(params['variable']), None,
+                    rank_two_tensor = params['rank_two_tensor'],
+                    index_i = params['index_i'], index_j = params['index_j'])
+            elif kernel_type == AuxKernelTypes.ADRankTwoScalarAux.name:
+                kernel = ADRankTwoScalarAux(child.name, self.variable(params['variable']), None,
+                    rank_two_tensor = params['rank_two_tensor'],
+                    scalar_type = ScalarType[params['scalar_type']])
+            else:
+                kernel = child
+            aux_kernels.kernels[child.name] = self.kept(kernel, child)
+        self.moose.aux_kernels = aux_kernels
+
+    def _read_functions(self, node):
+        functions = Functions()
+        for child in node.children:
+            params = dict(child.params)
+            function_type = params.pop('type', None)
+            if function_type == MooseFunctionTypes.PiecewiseLinear.name:
+                function = PiecewiseLinear(child.name, **params)
+            elif function_type in MooseFunctionTypes.__members__:
+                function = GenericFunction(child.name, **params)
+                function.type = MooseFunctionTypes[function_type]
+            else:
+                function = child
+            function = functions.functions[child.name] = self.kept(function, child)
+            if function_type == MooseFunctionTypes.PiecewiseLinear.name and function is not child:
+                self.compact(function, {key: params[key] for key in ('x', 'y') if key in params})
+        self.moose.functions = functions
+
+    def _read_bcs(self, node):
+        bcs = BoundaryConditions()
+        for child in node.children:
+            params = child.params
+            bc_type = params.get('type')
+            if bc_type is None and child.name == 'Pressure' and child.children:
+                pressures = []
+                for pressure in child.children:
+                    displacements = pressure.params['displacements'].split()
+                    pressures.append(Pressure(pressure.name, None, pressure.params['boundary'],
+                        value = pressure.params['factor'],
+                        displacements = [self.variable(x) for x in displacements]))
+                # each Pressure is written in a [Pressure] block of its own
+                if not child.params and all(self.kept(bc, _wrapped(child.name, pressure)) is bc
+                                            for bc, pressure in zip(pressures, child.children)):
+                    for bc in pressures:
+                        bcs.boundary_conditions[bc.name] = bc
+                else:
+                    bcs.boundary_conditions[child.name] = child
+                continue
+            if bc_type == BoundaryConditionTypes.ADDirichletBC.name:
+                bc = ADDirichletBC(child.name, self.variable(params['variable']),
+                    params['boundary'], value = params['value'])
+            elif bc_type == BoundaryConditionTypes.ADNeumannBC.name:
+                bc = ADNeumannBC(child.name, self.variable(params['variable']),
+                    params['boundary'], value = params['value'])
+            elif bc_type == BoundaryConditionTypes.ADConvectiveHeatFluxBC.name:
+                bc = ADConvectiveHeatFluxBC(child.name, self.variable(params['variable']),
+                    params['boundary'],
+                    heat_transfer_coefficient = params['heat_transfer_coefficient'],
+                    t_infinity = params['T_infinity'])
+            else:
+                bc = child
+            bcs.boundary_conditions[child.name] = self.kept(bc, child)
+        self.moose.boundary_conditions = bcs
+
+    def _read_materials(self, node):
+        materials = Materials()
+        for child in node.children:
+            params = child.params
+            material_type = params.get('type')
+            block = params.get('block', '')
+            if material_type == MaterialTypes.ADPiecewiseLinearInterpolationMaterial.name:
+                material = ADPiecewiseLinearInterpolationMaterial(child.name, block,
+                    data = PiecewiseFunction(x_data = params['x'], y_data = params['y']),
+                    property = params['property'],
+                    variable = self.variable(params['variable']))
+            elif material_type == MaterialTypes.ADParsedMaterial.name:
+                material = ADParsedMaterial(child.name, block,
+                    data = RawParameter('function', params['function']),
+                    property = params['f_name'],
+                    variable = self.variable(params['variable']))
+            elif material_type == MaterialTypes.ADHeatConductionMaterial.name:
+                material = ADHeatConductionMaterial(child.name, block,
+                    variable = self.variable(params['temp']),
+                    specific_heat = self.function(params['specific_heat_temperature_function']),
+                    thermal_conductivity = self.function(params['thermal_conductivity_temperature_function']))
+            elif material_type == MaterialTypes.ADComputeVariableIsotropicElasticityTensor.name:
+                material = ADComputeVariableIsotropicElasticityTensor(child.name, block,
+                    poissons_ratio = params['poissons_ratio'],
+                    youngs_modulus = params['youngs_modulus'])
+            elif material_type == MaterialTypes.ADComputeMeanThermalExpansionFunctionEigenstrain.name:
+                material = ADComputeMeanThermalExpansionFunctionEigenstrain(child.name, block,
+                    thermal_expansion = self.function(params['thermal_expansion_function']),
+                    thermal_expansion_function_reference_temperature = \
+                        params['thermal_expansion_function_reference_temperature'],
+                    stress_free_temperature = params['stress_free_temperature'],
+                    eigenstrain_name = params['eigenstrain_name'],
+                    variable = self.variable(params['temperature']))
+            elif material_type == MaterialTypes.ADComputeSmallStrain.name:
+                material = ADComputeSmallStrain(child.name, block,
+                    displacements = [self.variable(x) for x in params['displacements'].split()],
+                    eigenstrain_names = params['eigenstrain_names'])
+            elif material_type == MaterialTypes.ADComputeLinearElasticStress.name:
+                material = ADComputeLinearElasticStress(child.name, block)
+            elif material_type == MaterialTypes.ADGenericFunctionMaterial.name:
+                material = ADGenericFunctionMaterial(child.name, block,
+                    prop_names = params['prop_names'].split(),
+                    prop_values = [self.function(x) for x in params['prop_values'].split()])
+            else:
+                material = child
+            material = materials.materials[child.name] = self.kept(material, child)
+            if material_type == MaterialTypes.ADPiecewiseLinearInterpolationMaterial.name \
+                    and material is not child:
+                self.compact(material.data, {'x_data': params['x'], 'y_data': params['y']})
+        self.moose.materials = materials
+
+    def _read_components(self, node):
+        comps = components.Components()
+        for child in node.children:
+            params = dict(child.params)
+            component = self._typed_object(child, components, components.Component,
+                components.ComponentType)
+            if component is not child:
+                components.Component.__init__(component, child.name, **params)
+                component.type = components.ComponentType[params['type']]
+            comps.components[child.name] = self.kept(component, child)
+        self.moose.components = comps
+
+    def _read_closures(self, node):
+        closure_block = closures.Closures()
+        for child in node.children:
+            closure = self._typed_object(child, closures, closures.Closure,
+                closures.ClosureType)
+            if closure is not child:
+                closures.Closure.__init__(closure, child.name)
+                closure.type = closures.ClosureType[child.params['type']]
+            closure_block.closures[child.name] = self.kept(closure, child)
+        self.moose.closures = closure_block
+
+    def _read_fluidproperties(self, node):
+        fluid_properties = fluidproperties.FluidProperties()
+        for child in node.children:
+            fluid = self._typed_object(child, fluidproperties,
+                fluidproperties.FluidProperty, fluidproperties.FluidPropertyTypes)
+            if fluid is not child:
+                params = dict(child.params)
+                params['type'] = fluidproperties.FluidPropertyTypes[params['type']]
+                fluidproperties.FluidProperty.__init__(fluid, child.name, **params)
+            fluid_properties.fluidproperties[child.name] = self.kept(fluid, child)
+        self.moose.fluid_properties = fluid_properties
+
+    def _read_multiapps(self, node):
+        multi = multiapps.MultiApps()
+        for child in node.children:
+            multiapp = self._typed_object(child, multiapps, multiapps.MultiApp,
+                multiapps.MultiAppTypes)
+            if multiapp is not child:
+                params = dict(child.params)
+                params['type'] = multiapps.MultiAppTypes[params['type']]
+                multiapps.MultiApp.__init__(multiapp, child.name, **params)
+            multi.multiapps[child.name] = self.kept(multiapp, child)
+        self.moose.multiapps = multi
+
+    def _read_transfers(self, node):
+        trans = transfers.Transfers()
+        for child in node.children:
+            transfer = self._typed_object(child, transfers, transfers.Transfer,
+                transfers.TransferType)
+            if transfer is not child:
+                params = dict(child.params)
+                transfer_type = transfers.TransferType[params.pop('type')]
+                transfers.Transfer.__init__(transfer, child.name,
+                    self.variable(params.pop('source_variable')),
+                    self.variable(params.pop('variable')), **params)
+                transfer.type = transfer_type
+            trans.transfers[child.name] = self.kept(transfer, child)
+        self.moose.transfers = trans
+
+    def _read_postprocessors(self, node):
+        postprocs = postprocessors.PostProcessors()
+        for child in node.children:
+            post_processor = self._typed_object(child, postprocessors,
+                postprocessors.PostProcessor, postprocessors.PostProcessorTypes)
+            if post_processor is not child:
+                params = dict(child.params)
+                pp_type = postprocessors.PostProcessorTypes[params.pop('type')]
+                variable = params.pop('variable', None)
+                if variable is not None:
+                    variable = self.variable(variable)
+                postprocessors.PostProcessor.__init__(post_processor, child.name,
+                    variable, params.pop('block', ''), **params)
+                post_processor.type = pp_type
+            postprocs.post_processors[child.name] = self.kept(post_processor, child)
+        self.moose.post_processors = postprocs
+
+    def _read_problem(self, node):
+        self.moose.problem = node
+
+    def _read_executioner(self, node):
+        self.moose.executioner = self.kept(Executioner(**node.params), node, 0)
+
+    def _read_outputs(self, node):
+        self.moose.outputs = self.kept(Outputs(**node.params), node, 0)
+
+    def _typed_object(self, node, module, base, types):
+        """ an uninitialised instance of the class named by the type of node,
+        or node itself if the type is unknown to the object model """
+        type_name = node.params.get('type')
+        if type_name not in types.__members__ or node.children:
+            return node
+        cls = getattr(module, type_name, base)
+        if not isinstance(cls, type) or not issubclass(cls, base):
+            cls = base
+        return cls.__new__(cls)
@@ -0,0 +1,230 @@
+#!/usr/env/python3
+
+""" Fingerprints of inputs and a cache of the results of running them. A
+fingerprint is a sha256 of the canonical form of an input: its blocks and
+their objects in order of name, parameters in order of key, and each
+number written as the shortest repr of its float value, so inputs that
+differ only in the order objects were added or in how numbers were
+written ("1e3", "1000", "1000.0") have the same fingerprint. The files an
+input names in file_parameters are taken by the sha256 of their content
+rather than their names, so a changed mesh changes the fingerprint and a
+moved one does not.
+
+A ResultCache keeps the output files of runs in a directory, an entry per
+fingerprint, and evicts entries unused for longer than max_age or, oldest
+use first, once it holds more than max_bytes. Runner takes one to skip
+runs of inputs it has results for.
+"""
+
+import functools
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import time
+
+from moose.reader import HITNode, parse_hit, expand_includes, file_parameters
+
+# numbers, and text that is only numbers and spaces
+_NUMBER = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+_NUMBERS = re.compile(r'[\d\s.eE+-]*')
+
+def _canonical_value(value):
+    if _NUMBERS.fullmatch(value):
+        try:
+            # a table, converted in one pass
+            return ' '.join(map(repr, map(float, value.split())))
+        except ValueError:
+            pass
+    return ' '.join(repr(float(token)) if _NUMBER.fullmatch(token) else token
+                    for token in value.split())
+
+@functools.lru_cache(maxsize=256)
+def _file_digest(path, size, mtime):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def file_digest(path):
+    """ the sha256 hex digest of the content of the file path, kept until
+    the file changes; None if there is no such file """
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return _file_digest(path, stat.st_size, stat.st_mtime_ns)
+
+def _files(value, directory):
+    # the content of each file value names, or the name if it is missing
+    digests = []
+    for name in value.split():
+        digest = file_digest(os.path.join(directory, name))
+        digests.append(f'sha256:{digest}' if digest else name)
+    return ' '.join(digests)
+
+def canonical(node, directory = '.', values = None):
+    """ node, a HITNode, as nested dicts of params and children, each
+    sorted when dumped with sort_keys, with values as in the fingerprint.
+    values keeps the canonical form of each value text, as tables are
+    often shared between many objects """
+    values = {} if values is None else values
+    params = {}
+    for key, value in node.params.items():
+        if key in file_parameters:
+            params[key] = _files(value, directory)
+            continue
+        text = values.get(value)
+        if text is None:
+            text = values[value] = _canonical_value(value)
+        params[key] = text
+    return {'params': params, 'children': {child.name: canonical(child, directory, values)
+                                           for child in node.children}}
+
+def input_tree(source, directory = None):
+    """ the root HITNode of source, a MOOSEInput or the path of an input
+    file, and the directory its files are found from: directory if given,
+    that of the input file, or the working directory """
+    if isinstance(source, HITNode):
+        return source, directory or '.'
+    if hasattr(source, 'write'):
+        stream = io.StringIO()
+        source.write(stream)
+        return parse_hit(stream.getvalue()), directory or '.'
+    source = os.fspath(source)
+    if directory is None:
+        directory = os.path.dirname(os.path.abspath(source))
+    with open(source, 'r') as file:
+        text = file.read()
+    if '!include' in text:
+        text = expand_includes(text, os.path.dirname(source))
+    return parse_hit(text), directory
+
+def fingerprint(source, directory = None, extra = None):
+    """ the sha256 hex fingerprint of source, a MOOSEInput, the path of an
+    input file or a HITNode, see input_tree. extra is anything else the
+    results depend on, such as the application, as JSON """
+    root, directory = input_tree(source, directory)
+    text = json.dumps([canonical(root, directory), extra], sort_keys=True,
+                      separators=(',', ':'))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def output_prefix(root):
+    """ what the names of the files written by running the input root
+    start with: its Outputs file_base, or None for the name of the input
+    with _out """
+    for block in root.children:
+        if block.name == 'Outputs':
+            return block.params.get('file_base')
+    return None
+
+class ResultCache():
+    """ the files of runs, by fingerprint, in directory. Entries unused for
+    max_age seconds are evicted, then the least recently used while the
+    cache holds more than max_bytes; None for no limit """
+    def __init__(self, directory, max_bytes = None, max_age = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        """ a dict of name: path of the files stored for key, None if there
+        are none; marks the entry as used """
+        entry = os.path.join(self.path(key), 'entry.json')
+        try:
+            with open(entry, 'r') as file:
+                names = json.load(file)['files']
+            os.utime(entry)
+        except (OSError, ValueError, KeyError):
+            self.misses = self.misses + 1
+            return None
+        self.hits = self.hits + 1
+        return {name: os.path.join(self.path(key), 'files', name) for name in names}
+
+    def __contains__(self, key):
+        return os.path.exists(os.path.join(self.path(key), 'entry.json'))
+
+    def put(self, key, files):
+        """ store files, a dict of name: path, for key, names being relative
+        paths; an entry already stored is kept. Evicts after storing """
+        path = self.path(key)
+        if key in self:
+            return False
+        temporary = f'{path}.{os.getpid()}.tmp'
+        shutil.rmtree(temporary, ignore_errors=True)
+        size = 0
+        for name, source in files.items():
+            if os.path.isabs(name) or '..' in name.split('/'):
+                raise ValueError(f'{name} is not a relative path in the entry')
+            target = os.path.join(temporary, 'files', name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(source, target)
+            size = size + os.path.getsize(target)
+        os.makedirs(os.path.join(temporary, 'files'), exist_ok=True)
+        with open(os.path.join(temporary, 'entry.json'), 'w') as file:
+            json.dump({'key': key, 'created': time.time(), 'bytes': size,
+                       'files': list(files)}, file)
+        try:
+            # the entry appears whole, or not at all if another process
+            # stored it first
+            os.rename(temporary, path)
+        except OSError:
+            shutil.rmtree(temporary, ignore_errors=True)
+            return False
+        self.evict()
+        return True
+
+    def remove(self, key):
+        shutil.rmtree(self.path(key), ignore_errors=True)
+
+    def entries(self):
+        """ (key, bytes, last used) of each entry, the time in seconds
+        since the epoch """
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for group in os.scandir(self.directory):
+            if not group.is_dir():
+                continue
+            for entry in os.scandir(group.path):
+                if entry.name.endswith('.tmp'):
+                    # being stored
+                    continue
+                filename = os.path.join(entry.path, 'entry.json')
+                try:
+                    used = os.stat(filename).st_mtime
+                    with open(filename, 'r') as file:
+                        size = json.load(file)['bytes']
+                except (OSError, ValueError, KeyError):
+                    continue
+                entries.append((entry.name, size, used))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, now = None):
+        """ remove the entries over max_age and max_bytes; returns the
+        number removed """
+        if self.max_age is None and self.max_bytes is None:
+            return 0
+        now = time.time() if now is None else now
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        removed = 0
+        total = sum(size for _, size, _ in entries)
+        for key, size, used in entries:
+            if (self.max_age is not None and now - used > self.max_age) \
+                    or (self.max_bytes is not None and total > self.max_bytes):
+                self.remove(key)
+                total = total - size
+                removed = removed + 1
+        return removed
@@ -0,0 +1,213 @@
+#!/usr/env/python3
+
+""" Running the MOOSE application on written inputs with asyncio. A Runner
+keeps up to concurrency jobs running at once, each on ranks MPI ranks,
+with its stdout and stderr written straight to a log file by the process
+itself, so Python only starts and waits for processes. Jobs over their
+timeout are killed along with any processes they started. Each run gives
+a RunResult, in the order of the inputs.
+
+Given a ResultCache, a Runner looks each input up by its fingerprint, see
+moose.results, along with the application and its arguments, and copies
+the stored outputs and log into place rather than running it again; the
+outputs of each successful run are stored. The number of ranks is not
+part of the fingerprint.
+
+The executable, and mpiexec, may be a path or a list of a program and its
+first arguments, e.g. [sys.executable, 'stand_in.py'] in tests.
+"""
+
+import asyncio
+import os
+import shutil
+import signal
+import time
+
+import moose.results as results
+
+class RunResult():
+    """ how one run ended: its return code, None if it was killed or could
+    not start, wall time, whether it timed out, where its log is and
+    whether its outputs came from a cache """
+    def __init__(self, input, command, log, returncode = None, seconds = 0.,
+                 timed_out = False, error = None, cached = False):
+        self.input = input
+        self.command = command
+        self.log = log
+        self.returncode = returncode
+        self.seconds = seconds
+        self.timed_out = timed_out
+        self.error = error
+        self.cached = cached
+
+    def ok(self):
+        return self.returncode == 0
+
+    def as_dict(self):
+        return {'input': self.input, 'command': self.command, 'log': self.log,
+                'returncode': self.returncode, 'seconds': self.seconds,
+                'timed_out': self.timed_out, 'error': self.error, 'cached': self.cached}
+
+    def __str__(self):
+        if self.timed_out:
+            state = 'timed out'
+        elif self.error is not None:
+            state = f'failed to start: {self.error}'
+        elif self.cached:
+            state = 'found in the cache'
+        else:
+            state = f'returned {self.returncode}'
+        return f'{self.input}: {state} after {self.seconds:.2f} s, log {self.log}'
+
+def _program(value):
+    if isinstance(value, (str, os.PathLike)):
+        value = [value]
+    program = [os.fspath(x) for x in value]
+    # jobs run in the directory of their input, so a relative path to the
+    # program is made absolute
+    if os.sep in program[0]:
+        program[0] = os.path.abspath(program[0])
+    return program
+
+def _prefix(input, root):
+    # the path the names of the outputs of input start with
+    prefix = results.output_prefix(root) \
+        or os.path.splitext(os.path.basename(input))[0] + '_out'
+    return os.path.join(os.path.dirname(os.path.abspath(input)), prefix)
+
+class Runner():
+    """ runs executable -i input for each input in the directory of the
+    input, with args after. concurrency is the number of jobs at once,
+    os.cpu_count() // ranks if None; ranks above 1 run through mpiexec -n
+    ranks. timeout is in seconds per job. Logs go to log_dir, or beside
+    each input, named after it with .log. With cache, a ResultCache, inputs
+    run before are not run again """
+    def __init__(self, executable, concurrency = None, ranks = 1, timeout = None,
+                 log_dir = None, args = (), mpiexec = 'mpiexec', cache = None):
+        self.executable = _program(executable)
+        self.ranks = ranks
+        self.concurrency = concurrency or max(1, (os.cpu_count() or 1)//ranks)
+        self.timeout = timeout
+        self.log_dir = log_dir
+        self.args = list(args)
+        self.mpiexec = _program(mpiexec)
+        self.cache = cache
+        # seconds a killed job has to exit after SIGTERM before SIGKILL
+        self.grace = 5.
+
+    def command(self, input):
+        command = self.executable + ['-i', os.path.basename(input)] + self.args
+        if self.ranks > 1:
+            command = self.mpiexec + ['-n', str(self.ranks)] + command
+        return command
+
+    def log(self, input):
+        name = os.path.splitext(os.path.basename(input))[0] + '.log'
+        directory = self.log_dir or os.path.dirname(os.path.abspath(input))
+        return os.path.join(directory, name)
+
+    async def run_one(self, input):
+        """ run the job of input; returns its RunResult """
+        input = os.fspath(input)
+        command = self.command(input)
+        result = RunResult(input, command, self.log(input))
+        start = time.perf_counter()
+        # file times come from a coarser clock, so a file written just
+        # after the start may seem to be from before it
+        started = time.time_ns() - 10**8
+        if self.cache is not None:
+            root, directory = results.input_tree(input)
+            key = results.fingerprint(root, directory, self._identity())
+            if self._restore(key, _prefix(input, root), result):
+                result.seconds = time.perf_counter() - start
+                return result
+        try:
+            with open(result.log, 'wb') as log:
+                process = await asyncio.create_subprocess_exec(*command,
+                    stdin=asyncio.subprocess.DEVNULL, stdout=log, stderr=asyncio.subprocess.STDOUT,
+                    cwd=os.path.dirname(os.path.abspath(input)), start_new_session=True)
+        except OSError as error:
+            result.error = str(error)
+            result.seconds = time.perf_counter() - start
+            return result
+        try:
+            result.returncode = await asyncio.wait_for(process.wait(), self.timeout)
+        except asyncio.TimeoutError:
+            result.timed_out = True
+            await self._kill(process)
+        except asyncio.CancelledError:
+            await self._kill(process)
+            raise
+        result.seconds = time.perf_counter() - start
+        if self.cache is not None and result.ok():
+            self.cache.put(key, self._outputs(_prefix(input, root), result, started))
+        return result
+
+    def _identity(self):
+        # what the results depend on besides the input: the content of the
+        # application and its arguments
+        return [results.file_digest(part) or part for part in self.executable] + self.args
+
+    def _outputs(self, prefix, result, started):
+        # the files the run wrote, those whose names start with the output
+        # prefix, stored by the rest of their name, and its log
+        files = {'log': result.log}
+        start = os.path.basename(prefix)
+        for entry in os.scandir(os.path.dirname(prefix)):
+            if entry.name.startswith(start) and entry.is_file() \
+                    and entry.stat().st_mtime_ns >= started:
+                files['outputs/' + entry.name[len(start):]] = entry.path
+        return files
+
+    def _restore(self, key, prefix, result):
+        # copy the files stored for key into place, named by the output
+        # prefix of this input; False if there are none, or they were
+        # evicted while being copied
+        files = self.cache.get(key)
+        if files is None:
+            return False
+        try:
+            os.makedirs(os.path.dirname(prefix), exist_ok=True)
+            for name, path in files.items():
+                target = result.log if name == 'log' else prefix + name[len('outputs/'):]
+                shutil.copyfile(path, target)
+        except OSError:
+            return False
+        result.returncode = 0
+        result.cached = True
+        return True
+
+    async def _kill(self, process):
+        # stop the job and every process it started, in its own session
+        for sig, wait in ((signal.SIGTERM, self.grace), (signal.SIGKILL, None)):
+            try:
+                os.killpg(process.pid, sig)
+            except ProcessLookupError:
+                pass
+            try:
+                await asyncio.wait_for(process.wait(), wait)
+                return
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_all(self, inputs, callback = None):
+        """ run the jobs of inputs, concurrency at a time, calling
+        callback(result) as each finishes; returns the RunResults in the
+        order of inputs """
+        inputs = list(inputs)
+        results = [None]*len(inputs)
+        queue = iter(enumerate(inputs))
+
+        async def worker():
+            # each worker takes the next input as soon as its job is done
+            for idx, input in queue:
+                results[idx] = await self.run_one(input)
+                if callback is not None:
+                    callback(results[idx])
+
+        await asyncio.gather(*[worker() for _ in range(min(self.concurrency, len(inputs)))])
+        return results
+
+    def run(self, inputs, callback = None):
+        """ run_all from synchronous code """
+        return asyncio.run(self.run_all(inputs, callback))
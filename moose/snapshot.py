@@ -0,0 +1,288 @@
+#!/usr/env/python3
+
+""" Snapshots of built models in a binary file that loads in a fraction of
+the time the model takes to build. A snapshot holds the object graph as
+JSON, each object by the public name of its class and its attributes, and
+every numeric table as raw little-endian float64 after it, each aligned to
+64 bytes. Objects and tables shared in the model are stored once and are
+shared again once loaded.
+
+Loading is safe on untrusted files: only the classes of the package
+facade (moose.Kernels, moose.ADHeatConduction, ...) are made, by name,
+and nothing in the file is run. Only attributes of its class are set on
+an object: its slots or, for classes taking any parameters, names the
+class does not define itself; private names never are. As classes are found by name rather than
+module, a snapshot loads in later releases as long as the classes it
+names and their attributes do. With NumPy installed, tables are loaded as
+arrays on a copy-on-write memory map of the file, so processes loading
+the same snapshot share the pages of its tables until one changes them.
+
+The file starts with the magic bytes, the format version as a uint32, a
+uint32 of flags, 0, and the length of the JSON as a uint64.
+"""
+
+import enum
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import moose
+from moose.render import RenderDict, attributes, _slots
+from moose.tables import buffer_types, numpy
+
+MAGIC = b'MOOSESNP'
+VERSION = 1
+_header = struct.Struct('<8sIIQ')
+_ALIGN = 64
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) & ~(_ALIGN - 1)
+
+def _class_name(cls):
+    # the name cls is made by on loading, if it may be
+    name = cls.__name__
+    if moose._names.get(name) is None or getattr(moose, name) is not cls:
+        raise TypeError(f'{cls.__module__}.{name} is not a public class of moose '
+                        f'and cannot be written to a snapshot')
+    return name
+
+def _state(obj):
+    # what pickle would keep of obj: its __getstate__ if its class has its
+    # own, its attributes otherwise
+    getstate = getattr(type(obj), '__getstate__', None)
+    if getstate is not None and getstate is not getattr(object, '__getstate__', None):
+        return obj.__getstate__()
+    return dict(attributes(obj))
+
+class _Encoder():
+    # the objects and tables of a graph, each numbered as it is first met.
+    # The state of an object is encoded once the one referring to it is
+    # done, so long chains of references do not recurse
+    def __init__(self):
+        self.objects = []
+        self.numbers = {}
+        self.pending = []
+        self.tables = []
+        self.table_numbers = {}
+        # referenced while encoding so ids are not reused
+        self.kept = []
+
+    def value(self, value):
+        if value is None or value.__class__ in (str, float, bool):
+            return value
+        if isinstance(value, enum.Enum):
+            return {'enum': [_class_name(type(value)), value.name]}
+        if value.__class__ is int:
+            return value
+        if isinstance(value, list):
+            return [self.value(item) for item in value]
+        if isinstance(value, (dict, RenderDict)):
+            if all(key.__class__ is str for key in value):
+                return {'dict': {key: self.value(item) for key, item in value.items()}}
+            return {'items': [[self.value(key), self.value(item)] for key, item in value.items()]}
+        if isinstance(value, tuple):
+            return {'tuple': [self.value(item) for item in value]}
+        if isinstance(value, buffer_types):
+            return {'table': self.table(value)}
+        # subclasses of the plain types, such as numpy.float64
+        for cls in (bool, int, float, str):
+            if isinstance(value, cls):
+                return cls(value)
+        if hasattr(value, '__dict__') or hasattr(type(value), '__slots__'):
+            return {'object': self.object(value)}
+        raise TypeError(f'{type(value).__name__} values cannot be written to a snapshot')
+
+    def object(self, obj):
+        number = self.numbers.get(id(obj))
+        if number is None:
+            number = self.numbers[id(obj)] = len(self.objects)
+            self.kept.append(obj)
+            self.objects.append([_class_name(type(obj)), None])
+            self.pending.append((number, obj))
+        return number
+
+    def encode(self, obj):
+        root = self.value(obj)
+        while self.pending:
+            number, obj = self.pending.pop()
+            self.objects[number][1] = {name: self.value(value)
+                                       for name, value in _state(obj).items()}
+        return root
+
+    def table(self, data):
+        number = self.table_numbers.get(id(data))
+        if number is None:
+            number = self.table_numbers[id(data)] = len(self.tables)
+            self.kept.append(data)
+            self.tables.append(data)
+        return number
+
+def _bytes(data):
+    # the values of a table as little-endian float64, without a copy where
+    # they are held so already
+    if numpy is not None and isinstance(data, numpy.ndarray):
+        data = numpy.ascontiguousarray(data, dtype='<f8')
+        return memoryview(data).cast('B'), list(data.shape)
+    if sys.byteorder == 'big' or data.typecode != 'd':
+        data = array('d', data)
+        if sys.byteorder == 'big':
+            data.byteswap()
+    return memoryview(data).cast('B'), [len(data)]
+
+def write_snapshot(obj, filename):
+    """ write obj, usually a MOOSEInput, and everything it refers to as a
+    snapshot to filename. The file is written beside filename and moved
+    into place, so processes that have a snapshot loaded keep theirs """
+    encoder = _Encoder()
+    root = encoder.encode(obj)
+    offset = 0
+    tables = []
+    views = []
+    for data in encoder.tables:
+        view, shape = _bytes(data)
+        tables.append({'offset': offset, 'shape': shape})
+        views.append(view)
+        offset = _aligned(offset + len(view))
+    header = json.dumps({'root': root, 'objects': encoder.objects, 'tables': tables},
+                        separators=(',', ':')).encode()
+    start = _aligned(_header.size + len(header))
+
+    temporary = f'{filename}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(_header.pack(MAGIC, VERSION, 0, len(header)))
+        file.write(header)
+        file.write(bytes(start - _header.size - len(header)))
+        position = start
+        for table, view in zip(tables, views):
+            file.write(bytes(start + table['offset'] - position))
+            file.write(view)
+            position = start + table['offset'] + len(view)
+    os.replace(temporary, filename)
+
+class _Decoder():
+    def __init__(self, objects, tables):
+        self.objects = objects
+        self.tables = tables
+
+    def value(self, value):
+        if value.__class__ is list:
+            return [self.value(item) for item in value]
+        if value.__class__ is not dict:
+            return value
+        (tag, content), = value.items()
+        if tag == 'object':
+            return self.objects[content]
+        if tag == 'dict':
+            return {key: self.value(item) for key, item in content.items()}
+        if tag == 'table':
+            return self.tables[content]
+        if tag == 'enum':
+            cls = _class(content[0])
+            if not issubclass(cls, enum.Enum):
+                raise ValueError(f'{content[0]} is not an enumeration')
+            return cls[content[1]]
+        if tag == 'tuple':
+            return tuple(self.value(item) for item in content)
+        if tag == 'items':
+            return {self.value(key): self.value(item) for key, item in content}
+        raise ValueError(f'unknown snapshot value {tag}')
+
+def _class(name):
+    # only the public classes of the package are made
+    cls = getattr(moose, name) if name in moose._names else None
+    if not isinstance(cls, type):
+        raise ValueError(f'{name} is not a public class of moose')
+    return cls
+
+def _tables(buffer, start, tables, shared):
+    loaded = []
+    for table in tables:
+        count = 1
+        for size in table['shape']:
+            count = count*size
+        offset = start + table['offset']
+        if offset + 8*count > len(buffer):
+            raise ValueError('snapshot is truncated')
+        if numpy is not None:
+            if count == 0:
+                data = numpy.empty(table['shape'], dtype=numpy.float64)
+            else:
+                data = numpy.frombuffer(buffer, dtype='<f8', count=count, offset=offset)
+                data = data.reshape(table['shape'])
+                if not shared:
+                    data = data.astype(numpy.float64)
+        else:
+            data = array('d')
+            data.frombytes(buffer[offset:offset + 8*count])
+            if sys.byteorder == 'big':
+                data.byteswap()
+        loaded.append(data)
+    return loaded
+
+def read_snapshot(filename, mmap_tables = True):
+    """ the object written to the snapshot filename. With NumPy, tables are
+    arrays on a copy-on-write map of the file unless mmap_tables is False,
+    when they are read into memory; without NumPy they are read into
+    array('d') """
+    with open(filename, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size < _header.size:
+            raise ValueError(f'{filename} is not a moose snapshot')
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    magic, version, flags, length = _header.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f'{filename} is not a moose snapshot')
+    if version > VERSION:
+        raise ValueError(f'{filename} is a version {version} snapshot, this release reads '
+                         f'up to version {VERSION}')
+    header = json.loads(bytes(buffer[_header.size:_header.size + length]))
+    start = _aligned(_header.size + length)
+    shared = mmap_tables and numpy is not None
+    try:
+        tables = _tables(buffer, start, header['tables'], shared)
+        if not shared:
+            buffer.close()
+        return _objects(header, tables)
+    except (KeyError, IndexError, TypeError) as error:
+        raise ValueError(f'{filename} has a malformed snapshot: {error!r}')
+
+def _allowed(cls, name):
+    # whether name may be set on an object of cls: one of its slots or, for
+    # a class whose objects have a __dict__, anything the class itself does
+    # not define, such as a method; never a private or special name
+    if name.__class__ is not str or name[:1] in ('', '_'):
+        return False
+    if name in _slots(cls):
+        return True
+    return getattr(cls, '__dictoffset__', 0) != 0 and not hasattr(cls, name)
+
+def _objects(header, tables):
+    # every object is made before any is filled in, as they refer to each
+    # other in any order
+    objects = []
+    classes = {}
+    for name, _ in header['objects']:
+        cls = classes.get(name)
+        if cls is None:
+            cls = classes[name] = _class(name)
+        objects.append(cls.__new__(cls))
+    decoder = _Decoder(objects, tables)
+    allowed = set()
+    for obj, (class_name, state) in zip(objects, header['objects']):
+        if state.__class__ is not dict:
+            raise ValueError(f'the state of a {class_name} is not a dict')
+        for name in state:
+            if (obj.__class__, name) not in allowed:
+                if not _allowed(obj.__class__, name):
+                    raise ValueError(f'{name!r} is not an attribute of {class_name}')
+                allowed.add((obj.__class__, name))
+        state = {name: decoder.value(value) for name, value in state.items()}
+        if hasattr(obj, '__setstate__'):
+            obj.__setstate__(state)
+        else:
+            for name, value in state.items():
+                object.__setattr__(obj, name, value)
+    return decoder.value(header['root'])
@@ -0,0 +1,235 @@
+#!/usr/env/python3
+
+""" Parameter sweeps over a base MOOSEInput. A Sweep draws points from a
+sampler over a set of Parameters, each addressed by a HIT path as taken by
+MOOSEInput.set, and yields one cloned variant per point as it is needed, so
+a design of any size never sits in memory at once. write() writes each
+variant to its own file and streams a manifest of file and parameter
+values alongside.
+"""
+
+import csv
+import math
+import os
+import random
+from array import array
+from enum import IntEnum, auto
+from itertools import product
+
+from moose.batch import write_batch
+
+class SamplerTypes(IntEnum):
+    FULL_FACTORIAL = auto()
+    LATIN_HYPERCUBE = auto()
+    SOBOL = auto()
+
+class ScaleTypes(IntEnum):
+    LINEAR = auto()
+    LOG = auto()
+
+class Parameter():
+    """ a parameter to vary at path, either over a list of values or
+    between low and high. A full factorial sweep takes levels evenly spaced
+    values between low and high; LHS and Sobol sample the range """
+    def __init__(self, path, values = None, low = None, high = None, levels = 2,
+                 scale = ScaleTypes.LINEAR):
+        self.path = path
+        self.values = list(values) if values is not None else None
+        self.low = low
+        self.high = high
+        self.levels = levels
+        self.scale = scale
+        if self.values is None and (low is None or high is None):
+            raise ValueError(f'parameter {path} needs values or low and high')
+        if self.values is not None and not self.values:
+            raise ValueError(f'parameter {path} has no values')
+        if scale == ScaleTypes.LOG and self.values is None and (low <= 0 or high <= 0):
+            raise ValueError(f'parameter {path} has a log scale range that is not positive')
+
+    def levels_list(self):
+        # the values a full factorial sweep takes
+        if self.values is not None:
+            return self.values
+        if self.levels == 1:
+            return [self.value(0.5)]
+        return [self.value(i/(self.levels-1)) for i in range(self.levels)]
+
+    def value(self, u):
+        """ the value at u in [0, 1] across the range, or the value picked
+        out of values by u """
+        if self.values is not None:
+            return self.values[min(int(u*len(self.values)), len(self.values)-1)]
+        if self.scale == ScaleTypes.LOG:
+            low = math.log(self.low)
+            return math.exp(low + u*(math.log(self.high) - low))
+        return self.low + u*(self.high - self.low)
+
+def full_factorial(parameters):
+    """ every combination of the levels of parameters, last varying fastest """
+    for values in product(*[p.levels_list() for p in parameters]):
+        yield list(values)
+
+def latin_hypercube(dimensions, samples, seed = None):
+    """ samples points in the unit cube with exactly one point in each of
+    the samples equal slices of every dimension. Only the slice order of
+    each dimension is held, samples integers per dimension """
+    rng = random.Random(seed)
+    orders = []
+    for _ in range(dimensions):
+        order = array('l', range(samples))
+        rng.shuffle(order)
+        orders.append(order)
+    for idx in range(samples):
+        yield [(order[idx] + rng.random())/samples for order in orders]
+
+# direction numbers (s, a, m_1 .. m_s) for dimensions 2 upwards, from
+# S. Joe and F. Y. Kuo, new-joe-kuo-6.21201
+_sobol_directions = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+]
+
+_sobol_bits = 32
+
+def _direction_numbers(dimension):
+    # the direction numbers V_1 .. V_bits of one dimension, scaled by 2**bits
+    bits = _sobol_bits
+    if dimension == 0:
+        return [1 << (bits - i) for i in range(1, bits + 1)]
+    s, a, m = _sobol_directions[dimension - 1]
+    v = [m[i] << (bits - i - 1) for i in range(min(s, bits))]
+    for i in range(s, bits):
+        value = v[i - s] ^ (v[i - s] >> s)
+        for k in range(1, s):
+            if (a >> (s - 1 - k)) & 1:
+                value = value ^ v[i - k]
+        v.append(value)
+    return v
+
+def sobol(dimensions, samples, skip = 0):
+    """ the first samples points of the Sobol sequence in the unit cube,
+    after skipping skip points, generated one at a time in Gray code order.
+    Balance is best when samples is a power of two """
+    if dimensions > len(_sobol_directions) + 1:
+        raise ValueError(f'sobol sampling supports up to {len(_sobol_directions) + 1} dimensions')
+    directions = [_direction_numbers(d) for d in range(dimensions)]
+    scale = 1.0/(1 << _sobol_bits)
+    x = [0]*dimensions
+    for idx in range(skip + samples):
+        if idx >= skip:
+            yield [value*scale for value in x]
+        # the direction to apply next is that of the lowest zero bit of idx
+        bit = ((~idx) & (idx + 1)).bit_length() - 1
+        if bit >= _sobol_bits:
+            raise ValueError(f'sobol sampling supports up to {1 << _sobol_bits} points')
+        for d in range(dimensions):
+            x[d] = x[d] ^ directions[d][bit]
+
+class Sweep():
+    """ variants of base over parameters, sampled by sampler. samples is
+    the number of points for LHS and Sobol; seed makes LHS repeatable """
+    def __init__(self, base, parameters, sampler = SamplerTypes.FULL_FACTORIAL,
+                 samples = None, seed = None):
+        self.base = base
+        self.parameters = list(parameters)
+        self.sampler = SamplerTypes(sampler)
+        self.samples = samples
+        self.seed = seed
+        if self.sampler != SamplerTypes.FULL_FACTORIAL and samples is None:
+            raise ValueError(f'{self.sampler.name} sampling needs a number of samples')
+        # check every path exists before any variant is made
+        for parameter in self.parameters:
+            if not base.glob(parameter.path):
+                raise KeyError(parameter.path)
+
+    def __len__(self):
+        if self.sampler == SamplerTypes.FULL_FACTORIAL:
+            return math.prod(len(p.levels_list()) for p in self.parameters)
+        return self.samples
+
+    def points(self):
+        """ the parameter values of each point, in parameter order """
+        dimensions = len(self.parameters)
+        if self.sampler == SamplerTypes.FULL_FACTORIAL:
+            yield from full_factorial(self.parameters)
+            return
+        if self.sampler == SamplerTypes.LATIN_HYPERCUBE:
+            unit = latin_hypercube(dimensions, self.samples, self.seed)
+        else:
+            unit = sobol(dimensions, self.samples)
+        for point in unit:
+            yield [p.value(u) for p, u in zip(self.parameters, point)]
+
+    def variants(self):
+        """ (index, values, variant) for each point, values being a dict of
+        path: value. Each variant is a clone of base, so it shares all but
+        the objects on the changed paths """
+        for idx, point in enumerate(self.points()):
+            variant = self.base.clone()
+            values = {}
+            for parameter, value in zip(self.parameters, point):
+                variant.set(parameter.path, value)
+                values[parameter.path] = value
+            yield idx, values, variant
+
+    def write(self, directory, filename = 'case_{index:06d}.i', manifest = 'manifest.csv',
+              workers = None, chunksize = 16, table_dir = None, table_threshold = 1000,
+              skip_unchanged = False, split_dir = None):
+        """ write each variant to directory, naming it by formatting filename
+        with its index, and a manifest csv with a row of file and parameter
+        values per variant. With workers set, the variants are written by
+        write_batch across that many processes and its BatchReport kept
+        as self.report. With table_dir, large tables are written to files
+        there once for all variants, and with skip_unchanged files that
+        already hold their variant are left alone. With split_dir, the
+        blocks of the variants are written there, a file for each distinct
+        block, and each variant includes them, see MOOSEInput.write.
+        Returns the path of the manifest """
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, manifest)
+        with open(manifest_path, 'w', newline='') as file:
+            rows = csv.writer(file)
+            rows.writerow(['file'] + [p.path for p in self.parameters])
+            if workers is None:
+                for idx, values, variant in self.variants():
+                    name = filename.format(index=idx)
+                    variant.write(os.path.join(directory, name), table_dir, table_threshold,
+                                  skip_unchanged, split_dir)
+                    rows.writerow([name] + [values[p.path] for p in self.parameters])
+            else:
+                self.report = write_batch(self.base,
+                    self._described(directory, filename, rows), workers, chunksize,
+                    table_dir, table_threshold, skip_unchanged, split_dir)
+        return manifest_path
+
+    def _described(self, directory, filename, rows):
+        # (filename, values) of each point for write_batch
+        paths = [p.path for p in self.parameters]
+        for idx, point in enumerate(self.points()):
+            name = filename.format(index=idx)
+            rows.writerow([name] + point)
+            yield os.path.join(directory, name), dict(zip(paths, point))
+
+def read_manifest(filename):
+    """ the rows of a manifest written by Sweep.write as dicts of column:
+    text """
+    with open(filename, newline='') as file:
+        return list(csv.DictReader(file))
@@ -0,0 +1,173 @@
+#!/usr/env/python3
+
+""" Numeric tables, the x and y data of piecewise functions and materials.
+Tables given as NumPy arrays, or any sequence of numbers through as_table,
+are held as one contiguous float64 buffer: a numpy.ndarray when NumPy is
+installed, an array('d') otherwise. That is 8 bytes a value against about
+32 for a list of floats.
+
+A buffer is formatted in one %-format over the whole table rather than a
+str() call per value. By default each value is written as its shortest
+round trip repr, so nothing is lost; a precision, as in '.8g', writes fewer
+digits three times as fast. Lists and strings are written as they always
+were.
+"""
+
+import hashlib
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the types held as float64 buffers
+if numpy is None:
+    buffer_types = (array,)
+else:
+    buffer_types = (array, numpy.ndarray)
+
+def is_buffer(data):
+    return isinstance(data, buffer_types)
+
+def as_table(data):
+    """ data as a contiguous float64 buffer; strings and None are returned
+    as they are """
+    if data is None or isinstance(data, str):
+        return data
+    if numpy is not None:
+        return numpy.ascontiguousarray(data, dtype=numpy.float64)
+    if isinstance(data, array) and data.typecode == 'd':
+        return data
+    return array('d', data)
+
+def parse_table(text):
+    """ the numbers of text, separated by spaces, as a float64 buffer """
+    if numpy is not None:
+        return numpy.fromstring(text, dtype=numpy.float64, sep=' ')
+    return array('d', map(float, text.split()))
+
+def table_length(data):
+    """ the number of values in data """
+    if data is None:
+        return 0
+    if isinstance(data, str):
+        return len(data.split())
+    return len(data)
+
+def table_digest(*tables):
+    """ a hash of the values of tables, the same for equal values however
+    they are held: a buffer, a list or text """
+    digest = hashlib.sha1()
+    for data in tables:
+        values = _values(data)
+        digest.update(len(values).to_bytes(8, 'little'))
+        digest.update(array('d', values).tobytes())
+    return digest.hexdigest()
+
+def format_table(data, precision = None):
+    """ the values of data separated by spaces. data may be a buffer, a list
+    of numbers or strings, or a string already formatted """
+    if isinstance(data, str):
+        return data
+    if is_buffer(data):
+        if isinstance(data, array):
+            values = data.tolist()
+        else:
+            values = data.ravel().tolist()
+        if not values:
+            return ''
+        fmt = '%r ' if precision is None else f'%{precision} '
+        return (fmt*len(values) % tuple(values))[:-1]
+    if precision is not None:
+        return ' '.join(x if isinstance(x, str) else format(x, precision) for x in data)
+    return ' '.join([x if isinstance(x, str) else str(x) for x in data])
+
+class Simplification():
+    """ how much simplify_table shrank a table and the largest difference
+    between the original values and the simplified table at the original
+    points, which is the largest anywhere as both are piecewise linear """
+    def __init__(self, points, kept, max_error, max_relative_error):
+        self.points = points
+        self.kept = kept
+        self.max_error = max_error
+        self.max_relative_error = max_relative_error
+
+    def compression(self):
+        return self.points/self.kept if self.kept else 1.
+
+    def __str__(self):
+        return f'{self.points} -> {self.kept} points ({self.compression():.1f}x), ' \
+               f'max error {self.max_error:.3g} ({self.max_relative_error:.3g} relative)'
+
+def simplify_table(x, y, tolerance, relative = False):
+    """ the points of the table x, y that a piecewise linear interpolation
+    needs to stay within tolerance of every original y value, tolerance
+    being a fraction of |y| if relative. Kept points keep their exact
+    values. Each segment is grown from its first point while some line
+    through that point passes within tolerance of all the points it spans,
+    tracking the range of slopes that do, so every point is visited at
+    most twice. Returns x, y as buffers, or lists if given lists, and a
+    Simplification """
+    as_buffer = is_buffer(x) or isinstance(x, str)
+    xs = _values(x)
+    ys = _values(y)
+    if len(xs) != len(ys):
+        raise ValueError(f'table has {len(xs)} x and {len(ys)} y values')
+    n = len(xs)
+    keep = list(range(n))
+    if n > 2:
+        keep = [0]
+        anchor = 0
+        j = 1
+        while j < n - 1:
+            x0 = xs[anchor]
+            y0 = ys[anchor]
+            low = float('-inf')
+            high = float('inf')
+            # extend the segment from anchor to j while the line to j is
+            # in the slopes allowed by the points between
+            while j < n:
+                dx = xs[j] - x0
+                if dx <= 0:
+                    raise ValueError(f'table x values are not increasing at {xs[j]}')
+                slope = (ys[j] - y0)/dx
+                if slope < low or slope > high:
+                    break
+                tol = tolerance*abs(ys[j]) if relative else tolerance
+                low = max(low, (ys[j] - tol - y0)/dx)
+                high = min(high, (ys[j] + tol - y0)/dx)
+                j = j + 1
+            anchor = j - 1
+            keep.append(anchor)
+        if keep[-1] != n - 1:
+            keep.append(n - 1)
+
+    max_error = 0.
+    max_relative = 0.
+    for a, b in zip(keep, keep[1:]):
+        slope = (ys[b] - ys[a])/(xs[b] - xs[a])
+        for k in range(a + 1, b):
+            error = abs(ys[a] + slope*(xs[k] - xs[a]) - ys[k])
+            max_error = max(max_error, error)
+            if ys[k] != 0:
+                max_relative = max(max_relative, error/abs(ys[k]))
+    report = Simplification(n, len(keep), max_error, max_relative)
+    if as_buffer:
+        return as_table([xs[i] for i in keep]), as_table([ys[i] for i in keep]), report
+    return [x[i] for i in keep], [y[i] for i in keep], report
+
+def format_columns(x, y):
+    """ the rows x,y of a table as csv text """
+    values = [value for row in zip(_values(x), _values(y)) for value in row]
+    return '%r,%r\n'*(len(values)//2) % tuple(values)
+
+def _values(data):
+    # the numbers of a table as a list of floats
+    if isinstance(data, str):
+        return parse_table(data).tolist()
+    if isinstance(data, array):
+        return data.tolist()
+    if is_buffer(data):
+        return data.ravel().tolist()
+    return [float(value) for value in data]
@@ -184,3 +184,1440 @@ def test_outputs():
     from moose.outputs import Outputs
     output = Outputs(csv=True,exodus=True,print_linear_residuals=False)
     print(output)
+
+def test_write():
+    import io
+    from moose.moose import MOOSEInput
+    from moose.mesh import Mesh
+    from moose.variables import Variables
+    from moose.boundary_conditions import BoundaryConditions
+    moose = MOOSEInput()
+    moose.mesh = Mesh()
+    moose.mesh.add_mesh_object("filemesh",1,filename="mesh.e")
+    moose.mesh.second_order = True
+    moose.variables = Variables()
+    moose.variables.add_variable("disp_x",1,1,"")
+    moose.boundary_conditions = BoundaryConditions()
+    moose.boundary_conditions.add_boundary_condition("test",4,None,\
+                               "side",displacements=[moose.variables.variables["disp_x"]], value="7.0")
+    stream = io.StringIO()
+    moose.write(stream)
+    lines = stream.getvalue().split('\n')
+    assert lines[:6] == ['[Mesh]', '  [filemesh]', '    type=FileMeshGenerator',
+                         '    file=mesh.e', '  []', '  second_order=true']
+    assert '    [test]' in lines
+    assert '      factor=7.0' in lines
+    assert lines[-2:] == ['[]', '']
+
+def test_read():
+    import io
+    from moose.tables import buffer_types
+    from moose.moose import MOOSEInput
+    text = """
+# a hand written input
+[Mesh]
+  [./filemesh]
+    type = FileMeshGenerator
+    file = mesh.e
+  [../]
+[]
+[Variables]
+  [temperature]
+    order = FIRST
+    family = LAGRANGE
+  []
+[]
+[Functions]
+  [sh]
+    type=PiecewiseLinear
+    x="300 400
+       500"
+    y='1 2 3' # comment
+  []
+[]
+[Materials]
+  [density]
+    type=ADPiecewiseLinearInterpolationMaterial
+    x="300 500"
+    y="10 12"
+    property=density
+    variable=temperature
+    block=block1
+  []
+  [heat]
+    type=ADHeatConductionMaterial
+    temp=temperature
+    specific_heat_temperature_function=sh
+    thermal_conductivity_temperature_function=sh
+  []
+[]
+[Preconditioning]
+  [smp]
+    type=SMP
+    full=true
+  []
+[]
+"""
+    moose = MOOSEInput()
+    moose.read(io.StringIO(text))
+    assert moose.mesh.mesh_objects["filemesh"].filename == "mesh.e"
+    temperature = moose.variables.variables["temperature"]
+    assert moose.materials.materials["density"].variable is temperature
+    assert moose.materials.materials["heat"].specific_heat is moose.functions.functions["sh"]
+    assert moose.extra_blocks[0].name == "Preconditioning"
+
+    # what write produces reads back to the same text
+    first = io.StringIO()
+    moose.write(first)
+    again = MOOSEInput()
+    again.read(io.StringIO(first.getvalue()))
+    second = io.StringIO()
+    again.write(second)
+    assert first.getvalue() == second.getvalue()
+    assert '    full=true' in first.getvalue().split('\n')
+
+    compact = MOOSEInput()
+    compact.read(io.StringIO(text), compact_arrays=True)
+    x = compact.functions.functions["sh"].x
+    assert isinstance(x, buffer_types) and list(x) == [300., 400., 500.]
+
+def test_read_round_trip():
+    import io
+    from moose.moose import MOOSEInput
+    from moose.reader import HITNode, parse_hit
+    from moose.kernels import ADHeatConduction
+    text = """
+[Mesh]
+  second_order = false
+  [filemesh]
+    type = FileMeshGenerator
+    file = mesh.e
+  []
+[]
+[Variables]
+  [T]
+    initial_condition = 300
+  []
+  [u]
+  []
+[]
+[AuxVariables]
+  [q]
+    family = MONOMIAL
+  []
+[]
+[Kernels]
+  [conduction]
+    type = ADHeatConduction
+    variable = T
+    use_displaced_mesh = false
+  []
+  [plain]
+    type = ADHeatConduction
+    variable = u
+  []
+[]
+[AuxKernels]
+  [parsed]
+    type = ParsedAux
+    variable = q
+    function = 'T*u'
+    args = 'T u'
+  []
+[]
+[Executioner]
+  type = Transient
+  [TimeStepper]
+    type = ConstantDT
+    dt = 1
+  []
+[]
+[Outputs]
+  exodus = false
+  csv = true
+[]
+"""
+    moose = MOOSEInput()
+    moose.read(io.StringIO(text))
+    # what the object model cannot hold is kept as read
+    assert isinstance(moose.variables.variables["T"], HITNode)
+    assert isinstance(moose.kernels.kernels["conduction"], HITNode)
+    assert isinstance(moose.kernels.kernels["plain"], ADHeatConduction)
+    assert isinstance(moose.executioner, HITNode) and isinstance(moose.mesh, HITNode)
+    assert [x.name for x in moose.aux_kernels.kernels["parsed"].args] == ["T", "u"]
+    assert moose.outputs.outputs["exodus"] == "false"
+
+    written = io.StringIO()
+    moose.write(written)
+    assert "exodus=false" in written.getvalue()
+    def kept(before, after):
+        # every parameter and sub-block of before is in after; the object
+        # model may add the defaults it fills in
+        return before.name == after.name and len(before.children) == len(after.children) \
+            and all(value.split() == after.params.get(key, '').split()
+                    for key, value in before.params.items()) \
+            and all(kept(*pair) for pair in zip(before.children, after.children))
+    before = parse_hit(text)
+    after = parse_hit(written.getvalue())
+    assert kept(before, after)
+    assert "initial_condition=300" in written.getvalue()
+    assert "use_displaced_mesh=false" in written.getvalue()
+    assert "[TimeStepper]" in written.getvalue() and "second_order=false" in written.getvalue()
+
+def test_read_errors():
+    import io
+    from moose.moose import MOOSEInput
+    from moose.reader import HITSyntaxError
+    for text in ['[Mesh]\n', '[Mesh]\n[]\n[]\n', '[Mesh]\nfile="mesh.e\n[]\n']:
+        try:
+            MOOSEInput().read(io.StringIO(text))
+        except HITSyntaxError:
+            pass
+        else:
+            raise AssertionError(f"Missed HITSyntaxError for {text!r}")
+
+def test_read_tables():
+    # the throughput of reading is measured by moose.benchmark
+    import io
+    from moose.moose import MOOSEInput
+    x = ' '.join(f'{300 + 0.5*i:.2f}' for i in range(2000))
+    y = ' '.join(f'{1.e5 + i:.6e}' for i in range(2000))
+    blocks = [f'[f{i}]\ntype=PiecewiseLinear\nx="{x}"\ny="{y}"\n[]\n' for i in range(200)]
+    text = '[Functions]\n' + ''.join(blocks) + '[]\n'
+    moose = MOOSEInput()
+    moose.read(io.StringIO(text))
+    functions = moose.functions.functions
+    assert len(functions) == 200 and functions['f199'].y == y
+
+def test_render_cache():
+    import io
+    from moose.moose import MOOSEInput
+    from moose.render import render_cache
+    from moose.variables import Variables
+    from moose.functions import PiecewiseFunction
+    from moose.materials import Materials
+    moose = MOOSEInput()
+    moose.variables = Variables()
+    moose.variables.add_variable("temperature",1,1,"")
+    temperature = moose.variables.variables["temperature"]
+    moose.materials = Materials()
+    for name in ["name1", "name2", "name3"]:
+        moose.materials.add_material(name,type=1,block="block1",data=PiecewiseFunction("sh",[300,500],[10,12]), \
+                                     property="density", variable=temperature)
+
+    def write():
+        stream = io.StringIO()
+        moose.write(stream)
+        return stream.getvalue()
+
+    first = write()
+    render_cache.reset()
+    assert write() == first
+    assert render_cache.misses == 0
+
+    # a nested change re-renders the material and its collection only
+    render_cache.reset()
+    moose.materials.materials["name2"].data.y_data = [10,14]
+    text = write()
+    assert 'y="10 14"' in text
+    assert render_cache.misses == 2
+
+    # adding to a collection and renaming a referenced variable
+    moose.materials.add_material("name4",type=1,block="block1",data=PiecewiseFunction("sh",[300,500],[10,12]), \
+                                 property="density", variable=temperature)
+    temperature.name = "temp"
+    text = write()
+    assert '[name4]' in text and 'variable=temperature' not in text
+
+    # the objects referring to a changed variable are found without it
+    # keeping track of them
+    render_cache.reset()
+    temperature.name = "T"
+    text = write()
+    assert 'variable=T\n' in text and render_cache.misses == 7
+    render_cache.reset()
+    assert write() == text and render_cache.misses == 0
+
+    render_cache.enabled = False
+    try:
+        assert write() == text
+    finally:
+        render_cache.enabled = True
+
+def test_clone():
+    import io
+    from moose.moose import MOOSEInput
+    from moose.variables import Variables
+    from moose.functions import PiecewiseFunction
+    from moose.materials import Materials
+    from moose.executioner import Executioner
+    base = MOOSEInput()
+    base.variables = Variables()
+    base.variables.add_variable("temperature",1,1,"")
+    base.materials = Materials()
+    for name in ["name1", "name2", "name3"]:
+        base.materials.add_material(name,type=1,block="block1",data=PiecewiseFunction("sh",[300,500],[10,12]), \
+                                    property="density", variable=base.variables.variables["temperature"])
+    base.executioner = Executioner(type="Transient", dt="100")
+
+    def write(moose):
+        stream = io.StringIO()
+        moose.write(stream)
+        return stream.getvalue()
+
+    before = write(base)
+    variant = base.clone()
+    variant.edit("materials", "name2", "data").y_data = [10,14]
+    variant.edit("executioner").solve_objects["dt"] = "50"
+    variant.edit("materials").materials.pop("name3")
+
+    assert write(base) == before
+    text = write(variant)
+    assert 'y="10 14"' in text and 'dt="50"' in text and '[name3]' not in text
+    assert list(variant.materials.materials.keys()) == ["name1", "name2"]
+    # unchanged objects are shared, not copied
+    assert variant.materials.materials["name1"] is base.materials.materials["name1"]
+    assert variant.variables is base.variables
+    # a second edit of the same path changes the copy already made
+    data = variant.edit("materials", "name2", "data")
+    assert data is variant.materials.materials["name2"].data
+
+def test_paths():
+    import io
+    from moose.moose import MOOSEInput
+    from moose.variables import Variables
+    from moose.functions import PiecewiseFunction
+    from moose.materials import Materials
+    from moose.executioner import Executioner
+    base = MOOSEInput()
+    base.variables = Variables()
+    base.variables.add_variable("temperature",1,1,"")
+    base.materials = Materials()
+    for name in ["name1", "name2"]:
+        base.materials.add_material(name,type=1,block="block1",data=PiecewiseFunction("sh",[300,500],[10,12]), \
+                                    property="density", variable=base.variables.variables["temperature"])
+    base.executioner = Executioner(type="Transient", dt="100")
+
+    assert base.get("Executioner/dt") == "100"
+    assert base.get("Materials/name1/data/x_data") == [300,500]
+    assert list(base.glob("Materials/*/block").keys()) == ["Materials/name1/block", "Materials/name2/block"]
+    try:
+        base.get("Materials/name3")
+        assert False
+    except KeyError:
+        pass
+
+    variant = base.clone()
+    assert variant.set("Materials/*/block", "block2") == ["Materials/name1/block", "Materials/name2/block"]
+    variant.set("Executioner/dt", "50")
+    stream = io.StringIO()
+    variant.write(stream)
+    assert 'block=block2' in stream.getvalue() or 'block="block2"' in stream.getvalue()
+    assert base.get("Materials/name1/block") == "block1"
+    assert base.get("Executioner/dt") == "100"
+    assert variant.variables is base.variables
+
+def test_sweep(tmp_path):
+    from moose.moose import MOOSEInput
+    from moose.executioner import Executioner
+    from moose.components import Components, InletMassFlowRateTemperature1Phase
+    from moose.sweep import Sweep, Parameter, SamplerTypes, ScaleTypes, read_manifest, sobol
+    base = MOOSEInput()
+    base.components = Components()
+    base.components.components["inlet"] = InletMassFlowRateTemperature1Phase("inlet", temperature=300, input="pipe:in", m_dot=1.0)
+    base.executioner = Executioner(type="Transient", dt="100")
+    parameters = [Parameter("Components/inlet/m_dot", low=1.0, high=2.0, levels=3),
+                  Parameter("Executioner/dt", values=["50", "100"])]
+
+    sweep = Sweep(base, parameters)
+    assert len(sweep) == 6
+    manifest = read_manifest(sweep.write(str(tmp_path)))
+    assert [row["file"] for row in manifest] == [f"case_{i:06d}.i" for i in range(6)]
+    assert manifest[5]["Components/inlet/m_dot"] == "2.0" and manifest[5]["Executioner/dt"] == "100"
+    text = (tmp_path / "case_000002.i").read_text()
+    assert 'm_dot="1.5"' in text and 'dt="50"' in text
+    assert base.get("Components/inlet/m_dot") == 1.0
+
+    for sampler in [SamplerTypes.LATIN_HYPERCUBE, SamplerTypes.SOBOL]:
+        sweep = Sweep(base, [Parameter("Components/inlet/m_dot", low=0.1, high=10.0, scale=ScaleTypes.LOG),
+                             Parameter("Components/inlet/T", low=300, high=400)],
+                      sampler=sampler, samples=16, seed=1)
+        points = list(sweep.points())
+        # one point in each sixteenth of the range of T
+        assert sorted(int((t-300)/100*16) for _, t in points) == list(range(16))
+        assert all(0.1 <= m <= 10.0 for m, _ in points)
+
+    assert list(sobol(3,4))[2] == [0.75, 0.25, 0.25]
+    try:
+        Sweep(base, [Parameter("Executioner/missing", values=[1])])
+        assert False
+    except KeyError:
+        pass
+
+def test_batch(tmp_path):
+    import io
+    import pickle
+    from moose.moose import MOOSEInput
+    from moose.variables import Variables
+    from moose.materials import Materials
+    from moose.functions import PiecewiseFunction
+    from moose.executioner import Executioner
+    from moose.batch import write_batch
+    from moose.sweep import Sweep, Parameter
+    base = MOOSEInput()
+    base.variables = Variables()
+    base.variables.add_variable("temperature",1,1,"")
+    base.materials = Materials()
+    base.materials.add_material("name1",type=1,block="block1",data=PiecewiseFunction("sh",[300,500],[10,12]), \
+                                property="density", variable=base.variables.variables["temperature"])
+    base.executioner = Executioner(type="Transient", dt="100")
+
+    def write(moose):
+        stream = io.StringIO()
+        moose.write(stream)
+        return stream.getvalue()
+
+    # a loaded input writes the same and still tracks changes to shared objects
+    text = write(base)
+    loaded = pickle.loads(pickle.dumps(base))
+    assert write(loaded) == text
+    loaded.variables.variables["temperature"].name = "temp"
+    assert 'variable=temp\n' in write(loaded)
+
+    variants = [(str(tmp_path / f"{i}.i"), {"Executioner/dt": str(i)}) for i in range(10)]
+    report = write_batch(base, iter(variants), workers=2, chunksize=3)
+    assert report.files() == 10 and len(report.workers) <= 2
+    assert 'dt="7"' in (tmp_path / "7.i").read_text()
+    report = write_batch(base, variants, workers=0)
+    assert report.files() == 10 and report.as_dict()["workers"][0]["files"] == 10
+
+    sweep = Sweep(base, [Parameter("Executioner/dt", values=["1", "2", "3"])])
+    sweep.write(str(tmp_path / "sweep"), workers=2, chunksize=1)
+    assert sweep.report.files() == 3
+    assert 'dt="3"' in (tmp_path / "sweep" / "case_000002.i").read_text()
+
+def test_tables():
+    from array import array
+    from moose.functions import PiecewiseFunction, PiecewiseLinear
+    from moose.materials import ADPiecewiseLinearInterpolationMaterial
+    from moose.variables import Variable
+    from moose.tables import as_table, format_table, parse_table, numpy
+
+    # lists are written as they always were, strings in lists too
+    assert str(PiecewiseFunction("sh",[300,500],[10.5,12])) == 'x="300 500"\ny="10.5 12"\n'
+    assert str(PiecewiseFunction("sh",["300","500"],["10","12"])) == 'x="300 500"\ny="10 12"\n'
+
+    x = as_table(array('d',[300,400,500]))
+    y = as_table([0.1,1/3,2e-9])
+    function = PiecewiseFunction("sh",x,y)
+    assert str(function) == f'x="300.0 400.0 500.0"\ny="0.1 {1/3!r} 2e-09"\n'
+    function.precision = '.3g'
+    assert str(function) == 'x="300 400 500"\ny="0.1 0.333 2e-09"\n'
+    assert list(parse_table(format_table(y))) == list(y)
+
+    linear = PiecewiseLinear("f", x=x, y=y, precision='.3g')
+    text = str(linear)
+    assert 'x="300 400 500"' in text and 'precision' not in text
+
+    temperature = Variable("temperature",1,1,"")
+    material = ADPiecewiseLinearInterpolationMaterial("k", block="b", x=x, y=y, property="k", variable=temperature)
+    assert 'x="300.0 400.0 500.0"' in str(material)
+    if numpy is not None:
+        assert isinstance(material.data.x_data, numpy.ndarray)
+        assert material.data.x_data.dtype == numpy.float64
+
+def test_simplify():
+    from array import array
+    from moose.moose import MOOSEInput
+    from moose.functions import Functions, PiecewiseFunction, PiecewiseLinear
+    from moose.materials import Materials
+    from moose.variables import Variable
+    from moose.tables import simplify_table
+
+    # two straight lines sampled at 1 K, with a kink at 400 K
+    x = [float(t) for t in range(300, 601)]
+    y = [1.0 + 0.01*(t - 300) if t <= 400 else 2.0 - 0.002*(t - 400) for t in range(300, 601)]
+    sx, sy, report = simplify_table(x, y, 1e-9)
+    assert sx == [300.0, 400.0, 600.0] and report.kept == 3 and report.compression() > 100
+    assert report.max_error < 1e-9
+
+    noisy = [v + (1e-3 if i % 2 else -1e-3) for i, v in enumerate(y)]
+    for tolerance, relative in [(5e-3, False), (5e-3, True)]:
+        sx, sy, report = simplify_table(array('d', x), noisy, tolerance, relative)
+        assert isinstance(sy, type(sx)) and len(sx) < len(x)
+        if relative:
+            assert report.max_relative_error <= tolerance
+        else:
+            assert report.max_error <= tolerance
+
+    moose = MOOSEInput()
+    moose.functions = Functions()
+    moose.functions.functions["k"] = PiecewiseLinear("k", x=array('d', x), y=array('d', y))
+    moose.materials = Materials()
+    moose.materials.add_material("rho", type=1, block="b", data=PiecewiseFunction("rho", x, y),
+                                 property="density", variable=Variable("temperature",1,1,""))
+    variant = moose.clone()
+    reports = variant.simplify_tables(1e-6)
+    assert sorted(reports.keys()) == ["Functions/k", "Materials/rho"]
+    assert list(variant.get("Functions/k/x")) == [300.0, 400.0, 600.0]
+    assert variant.get("Materials/rho/data/x_data") == [300.0, 400.0, 600.0]
+    assert len(moose.get("Materials/rho/data/x_data")) == 301
+
+def test_deduplicate_tables():
+    import io
+    from array import array
+    from moose.moose import MOOSEInput
+    from moose.functions import Functions, PiecewiseFunction, PiecewiseLinear
+    from moose.materials import Materials, ADHeatConductionMaterial, ADGenericFunctionMaterial
+    from moose.variables import Variable
+    temperature = Variable("temperature",1,1,"")
+    moose = MOOSEInput()
+    moose.functions = Functions()
+    moose.materials = Materials()
+    for block in ["b1", "b2", "b3"]:
+        # b3 is a different alloy
+        y = [1.0, 2.0] if block != "b3" else [1.0, 3.0]
+        sh = PiecewiseLinear(f"{block}-sh", x=array('d',[300,400]), y=y)
+        moose.functions.functions[sh.name] = sh
+        moose.materials.materials[f"{block}-heat"] = ADHeatConductionMaterial(f"{block}-heat", block,
+            variable=temperature, specific_heat=sh, thermal_conductivity=sh)
+        moose.materials.add_material(f"{block}-density", type=1, block=block,
+            data=PiecewiseFunction("rho", "300 400", y), property="density", variable=temperature)
+    moose.materials.materials["htc"] = ADGenericFunctionMaterial("htc", "b2", prop_names=["htc"],
+        prop_values=[moose.functions.functions["b2-sh"]])
+
+    variant = moose.clone()
+    replaced = variant.deduplicate_tables()
+    assert replaced == {"b2-sh": "b1-sh", "b2-density": "b1-density"}
+    assert list(variant.functions.functions.keys()) == ["b1-sh", "b3-sh"]
+    assert variant.get("Materials/b2-heat/specific_heat") is variant.get("Functions/b1-sh")
+    assert variant.get("Materials/htc/prop_values")[0].name == "b1-sh"
+    assert variant.get("Materials/b1-density/block") == "b1 b2"
+    assert "b2-density" not in variant.materials.materials
+    stream = io.StringIO()
+    variant.write(stream)
+    assert "specific_heat_temperature_function=b2-sh" not in stream.getvalue()
+    # the input it was cloned from is unchanged
+    assert len(moose.functions.functions) == 3
+    assert moose.get("Materials/b2-heat/specific_heat").name == "b2-sh"
+    assert moose.get("Materials/b1-density/block") == "b1"
+
+def test_table_files(tmp_path):
+    import os
+    from array import array
+    from moose.moose import MOOSEInput
+    from moose.functions import Functions, PiecewiseLinear
+    from moose.executioner import Executioner
+    from moose.sweep import Sweep, Parameter
+    moose = MOOSEInput()
+    moose.functions = Functions()
+    x = array('d', range(2000))
+    moose.functions.functions["big"] = PiecewiseLinear("big", x=x, y=x, axis="x")
+    moose.functions.functions["small"] = PiecewiseLinear("small", x=[0,1], y=[1,2])
+    moose.executioner = Executioner(type="Transient", dt="100")
+
+    sweep = Sweep(moose, [Parameter("Executioner/dt", values=["1", "2", "3"])])
+    sweep.write(str(tmp_path / "cases"), table_dir=str(tmp_path / "tables"), table_threshold=100)
+    tables = os.listdir(tmp_path / "tables")
+    assert len(tables) == 1
+    text = (tmp_path / "cases" / "case_000001.i").read_text()
+    assert f'data_file="../tables/{tables[0]}"' in text and 'format=columns' in text
+    assert 'axis="x"' in text and 'x="0 1"' in text and len(text) < 1000
+    rows = (tmp_path / "tables" / tables[0]).read_text().splitlines()
+    assert len(rows) == 2000 and rows[5] == "5.0,5.0"
+
+    # the same reference to tables in another directory writes them there
+    for run in ("a", "b"):
+        os.makedirs(tmp_path / run)
+        moose.write(str(tmp_path / run / "case.i"), table_dir=str(tmp_path / run / "tables"),
+                    table_threshold=100)
+        assert os.listdir(tmp_path / run / "tables") == tables
+
+    # inline again without table_dir
+    path = tmp_path / "inline.i"
+    moose.write(str(path))
+    assert 'data_file' not in path.read_text()
+
+def test_skip_unchanged(tmp_path):
+    import os
+    from moose.moose import MOOSEInput
+    from moose.executioner import Executioner
+    from moose.variables import Variables
+    from moose.manifest import HashManifest
+    moose = MOOSEInput()
+    moose.variables = Variables()
+    moose.variables.add_variable("temperature",1,1,"")
+    moose.executioner = Executioner(type="Transient", dt="100")
+    path = str(tmp_path / "input.i")
+
+    assert moose.write(path, skip_unchanged=True)
+    os.utime(path, ns=(1, 1))
+    assert not moose.write(path, skip_unchanged=True)
+    assert os.stat(path).st_mtime_ns == 1
+    variant = moose.clone()
+    variant.set("Executioner/dt", "50")
+    assert variant.write(path, skip_unchanged=True)
+    assert 'dt="50"' in open(path).read()
+
+    # digests follow the text and are the same for equal inputs
+    assert variant.digest() != moose.digest()
+    assert moose.clone().digest() == moose.digest()
+
+    manifest_path = str(tmp_path / "hashes.json")
+    inputs = [(str(tmp_path / f"{i}.i"), moose if i % 2 else variant) for i in range(4)]
+    assert HashManifest(manifest_path).write_all(inputs) == 4
+    manifest = HashManifest(manifest_path)
+    assert manifest.write_all(inputs) == 0 and manifest.skipped == 4
+    # a file changed on disk is written again
+    with open(inputs[0][0], 'a') as file:
+        file.write('\n')
+    assert HashManifest(manifest_path).write_all(inputs) == 1
+    from moose.batch import write_batch
+    variants = [(str(tmp_path / f"{i}.i"), {"Executioner/dt": "100" if i % 2 else "50"}) for i in range(4)]
+    report = write_batch(moose, variants, workers=0, skip_unchanged=True)
+    assert report.skipped() == 4 and report.files() == 0
+
+def test_slots():
+    import copy
+    import pickle
+    from moose.variables import Variable
+    from moose.kernels import ADHeatConduction
+    from moose.materials import ADHeatConductionMaterial
+    from moose.functions import PiecewiseLinear, PiecewiseFunction
+    from moose.components import FlowChannel1Phase
+    from moose.render import attributes
+    temperature = Variable("temperature",1,1,"")
+    function = PiecewiseLinear("k", x=[300,400], y=[1,2])
+    objects = [temperature, ADHeatConduction("heat", temperature, "b"), PiecewiseFunction("f",[1],[2]),
+               ADHeatConductionMaterial("m", "b", variable=temperature, specific_heat=function,
+                                        thermal_conductivity=function)]
+    for obj in objects:
+        assert not hasattr(obj, '__dict__')
+        text = str(obj)
+        assert str(copy.copy(obj)) == text
+        assert str(pickle.loads(pickle.dumps(obj))) == text
+    assert [name for name, value in attributes(temperature)] == ["name", "order", "family", "block"]
+
+    # keyword argument classes keep their parameter order
+    pipe = FlowChannel1Phase(name="pipe", fp="water", A=1.0, length=2.0)
+    text = str(pipe)
+    assert text.index('fp=') < text.index('A=') < text.index('length=')
+    assert str(copy.copy(pipe)) == text
+
+    # slotted objects are still written by name from keyword argument classes
+    from moose.postprocessors import ElementAverageValue
+    temperature.name = "temp"
+    assert 'variable="temp"' in str(ElementAverageValue("avg", temperature, "b"))
+    assert 'temp=temp' in str(objects[3])
+
+def test_add_many():
+    from array import array
+    from moose.variables import Variables
+    from moose.kernels import Kernels
+    from moose.components import Components
+    from moose.postprocessors import PostProcessors
+    variables = Variables()
+    variables.add_variable("temperature",1,1,"")
+    variables.add_variable("disp_z",1,1,"")
+
+    # columns, with names looked up and None cells left out
+    kernels = Kernels()
+    made = kernels.add_many({'name': ['heat', 'gravity'], 'type': ['ADHeatConduction', 4],
+                             'variable': ['temperature', 'disp_z'], 'block': [None, None],
+                             'thermal_conductivity': ['k', None], 'value': array('d', [0., -9.81])},
+                            references={'variable': variables.variables})
+    assert [kernel.name for kernel in made] == ['heat', 'gravity']
+    expected = Kernels()
+    expected.add_kernel("heat",1,variables.variables["temperature"],block=None,thermal_conductivity='k',value=0.)
+    expected.add_kernel("gravity",4,variables.variables["disp_z"],block=None,value=-9.81)
+    assert str(kernels) == str(expected)
+
+    # rows, and classes without one of their own
+    components = Components()
+    components.add_many([{'name': 'pipe', 'type': 'FlowChannel1Phase', 'A': 1.0, 'length': 2.0},
+                         {'name': 'pump', 'type': 'Pump1Phase', 'head': 3.0}])
+    assert 'type=FlowChannel1Phase' in str(components.components['pipe'])
+    assert 'head="3.0"' in str(components.components['pump'])
+
+    # every problem is raised at once and nothing is added
+    post_processors = PostProcessors()
+    try:
+        post_processors.add_many({'name': ['a', 'a', 'b', 'c'], 'type': [3, 3, 'Nothing', 1],
+                                  'variable': ['temperature', 'temperature', 'missing', 'temperature']},
+                                 references={'variable': variables.variables})
+    except ValueError as error:
+        message = str(error)
+    assert 'row 1: name a already in use' in message
+    assert 'row 2: unknown type Nothing' in message
+    assert 'row 2: no variable named missing' in message
+    assert post_processors.post_processors == {}
+    try:
+        kernels.add_many({'name': ['x'], 'type': [1, 2]})
+    except ValueError as error:
+        assert 'different lengths' in str(error)
+    else:
+        assert False
+
+def test_add_many_rows():
+    # add_many writes the same as add_kernel row by row; its throughput is
+    # measured by moose.benchmark
+    from moose.benchmark import kernel_rows
+    from moose.variables import Variables
+    from moose.kernels import Kernels
+    variables = Variables()
+    variables.add_variable("temperature",1,1,"")
+    data = kernel_rows(200)
+    bulk = Kernels()
+    bulk.add_many(data, references={'variable': variables.variables})
+    kernels = Kernels()
+    for name, block in zip(data['name'], data['block']):
+        kernels.add_kernel(name,1,variables.variables["temperature"],block,thermal_conductivity='k')
+    assert len(bulk.kernels) == 200 and str(bulk) == str(kernels)
+
+def test_lazy_import():
+    import os, subprocess, sys
+    import moose
+    root = os.path.dirname(os.path.dirname(os.path.abspath(moose.__file__)))
+    code = 'import sys, time\n' \
+           'start = time.perf_counter()\n' \
+           'import moose\n' \
+           'seconds = time.perf_counter() - start\n' \
+           'print(seconds, sorted(m for m in sys.modules if m.startswith("moose.")))\n' \
+           'moose.Kernels\n' \
+           'print(sorted(m for m in sys.modules if m.startswith("moose.")))\n'
+    output = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True,
+                            text=True, check=True).stdout.splitlines()
+    # a coarse budget, loose enough for shared runners; moose.benchmark
+    # measures the time taken
+    seconds, loaded = output[0].split(' ', 1)
+    assert loaded == '[]' and float(seconds) < 0.5
+    assert 'moose.kernels' in output[1] and 'moose.moose' not in output[1]
+
+    from moose.moose import MOOSEInput
+    assert moose.MOOSEInput is MOOSEInput
+    assert 'Kernels' in moose.__all__ and 'Kernels' in dir(moose)
+    try:
+        moose.Nothing
+    except AttributeError:
+        pass
+    else:
+        assert False
+
+def test_benchmark(tmp_path):
+    import json
+    from moose.benchmark import main
+    output = tmp_path / 'results.json'
+    main(['--kernels', '10', '--blocks', '2', '--materials-per-block', '2', '--components', '3',
+          '--table-points', '50', '--table-sizes', '100', '--repeat', '1', '--output', str(output)])
+    report = json.loads(output.read_text())
+    assert report['sizes']['kernels'] == 10 and report['sizes']['table_points'] == 50
+    names = [result['name'] for result in report['results']]
+    assert names == ['import', 'construct', 'write_cold', 'write_warm', 'read', 'validate', 'add_many',
+                     'add_kernel', 'format_table']
+    assert all(result['seconds'] > 0 and result['peak_bytes'] > 0 for result in report['results'])
+
+def test_write_profile(tmp_path):
+    import io, json
+    from moose.benchmark import build_model
+    from moose.instrument import WriteProfile, ProfilingWriter
+    from moose.render import render_cache
+    from moose.writer import HITWriter
+    moose = build_model(kernels=20, blocks=3, materials_per_block=2, components=5, table_points=100)
+    assert type(moose._writer(io.StringIO(), None, None, 1000)) is HITWriter
+    for enabled in (True, True, False):
+        render_cache.enabled = enabled
+        stream = io.StringIO()
+        events = []
+        with WriteProfile(callback=events.append) as profile:
+            assert type(moose._writer(stream, None, None, 1000)) is ProfilingWriter
+            moose.write(stream)
+        render_cache.enabled = True
+        # own bytes add up to the whole file, cached or not
+        assert profile.total.bytes == len(stream.getvalue().encode())
+        assert profile.types['ADHeatConduction'].count == 20
+        assert profile.types['PiecewiseLinear'].count == 3
+        assert profile.blocks['Kernels'].count == 21
+        assert sum(stats.bytes for stats in profile.blocks.values()) == profile.total.bytes
+        assert len(events) == profile.total.count
+    assert type(moose._writer(io.StringIO(), None, None, 1000)) is HITWriter
+
+    profile.write_json(tmp_path / 'profile.json')
+    data = json.loads((tmp_path / 'profile.json').read_text())
+    assert data['blocks']['Materials']['count'] == 7
+    assert 'Functions' in str(profile)
+
+def test_validate():
+    import io
+    from moose.moose import MOOSEInput
+    text = '''
+[Mesh]
+  [mesh]
+    type=FileMeshGenerator
+    file=mesh.e
+  []
+[]
+[Variables]
+  [temperature]
+    block=fuel
+  []
+  [disp_x]
+  []
+[]
+[AuxVariables]
+  [vm]
+  []
+[]
+[Functions]
+  [k]
+    type=PiecewiseLinear
+    x="300 400"
+    y="1 2"
+  []
+[]
+[Kernels]
+  [heat]
+    type=ADHeatConduction
+    variable=temperature
+    block=clad
+    thermal_conductivity=thermal_conductivity
+  []
+  [dt]
+    type=ADHeatConductionTimeDerivative
+    variable=temprature
+    specific_heat=specific_heat
+    density_name=density
+  []
+[]
+[AuxKernels]
+  [vm]
+    type=ParsedAux
+    variable=vm
+    function=disp_y
+    args=disp_y
+  []
+[]
+[BCs]
+  [left]
+    type=ADDirichletBC
+    variable=temperature
+    boundary=lft
+    value=300
+  []
+[]
+[Materials]
+  [heat]
+    type=ADHeatConductionMaterial
+    temp=temperature
+    block=fuel
+    specific_heat_temperature_function=cp
+    thermal_conductivity_temperature_function=k
+  []
+[]
+[Postprocessors]
+  [avg]
+    type=ElementAverageValue
+    variable=vm
+  []
+[]
+'''
+    moose = MOOSEInput()
+    moose.read(io.StringIO(text))
+    problems = [str(problem) for problem in moose.validate(blocks=['fuel','clad'], boundaries=['left','right'])]
+    assert problems == [
+        'Kernels/heat: thermal_conductivity refers to material property thermal_conductivity, which is not declared on block clad',
+        'Kernels/heat: variable temperature does not exist on block clad',
+        'Kernels/dt: variable refers to variable temprature, which is not declared',
+        'Kernels/dt: specific_heat refers to material property specific_heat, which is not declared on block clad',
+        'Kernels/dt: density_name refers to material property density, which no material declares',
+        'AuxKernels/vm: args refers to variable disp_y, which is not declared',
+        'BCs/left: boundary refers to boundary lft, which is not declared',
+        'Materials/heat: specific_heat refers to function cp, which is not declared']
+    # blocks and boundaries are only checked when given
+    assert len(moose.validate()) == 6
+
+    # variable is a variable in Kernels but an aux variable in AuxKernels
+    shared = MOOSEInput()
+    shared.read(io.StringIO('''
+[Variables]
+  [T]
+  []
+[]
+[Kernels]
+  [heat]
+    type=ADHeatConduction
+    variable=T
+  []
+[]
+[AuxKernels]
+  [aux]
+    type=ParsedAux
+    variable=T
+    function=2*T
+    args=T
+  []
+[]
+'''))
+    assert [str(problem) for problem in shared.validate()] == [
+        'AuxKernels/aux: variable refers to aux variable T, which is not declared']
+
+    from moose.benchmark import build_model
+    from moose.kernels import ADHeatConduction
+    moose = build_model(kernels=0, blocks=100, materials_per_block=1, components=0, table_points=2)
+    temperature = moose.variables.variables['temperature']
+    moose.kernels.kernels.update((f'heat_{i}', ADHeatConduction(f'heat_{i}', temperature, f'block_{i % 100}',
+                                  thermal_conductivity='thermal_conductivity')) for i in range(100000))
+    # the time taken is measured by moose.benchmark
+    problems = moose.validate(blocks=[f'block_{i}' for i in range(99)])
+    assert len(problems) == 1001
+
+def _netcdf(filename, version, dimensions, attributes, variables):
+    # write a NetCDF classic file by hand: dimensions (name, length),
+    # attributes {name: str}, variables (name, dimensions, attributes,
+    # nc_type, data bytes or a size to leave as a hole in the file)
+    import struct
+    count = '>q' if version == 5 else '>i'
+    offset = '>i' if version == 1 else '>q'
+    def pad(data):
+        return data + b'\0'*(-len(data) % 4)
+    def name(text):
+        return struct.pack(count, len(text)) + pad(text.encode())
+    def atts(attributes):
+        if not attributes:
+            return b'\0'*8 if version != 5 else b'\0'*12
+        data = struct.pack('>i', 12) + struct.pack(count, len(attributes))
+        for key, value in attributes.items():
+            data += name(key) + struct.pack('>i', 2) + struct.pack(count, len(value)) + pad(value.encode())
+        return data
+    index = [dim for dim, length in dimensions]
+    def header(begins):
+        data = b'CDF' + bytes([version]) + struct.pack(count, 0)
+        data += struct.pack('>i', 10) + struct.pack(count, len(dimensions))
+        for dim, length in dimensions:
+            data += name(dim) + struct.pack(count, length)
+        data += atts(attributes)
+        data += struct.pack('>i', 11) + struct.pack(count, len(variables))
+        for (var, dims, var_atts, nc_type, values), begin in zip(variables, begins):
+            size = len(values) if isinstance(values, bytes) else values
+            data += name(var) + struct.pack(count, len(dims))
+            data += b''.join(struct.pack(count, index.index(dim)) for dim in dims)
+            data += atts(var_atts) + struct.pack('>i', nc_type)
+            data += struct.pack('>q', size) if version == 5 else struct.pack('>I', min(size, 2**32 - 1))
+            data += struct.pack(offset, begin)
+        return data
+    begins = []
+    position = len(header([0]*len(variables)))
+    for var in variables:
+        begins.append(position)
+        values = var[4]
+        position += (len(values) if isinstance(values, bytes) else values)
+    with open(filename, 'wb') as file:
+        file.write(header(begins))
+        for var, begin in zip(variables, begins):
+            if isinstance(var[4], bytes):
+                file.seek(begin)
+                file.write(var[4])
+        file.truncate(position)
+
+def test_exodus(tmp_path):
+    import struct
+    from moose.exodus import read_exodus, NetCDFHeader
+    from moose.mesh import Mesh
+    def names(*values):
+        return b''.join(value.encode().ljust(32, b'\0') for value in values)
+    nodes = 200000000
+    dimensions = [('len_name', 32), ('time_step', 0), ('num_dim', 3), ('num_nodes', nodes),
+                  ('num_elem', 150), ('num_el_blk', 2), ('num_side_sets', 1), ('num_node_sets', 1),
+                  ('num_el_in_blk1', 100), ('num_nod_per_el1', 8), ('num_el_in_blk2', 50),
+                  ('num_nod_per_el2', 4), ('num_side_ss1', 12), ('num_nod_ns1', 7)]
+    variables = [('eb_names', ['num_el_blk', 'len_name'], {}, 2, names('fuel', 'clad')),
+                 ('eb_prop1', ['num_el_blk'], {'name': 'ID'}, 4, struct.pack('>2i', 1, 20)),
+                 ('ss_names', ['num_side_sets', 'len_name'], {}, 2, names('outer')),
+                 ('ss_prop1', ['num_side_sets'], {}, 4, struct.pack('>i', 3)),
+                 ('ns_names', ['num_node_sets', 'len_name'], {}, 2, names('')),
+                 ('ns_prop1', ['num_node_sets'], {}, 4, struct.pack('>i', 4)),
+                 ('connect1', ['num_el_in_blk1', 'num_nod_per_el1'], {'elem_type': 'HEX8'}, 4, 3200),
+                 ('connect2', ['num_el_in_blk2', 'num_nod_per_el2'], {'elem_type': 'QUAD4'}, 4, 800),
+                 # 4.8 GB of coordinates, left as a hole in the file
+                 ('coord', ['num_dim', 'num_nodes'], {}, 6, 3*8*nodes)]
+    for version in (1, 2, 5):
+        if version == 1:
+            # offsets of CDF-1 are 32 bits, so keep its file small
+            small = [('num_nodes', 10) if dim == 'num_nodes' else (dim, n) for dim, n in dimensions]
+            _netcdf(tmp_path / 'mesh1.e', 1, small, {'title': 'pin'}, variables[:-1] + [variables[-1][:4] + (240,)])
+        else:
+            _netcdf(tmp_path / f'mesh{version}.e', version, dimensions, {'title': 'pin'}, variables)
+        info = read_exodus(tmp_path / f'mesh{version}.e')
+        assert info.title == 'pin' and info.dimension == 3 and info.elements == 150
+        assert info.nodes == (10 if version == 1 else nodes)
+        assert [(b.id, b.name, b.count, b.element_type) for b in info.blocks] == \
+            [(1, 'fuel', 100, 'HEX8'), (20, 'clad', 50, 'QUAD4')]
+        assert [(s.id, s.name, s.count) for s in info.side_sets] == [(3, 'outer', 12)]
+        assert [(s.id, s.name, s.count) for s in info.node_sets] == [(4, '', 7)]
+        assert info.block_names() == ['1', 'fuel', '20', 'clad']
+        assert info.boundary_names() == ['3', 'outer', '4']
+    assert (tmp_path / 'mesh2.e').stat().st_size > 4e9
+
+    with NetCDFHeader(tmp_path / 'mesh2.e') as header:
+        assert header.variables['eb_prop1'].attributes == {'name': 'ID'}
+        assert header.dimensions['time_step'] == 0
+
+    mesh = Mesh()
+    mesh.add_mesh_object("mesh", 1, filename="mesh2.e")
+    assert mesh.mesh_objects["mesh"].exodus(tmp_path).blocks[1].name == 'clad'
+
+    (tmp_path / 'hdf5.e').write_bytes(b'\x89HDF\r\n\x1a\n' + bytes(100))
+    try:
+        read_exodus(tmp_path / 'hdf5.e')
+    except ValueError as error:
+        assert 'HDF5' in str(error)
+    else:
+        assert False
+
+def test_runner(tmp_path):
+    import sys, time
+    from moose.runner import Runner
+    # a stand-in for the application, acting on the text of its input
+    stand_in = tmp_path / 'stand_in.py'
+    stand_in.write_text('import sys, time\n'
+                        'text = open(sys.argv[sys.argv.index("-i") + 1]).read()\n'
+                        'print("ran", text.strip(), sys.argv[3:])\n'
+                        'print("warning", file=sys.stderr)\n'
+                        'if text.startswith("sleep"): time.sleep(30)\n'
+                        'sys.exit(3 if text.startswith("fail") else 0)\n')
+    # and for mpiexec, running the command once with the number of ranks
+    mpiexec = tmp_path / 'mpiexec.py'
+    mpiexec.write_text('import subprocess, sys\n'
+                       'print("ranks", sys.argv[2], flush=True)\n'
+                       'sys.exit(subprocess.call(sys.argv[3:]))\n')
+    inputs = []
+    for idx in range(20):
+        path = tmp_path / f'case_{idx:02d}.i'
+        path.write_text('fail' if idx == 3 else f'case {idx}')
+        inputs.append(path)
+
+    finished = []
+    runner = Runner([sys.executable, stand_in], concurrency=8, args=['--n-threads=1'])
+    results = runner.run(inputs, callback=finished.append)
+    assert [result.input for result in results] == [str(path) for path in inputs]
+    assert len(finished) == 20
+    assert [result.returncode for result in results] == [3 if idx == 3 else 0 for idx in range(20)]
+    log = open(results[5].log).read()
+    assert "ran case 5 ['--n-threads=1']" in log and 'warning' in log
+    assert results[5].log == str(tmp_path / 'case_05.log')
+    assert results[3].as_dict()['returncode'] == 3 and not results[3].ok()
+
+    logs = tmp_path / 'logs'
+    logs.mkdir()
+    runner = Runner([sys.executable, stand_in], ranks=4, log_dir=logs,
+                    mpiexec=[sys.executable, mpiexec])
+    result = runner.run(inputs[:1])[0]
+    assert result.command[2:4] == ['-n', '4'] and result.ok()
+    assert open(logs / 'case_00.log').read().startswith('ranks 4\nran case 0')
+
+    (tmp_path / 'sleep.i').write_text('sleep')
+    start = time.perf_counter()
+    result = Runner([sys.executable, stand_in], timeout=0.5).run([tmp_path / 'sleep.i'])[0]
+    assert result.timed_out and result.returncode is None
+    assert time.perf_counter() - start < 10
+
+    result = Runner(tmp_path / 'missing').run(inputs[:1])[0]
+    assert result.error is not None and not result.ok()
+
+def test_csv_tail(tmp_path):
+    import os
+    from moose.postprocessors import PostProcessors
+    from moose.outputs import Outputs
+    from moose.csvtail import PostprocessorCSV, CSVWatcher, csv_filename
+    assert csv_filename(str(tmp_path / 'case.i')) == str(tmp_path / 'case_out.csv')
+    assert csv_filename('case.i', Outputs(csv=True, file_base='run')) == 'run.csv'
+
+    post_processors = PostProcessors()
+    post_processors.add_post_processor('avg', 3, None)
+    post_processors.add_post_processor('max', 2, None)
+    filename = tmp_path / 'case_out.csv'
+    tail = PostprocessorCSV(filename, post_processors, capacity=2)
+    assert tail.poll() == 0
+
+    filename.write_text('time,avg,extra,max\n0,1.5,9,2\n')
+    assert tail.poll() == 1
+    with open(filename, 'a') as file:
+        file.write('1,2.5,9,3\n2,3.5,9,4\n3,4.')
+    # the last line is not finished, so it waits
+    assert tail.poll() == 2
+    assert list(tail['avg']) == [1.5, 2.5, 3.5]
+    with open(filename, 'a') as file:
+        file.write('5,9,5\n')
+    assert tail.poll() == 1 and tail.poll() == 0
+    assert list(tail['max']) == [2., 3., 4., 5.]
+    assert list(tail.columns().keys()) == ['time', 'avg', 'max']
+    assert tail.last() == {'time': 3., 'avg': 4.5, 'max': 5.}
+    assert tail.offset == os.path.getsize(filename)
+
+    # a rerun starts the file again
+    filename.write_text('time,avg,max\n0,7,8\n')
+    assert tail.poll() == 1 and tail.last() == {'time': 0., 'avg': 7., 'max': 8.}
+    # rows that do not fit the header are skipped, not the rows after them
+    avg = tail['avg']
+    with open(filename, 'a') as file:
+        file.write('1,8\n1,8,9,10\n1,x,9\n2,9,10\n')
+    assert tail.poll() == 1 and tail.bad_rows == ['1,8', '1,8,9,10', '1,x,9']
+    assert list(tail['avg']) == [7., 9.] and tail.offset == os.path.getsize(filename)
+    assert list(avg) == [7.]
+
+    watcher = CSVWatcher()
+    for idx in range(3):
+        (tmp_path / f'run_{idx}.csv').write_text('time,avg\n0,1\n')
+        watcher.add(tmp_path / f'run_{idx}.csv', ['avg'])
+    assert watcher.poll() == {tmp_path / f'run_{idx}.csv': 1 for idx in range(3)}
+    with open(tmp_path / 'run_1.csv', 'a') as file:
+        file.write('1,2\n')
+    updates = []
+    polls = iter(range(2))
+    watcher.watch(updates.append, interval=0, stop=lambda: next(polls, None) is None)
+    assert updates == [{tmp_path / 'run_1.csv': 1}]
+    # declared postprocessors not in the file are listed as missing
+    tail = PostprocessorCSV(tmp_path / 'run_0.csv', ['min'])
+    assert tail.poll() == 1 and tail.missing == ['min'] and list(tail.columns()) == ['time']
+
+def test_split_write(tmp_path):
+    import os
+    from moose.moose import MOOSEInput
+    from moose.variables import Variables
+    from moose.kernels import Kernels
+    from moose.executioner import Executioner
+    from moose.sweep import Sweep, Parameter
+    moose = MOOSEInput()
+    moose.variables = Variables()
+    moose.variables.add_variable("temperature",1,1,"")
+    moose.kernels = Kernels()
+    moose.kernels.add_kernel("heat",1,moose.variables.variables["temperature"],"block1")
+    moose.executioner = Executioner(type="Transient", dt="100")
+
+    blocks = tmp_path / "blocks"
+    filename = tmp_path / "case.i"
+    assert moose.write(str(filename), split_dir=str(blocks))
+    master = filename.read_text()
+    assert master.splitlines()[0].startswith("!include blocks/Variables_")
+    files = set(os.listdir(blocks))
+    assert len(files) == 3
+    read = MOOSEInput()
+    read.read(str(filename))
+    assert read.get("Executioner/dt") == "100"
+    assert read.blocks()[1].name == "Kernels"
+    assert not moose.write(str(filename), split_dir=str(blocks), skip_unchanged=True)
+
+    # a change writes only the block it is in
+    moose.set("Executioner/dt", "50")
+    assert moose.write(str(filename), split_dir=str(blocks), skip_unchanged=True)
+    new = set(os.listdir(blocks)) - files
+    assert len(new) == 1 and new.pop().startswith("Executioner_")
+
+    # variants of a sweep share the blocks they do not change
+    sweep = Sweep(moose, [Parameter("Executioner/dt", values=["1", "2", "3"])])
+    sweep.write(str(tmp_path / "sweep"), split_dir=str(blocks))
+    assert len(os.listdir(blocks)) == 7
+    read = MOOSEInput()
+    read.read(str(tmp_path / "sweep" / "case_000002.i"))
+    assert read.get("Executioner/dt") == "3"
+
+    # the stale blocks of earlier writes are removed by prune
+    from moose.writer import BlockFiles
+    inputs = [str(tmp_path / "sweep" / f"case_{idx:06d}.i") for idx in range(3)]
+    stale = BlockFiles(str(blocks)).prune(inputs, dry_run=True)
+    assert len(stale) == 2 and len(os.listdir(blocks)) == 7
+    assert sorted(BlockFiles(str(blocks)).prune(inputs)) == sorted(stale)
+    assert len(os.listdir(blocks)) == 5
+    read = MOOSEInput()
+    read.read(inputs[0])
+    assert read.get("Executioner/dt") == "1"
+
+    # tables are found from the block file that refers to them
+    from moose.functions import Functions, PiecewiseLinear
+    moose.functions = Functions()
+    moose.functions.functions["k"] = PiecewiseLinear("k", x=list(range(2000)), y=list(range(2000)))
+    (tmp_path / "run" / "case").mkdir(parents=True)
+    moose.write(str(tmp_path / "run" / "case" / "case.i"), table_dir=str(tmp_path / "tables"),
+                split_dir=str(blocks))
+    functions, = [name for name in os.listdir(blocks) if name.startswith("Functions_")]
+    text = (blocks / functions).read_text()
+    data_file = text.split('data_file="')[1].split('"')[0]
+    assert data_file.startswith("../tables/") and (blocks / data_file).exists()
+
+    # so are the mesh and the inputs of a multiapp, and read back they are
+    # relative to the master input again
+    from moose.mesh import Mesh
+    from moose.multiapps import MultiApps, TransientMultiApp
+    from moose.results import fingerprint
+    moose.mesh = Mesh()
+    moose.mesh.add_mesh_object("mesh", 1, filename="../mesh.e")
+    moose.multiapps = MultiApps()
+    moose.multiapps.multiapps["thm"] = TransientMultiApp("thm", input_files="thm.i")
+    (tmp_path / "run" / "mesh.e").write_text("mesh")
+    (tmp_path / "run" / "case" / "thm.i").write_text("thm")
+    master = tmp_path / "run" / "case" / "case.i"
+    moose.write(str(master), table_dir=str(tmp_path / "tables"), split_dir=str(blocks))
+    for block, key in (("Mesh_", "file="), ("MultiApps_", "input_files=")):
+        name, = [name for name in os.listdir(blocks) if name.startswith(block)]
+        path = (blocks / name).read_text().split(key)[1].split()[0].strip('"')
+        assert (blocks / path).exists()
+    read = MOOSEInput()
+    read.read(str(master))
+    assert read.get("Mesh/mesh/filename") == "../mesh.e"
+    assert read.get("MultiApps/thm/input_files") == "thm.i"
+    single = tmp_path / "run" / "case" / "single.i"
+    moose.write(str(single), table_dir=str(tmp_path / "tables"))
+    assert fingerprint(str(master)) == fingerprint(str(single))
+
+def test_snapshot(tmp_path):
+    import io
+    import json
+    import struct
+    from moose.moose import MOOSEInput
+    from moose.benchmark import build_model
+    from moose.tables import buffer_types
+    from moose.snapshot import write_snapshot, read_snapshot
+    moose = build_model(kernels=20, blocks=2, materials_per_block=2, components=3, table_points=100)
+    text = io.StringIO()
+    moose.write(text)
+    filename = tmp_path / "model.snap"
+    moose.write_snapshot(filename)
+    for mmap_tables in (True, False):
+        loaded = MOOSEInput.read_snapshot(filename, mmap_tables)
+        written = io.StringIO()
+        loaded.write(written)
+        assert written.getvalue() == text.getvalue()
+        # shared objects and tables are shared again
+        temperature = loaded.variables.variables["temperature"]
+        assert loaded.kernels.kernels["heat_0"].variable is temperature
+        materials = loaded.materials.materials
+        assert materials["material_0_0"].specific_heat is materials["material_0_1"].specific_heat
+        assert isinstance(loaded.functions.functions["k_0"].x, buffer_types)
+        assert loaded.functions.functions["k_1"].x is loaded.functions.functions["k_0"].x
+    # and are still tracked, so a change shows in the next write
+    temperature.name = "temp"
+    written = io.StringIO()
+    loaded.write(written)
+    assert "variable=temp\n" in written.getvalue()
+
+    # only public classes of the package are written or made
+    try:
+        write_snapshot({"a": io.StringIO()}, tmp_path / "bad.snap")
+        assert False
+    except TypeError:
+        pass
+    data = filename.read_bytes()
+    length = struct.unpack_from("<Q", data, 16)[0]
+    header = json.loads(data[24:24 + length])
+    header["objects"][0][0] = "Popen"
+    bad = json.dumps(header).encode()
+    # a class not made public, and a version newer than this release reads
+    for version, content in ((1, bad), (2, b"")):
+        (tmp_path / "bad.snap").write_bytes(struct.pack("<8sIIQ", b"MOOSESNP", version, 0,
+                                                        len(content)) + content)
+        try:
+            read_snapshot(tmp_path / "bad.snap")
+            assert False
+        except ValueError:
+            pass
+
+    # and only the attributes of a class are set on its objects
+    small = MOOSEInput()
+    small.variables = moose.variables
+    small.components = moose.components
+    small.write_snapshot(tmp_path / "small.snap")
+    data = (tmp_path / "small.snap").read_bytes()
+    length = struct.unpack_from("<Q", data, 16)[0]
+    classes = [name for name, _ in json.loads(data[24:24 + length])["objects"]]
+    variable = classes.index("Variable")
+    component = classes.index("FlowChannel1Phase")
+    for idx, name in ((variable, "_render_cache"), (variable, "extra"), (variable, "__class__"),
+                      (component, "render"), (component, "_changed")):
+        changed = json.loads(data[24:24 + length])
+        assert not changed["tables"]
+        changed["objects"][idx][1][name] = 1
+        content = json.dumps(changed).encode()
+        (tmp_path / "bad.snap").write_bytes(struct.pack("<8sIIQ", b"MOOSESNP", 1, 0,
+                                                        len(content)) + content)
+        try:
+            read_snapshot(tmp_path / "bad.snap")
+            assert False, name
+        except ValueError:
+            pass
+
+def test_results(tmp_path):
+    import os
+    import sys
+    from moose.moose import MOOSEInput
+    from moose.variables import Variables
+    from moose.mesh import Mesh
+    from moose.executioner import Executioner
+    from moose.results import ResultCache, fingerprint
+    from moose.runner import Runner
+
+    def model(order, dt):
+        moose = MOOSEInput()
+        moose.mesh = Mesh()
+        moose.mesh.add_mesh_object("mesh", 1, filename="mesh.e")
+        moose.variables = Variables()
+        for name in order:
+            moose.variables.add_variable(name,1,1,"")
+        moose.executioner = Executioner(type="Transient", dt=dt)
+        return moose
+
+    (tmp_path / "mesh.e").write_bytes(b"mesh 1")
+    first = model(["a", "b"], "1000")
+    assert first.fingerprint(tmp_path) == model(["b", "a"], "1e3").fingerprint(tmp_path)
+    assert first.fingerprint(tmp_path) != model(["a", "b"], "1001").fingerprint(tmp_path)
+    # the mesh is taken by its content
+    key = first.fingerprint(tmp_path)
+    (tmp_path / "mesh.e").write_bytes(b"mesh 2")
+    assert first.fingerprint(tmp_path) != key
+
+    # a stand-in for the application counting its runs and writing a csv
+    stand_in = tmp_path / "stand_in.py"
+    stand_in.write_text('import sys\n'
+                        'name = sys.argv[sys.argv.index("-i") + 1]\n'
+                        'open("runs", "a").write(name + "\\n")\n'
+                        'open(name[:-2] + "_out.csv", "w").write("time,avg\\n0," + str(len(name)) + "\\n")\n'
+                        'print("ran", name)\n')
+    inputs = []
+    for idx in range(4):
+        path = tmp_path / f"case_{idx}.i"
+        model(["a", "b"] if idx % 2 else ["b", "a"], "1000" if idx < 2 else "2").write(str(path))
+        inputs.append(path)
+    cache = ResultCache(tmp_path / "cache")
+    runner = Runner([sys.executable, stand_in], concurrency=1, cache=cache)
+    first_run = runner.run(inputs)
+    assert all(result.ok() for result in first_run)
+    # case_1 is case_0 with its variables in another order
+    assert [result.cached for result in first_run] == [False, True, False, True]
+    assert (tmp_path / "runs").read_text().split() == ["case_0.i", "case_2.i"]
+    assert (tmp_path / "case_1_out.csv").read_text() == "time,avg\n0,8\n"
+    assert "ran case_0.i" in (tmp_path / "case_1.log").read_text()
+
+    for idx in range(4):
+        os.remove(tmp_path / f"case_{idx}_out.csv")
+    second_run = runner.run(inputs)
+    assert all(result.cached for result in second_run) and cache.hits == 6
+    assert (tmp_path / "runs").read_text().split() == ["case_0.i", "case_2.i"]
+    assert (tmp_path / "case_2_out.csv").exists()
+    assert second_run[2].as_dict()["cached"]
+
+    # entries are evicted by age, then least recently used first by size
+    assert len(cache.entries()) == 2 and fingerprint(inputs[0], extra=runner._identity()) in cache
+    keys = sorted(cache.entries(), key=lambda entry: entry[2])
+    cache.max_bytes = cache.size() - 1
+    assert cache.evict() == 1 and [key for key, _, _ in cache.entries()] == [keys[1][0]]
+    cache.max_age = 60
+    assert cache.evict(now=keys[1][2] + 120) == 1 and cache.entries() == []
+
+def test_material_library(tmp_path):
+    import io
+    import os
+    import json
+    import pickle
+    from moose.moose import MOOSEInput
+    from moose.variables import Variables
+    from moose.library import MaterialLibrary, PropertyUse
+    from moose.tables import buffer_types
+    library_dir = tmp_path / "library"
+    (library_dir / "copper").mkdir(parents=True)
+    (library_dir / "copper" / "cucrzr.csv").write_text(
+        "temperature,density,specificheat,thermal_conductivity\n"
+        "300,8900,390,320\n"
+        "400,8870,,318\n"
+        "500,8840,400,316\n")
+    (library_dir / "tungsten.json").write_text(json.dumps(
+        {"density": {"x": [300, 1000], "y": [19300, 19000]},
+         "thermal_expansion": {"x": [300, 1000], "y": [4.5e-6, 4.8e-6]}}))
+    # only the alloys used are read
+    (library_dir / "broken.csv").write_text("temperature,density\n300,not a number\n")
+    (library_dir / "notes.txt").write_text("not a property file")
+
+    library = MaterialLibrary(library_dir)
+    assert sorted(library.alloys()) == ["broken", "cucrzr", "tungsten"]
+    x, y = library.table("cucrzr", "specific_heat")
+    assert isinstance(x, buffer_types) and list(x) == [300, 500] and list(y) == [390, 400]
+    assert library.table("cucrzr", "Specific Heat") is library.table("cucrzr", "specificheat")
+    assert library.function("cucrzr", "density") is library.function("cucrzr", "density")
+    assert "broken" not in library._loaded
+    try:
+        library.table("broken", "density")
+        assert False
+    except ValueError:
+        pass
+
+    moose = MOOSEInput()
+    moose.variables = Variables()
+    moose.variables.add_variable("temperature",1,1,"")
+    temperature = moose.variables.variables["temperature"]
+    made = library.add_alloy(moose, "cucrzr", "armour", temperature)
+    assert sorted(made) == ["density", "specific_heat", "thermal_conductivity"]
+    made = library.add_alloy(moose, "tungsten", "hs:tile", temperature, name="tile")
+    assert made["thermal_expansion"].name == "tile-thermal_expansion-function"
+    text = io.StringIO()
+    moose.write(text)
+    assert 'property="specific_heat"' in text.getvalue()
+    assert "[tile-thermal_expansion-function]" in text.getvalue()
+    mapping = {"density": (PropertyUse.FUNCTION, "rho")}
+    assert list(library.add_alloy(moose, "cucrzr", "armour", temperature, mapping)) == ["density"]
+    dictionary = library.material_dictionary({"armour": "cucrzr"})
+    assert dictionary["armour"]["density"] is library.function("cucrzr", "density")
+
+    # a worker is sent the index alone
+    loaded = pickle.loads(pickle.dumps(library))
+    assert loaded._loaded == {} and sorted(loaded.alloys()) == sorted(library.alloys())
+
+    snapshot_dir = tmp_path / "snapshot"
+    snapshot_dir.mkdir()
+    library.write_snapshot(snapshot_dir / "alloys.snap", ["cucrzr", "tungsten"])
+    # files that cannot be read are skipped
+    (snapshot_dir / "more.h5").write_bytes(b"")
+    (snapshot_dir / "more.snap").write_bytes(b"not a snapshot")
+    frozen = MaterialLibrary(snapshot_dir)
+    assert sorted(frozen.alloys()) == ["cucrzr", "tungsten"]
+    assert list(frozen.table("tungsten", "density")[1]) == [19300, 19000]
+    assert sorted(os.path.basename(path) for path, _ in frozen.skipped) == ["more.h5", "more.snap"]
+
+    from moose.library import h5py
+    if h5py is None:
+        return
+    hdf5_dir = tmp_path / "hdf5"
+    hdf5_dir.mkdir()
+    with h5py.File(hdf5_dir / "alloys.h5", "w") as file:
+        for alloy, density in (("steel", 7900.), ("inconel", 8200.)):
+            group = file.create_group(f"{alloy}/density")
+            group["x"] = [300., 800.]
+            group["y"] = [density, density - 100.]
+    with h5py.File(hdf5_dir / "copper.h5", "w") as file:
+        file["thermal_conductivity/x"] = [300., 600.]
+        file["thermal_conductivity/y"] = [400., 380.]
+    library = MaterialLibrary(hdf5_dir)
+    assert sorted(library.alloys()) == ["copper", "inconel", "steel"] and library.skipped == []
+    assert list(library.table("inconel", "density")[1]) == [8200., 8100.]
+    assert list(library.table("copper", "thermal conductivity")[0]) == [300., 600.]
+
+def test_write_only_stream(tmp_path):
+    import io
+    from moose.moose import MOOSEInput
+    from moose.variables import Variables
+    from moose.executioner import Executioner
+    # any object with a write method will do
+    class Stream():
+        def __init__(self):
+            self.pieces = []
+        def write(self, text):
+            self.pieces.append(text)
+    moose = MOOSEInput()
+    moose.variables = Variables()
+    moose.variables.add_variable("temperature",1,1,"")
+    moose.executioner = Executioner(type="Transient", dt="100")
+    expected = io.StringIO()
+    moose.write(expected)
+    for _ in range(2):
+        stream = Stream()
+        assert moose.write(stream)
+        assert ''.join(stream.pieces) == expected.getvalue()
+    stream = Stream()
+    moose.write(stream, split_dir=str(tmp_path / "blocks"))
+    assert ''.join(stream.pieces).startswith("!include ")
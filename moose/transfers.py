@@ -1,6 +1,8 @@
 #!/usr/env/python3
 
 from enum import IntEnum, auto
+from moose.render import Renderable, refers
+import moose.bulk as bulk
 
 class TransferType(IntEnum):
     MultiAppCloneReporterTransfer = auto()
@@ -21,7 +23,7 @@ class TransferType(IntEnum):
     MultiAppVariableValueSampleTransfer = auto()
     MultiAppVectorPostprocessorTransfer = auto()
 
-class Transfer:
+class Transfer(Renderable):
     def __init__(self, name = "", source_variable = "", aux_variable = "", \
         **kwargs):
         self.name = name
@@ -45,12 +47,12 @@ class Transfer:
             if key not in objects:
                 data = self.__dict__[key]
                 if isinstance(data,list):
-                    if hasattr(data[0], '__dict__'):
+                    if refers(data[0]):
                         data = [x.name for x in data]
                     else:
                         data = [str(x) for x in data]
                     data = ' '.join(data)
-                if hasattr(data, '__dict__'):
+                if refers(data):
                     data = data.name
                 string += f'{key}="{data}"\n'
 
@@ -63,14 +65,46 @@ class MultiAppNearestNodeTransfer(Transfer):
         super().__init__(name,source_variable,aux_variable,**kwargs)
         self.type = TransferType.MultiAppNearestNodeTransfer
 
-class Transfers:
+class Transfers(Renderable):
     def __init__(self):
         self.name = "Transfers"
         self.transfers = {}
 
+    def add_transfer(self, name, type, source_variable, aux_variable, **kwargs):
+        """ add a transfer of type, made by the class of that name if there
+        is one, or a Transfer with kwargs as its parameters """
+        if name in self.transfers.keys():
+            print(f'transfer name {name} already in use')
+        transfer_type = TransferType(type)
+        kwargs['source_variable'] = source_variable
+        kwargs['variable'] = aux_variable
+        self.transfers[name] = _construct_transfer(self.registry[transfer_type],
+            transfer_type, name, kwargs)
+
+    def add_many(self, data, references = None):
+        """ add a transfer for each row of data, see moose.bulk; the variable
+        column is the aux_variable of each. Returns them """
+        return bulk.add_many(self.transfers, data, TransferType, self.registry,
+            _construct_transfer, references)
+
+    def children(self):
+        return self.transfers
+
+    def write_hit(self, writer):
+        writer.write_collection(self.name, self.transfers.values())
+
     def __str__(self):
         string =  f'[{self.name}]\n'
         for transfer in self.transfers.keys():
             string += self.transfers[transfer].__str__()
         string += '[]\n'
-        return string
\ No newline at end of file
+        return string
+
+def _construct_transfer(cls, transfer_type, name, kwargs):
+    transfer = cls(name, kwargs.pop('source_variable', ""), kwargs.pop('variable', ""), **kwargs)
+    transfer.type = transfer_type
+    return transfer
+
+# the class of each transfer type, for add_transfer and add_many
+Transfers.registry = {transfer_type: globals().get(transfer_type.name, Transfer)
+    for transfer_type in TransferType}
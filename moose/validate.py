@@ -0,0 +1,267 @@
+#!/usr/env/python3
+
+""" Checking the references between the objects of a MOOSEInput before it
+is run. One pass over the input indexes the names of its variables, aux
+variables, functions, material properties, components, mesh objects and
+multiapps in sets, and a second checks every reference made by kernels,
+aux kernels, BCs, materials, transfers, postprocessors, components and
+mesh objects against them, so the whole check is linear in the size of
+the input. References may be objects or names, as built or as read.
+
+Blocks and boundaries are only checked against the names given, as the
+input itself does not declare them. Material properties are checked
+unless a material of a type not known here might declare them.
+"""
+
+from moose.reader import HITNode
+from moose.render import refers
+
+# what a reference refers to
+VARIABLE = 'variable'
+AUX_VARIABLE = 'aux variable'
+FUNCTION = 'function'
+PROPERTY = 'material property'
+COMPONENT = 'component'
+MESH_OBJECT = 'mesh object'
+MULTIAPP = 'multiapp'
+BLOCK = 'block'
+BOUNDARY = 'boundary'
+
+# the attributes of the objects of each collection that refer to others
+references = {
+    'mesh': {'input': MESH_OBJECT},
+    'components': {'input': COMPONENT, 'flow_channel': COMPONENT,
+                   'flow_channels': COMPONENT, 'hs': COMPONENT,
+                   'heat_structure': COMPONENT, 'connections': COMPONENT},
+    'kernels': {'variable': VARIABLE, 'displacements': VARIABLE, 'block': BLOCK,
+                'thermal_conductivity': PROPERTY, 'specific_heat': PROPERTY,
+                'density_name': PROPERTY, 'eigenstrain_names': PROPERTY},
+    'aux_kernels': {'variable': AUX_VARIABLE, 'args': VARIABLE, 'block': BLOCK,
+                    'rank_two_tensor': PROPERTY},
+    'boundary_conditions': {'variable': VARIABLE, 'displacements': VARIABLE,
+                            'boundary': BOUNDARY},
+    'materials': {'variable': VARIABLE, 'temp': VARIABLE, 'displacements': VARIABLE,
+                  'block': BLOCK, 'specific_heat': FUNCTION,
+                  'thermal_conductivity': FUNCTION, 'thermal_expansion': FUNCTION,
+                  'prop_values': FUNCTION, 'eigenstrain_names': PROPERTY},
+    'transfers': {'variable': AUX_VARIABLE, 'from_multi_app': MULTIAPP,
+                  'to_multi_app': MULTIAPP},
+    'post_processors': {'variable': VARIABLE, 'block': BLOCK},
+}
+
+# the properties each type of material declares, besides those it names in
+# property_attributes
+declared_properties = {
+    'ADHeatConductionMaterial': ('thermal_conductivity', 'specific_heat'),
+    'ADComputeVariableIsotropicElasticityTensor': ('elasticity_tensor',),
+    'ADComputeSmallStrain': ('total_strain', 'mechanical_strain'),
+    'ADComputeLinearElasticStress': ('stress',),
+}
+property_attributes = ('property', 'f_name', 'prop_names', 'eigenstrain_name')
+
+# the material types whose properties are all known
+known_materials = set(declared_properties) | {'ADPiecewiseLinearInterpolationMaterial',
+    'ADParsedMaterial', 'ADComputeMeanThermalExpansionFunctionEigenstrain',
+    'ADGenericFunctionMaterial', 'GenericConstantMaterial', 'GenericFunctionMaterial'}
+
+class Problem():
+    """ a reference at path to a name that is not declared """
+    def __init__(self, path, message):
+        self.path = path
+        self.message = message
+
+    def __str__(self):
+        return f'{self.path}: {self.message}'
+
+    def __repr__(self):
+        return f'Problem({self.path!r}, {self.message!r})'
+
+def _get(obj, key):
+    if isinstance(obj, HITNode):
+        return obj.params.get(key)
+    return getattr(obj, key, None)
+
+def _type_name(obj):
+    if isinstance(obj, HITNode):
+        return obj.params.get('type', '')
+    return type(obj).__name__
+
+def _names(value):
+    # the names value refers to: an object, a name, several separated by
+    # spaces, or a list of any of these
+    if value is None or value == '':
+        return ()
+    if isinstance(value, str):
+        return value.split()
+    if isinstance(value, (list, tuple)):
+        return [name for item in value for name in _names(item)]
+    if refers(value):
+        name = getattr(value, 'name', None)
+        return (name,) if isinstance(name, str) and name else ()
+    return ()
+
+def _children(block):
+    if block is None:
+        return {}
+    if isinstance(block, HITNode):
+        return {child.name: child for child in block.children}
+    return block.children()
+
+class Index():
+    """ the names declared by an input, each kind a set. properties holds
+    the blocks each material property is declared on, None for all """
+    def __init__(self, moose, blocks = None, boundaries = None, variables = ()):
+        self.variables = set(variables)
+        self.aux_variables = set(_children(moose.aux_variables))
+        self.variables.update(_children(moose.variables))
+        self.variables.update(self.aux_variables)
+        self.functions = set(_children(moose.functions))
+        self.components = set(_children(moose.components))
+        self.mesh_objects = set(_children(moose.mesh))
+        self.multiapps = set(_children(moose.multiapps))
+        self.blocks = set(blocks) if blocks is not None else None
+        self.boundaries = set(boundaries) if boundaries is not None else None
+        self.properties = {}
+        self.complete_properties = True
+        for material in _children(moose.materials).values():
+            type_name = _type_name(material)
+            if type_name not in known_materials:
+                self.complete_properties = False
+            names = list(declared_properties.get(type_name, ()))
+            for key in property_attributes:
+                names.extend(_names(_get(material, key)))
+            material_blocks = _names(_get(material, 'block'))
+            for name in names:
+                if not material_blocks:
+                    self.properties[name] = None
+                elif name not in self.properties:
+                    self.properties[name] = set(material_blocks)
+                elif self.properties[name] is not None:
+                    self.properties[name].update(material_blocks)
+        self.declared = {VARIABLE: self.variables, AUX_VARIABLE: self.aux_variables,
+                         FUNCTION: self.functions, COMPONENT: self.components,
+                         MESH_OBJECT: self.mesh_objects, MULTIAPP: self.multiapps,
+                         BLOCK: self.blocks, BOUNDARY: self.boundaries}
+
+def validate(moose, blocks = None, boundaries = None, variables = ()):
+    """ the list of Problems with the references of moose, empty if there
+    are none. blocks and boundaries are the names of those of the mesh, and
+    variables any variables made by MOOSE itself that are not declared """
+    checker = _Checker(moose, Index(moose, blocks, boundaries, variables))
+    problems = []
+    for attribute, kinds in references.items():
+        collection = getattr(moose, attribute)
+        if collection:
+            checker.check(collection, kinds, problems)
+    return problems
+
+def _plan(cls, kinds):
+    # the (key, kind) of kinds an object of cls can have set
+    if cls is HITNode or getattr(cls, '__dictoffset__', 0):
+        return list(kinds.items())
+    slots = set()
+    for base in cls.__mro__:
+        slots.update(getattr(base, '__slots__', ()))
+    return [(key, kind) for key, kind in kinds.items() if key in slots]
+
+class _Checker():
+    # checks references, remembering what it found for each value, so a
+    # value shared by many objects is only looked into once
+    def __init__(self, moose, index):
+        self.moose = moose
+        self.index = index
+        self.values = {}
+        self.properties = {}
+        self.variable_blocks = {}
+
+    def check(self, collection, kinds, problems):
+        plans = {}
+        for name, obj in _children(collection).items():
+            plan = plans.get(obj.__class__)
+            if plan is None:
+                plan = plans[obj.__class__] = _plan(obj.__class__, kinds)
+            node = isinstance(obj, HITNode)
+            found = []
+            object_blocks = ()
+            used = []
+            for key, kind in plan:
+                value = obj.params.get(key) if node else getattr(obj, key, None)
+                if value is None:
+                    continue
+                # the same key may refer to another kind in another collection
+                memo = (key, kind, value if value.__class__ is str else id(value))
+                checked = self.values.get(memo)
+                if checked is None:
+                    checked = self.values[memo] = self._check_value(key, kind, value)
+                names, messages = checked
+                found.extend(messages)
+                if kind == BLOCK:
+                    object_blocks = names
+                elif kind == PROPERTY and names:
+                    used.append((key, names))
+            if self.index.complete_properties:
+                for key, names in used:
+                    found.extend(self._check_properties(key, names, object_blocks))
+            if object_blocks:
+                variable = obj.params.get('variable') if node else getattr(obj, 'variable', None)
+                if variable is not None:
+                    found.extend(self._check_variable_blocks(variable, object_blocks))
+            if found:
+                path = f'{collection.name}/{name}'
+                problems.extend(Problem(path, message) for message in found)
+
+    def _check_value(self, key, kind, value):
+        # the names value refers to, and messages for those not declared
+        names = tuple(_names(value))
+        known = self.index.declared.get(kind)
+        if known is None:
+            return names, ()
+        if kind == COMPONENT:
+            # connections are given as component:in or component:out
+            names = tuple(x.split(':', 1)[0] for x in names)
+        return names, tuple(f'{key} refers to {kind} {missing}, which is not declared'
+                            for missing in names if missing not in known)
+
+    def _check_properties(self, key, names, object_blocks):
+        # the material properties used must be declared on all the blocks
+        memo = (key, names, object_blocks)
+        messages = self.properties.get(memo)
+        if messages is not None:
+            return messages
+        messages = []
+        properties = self.index.properties
+        for name in names:
+            if name not in properties:
+                messages.append(f'{key} refers to {PROPERTY} {name}, which no material declares')
+                continue
+            on = properties[name]
+            needed = object_blocks or self.index.blocks or ()
+            missing = [block for block in needed if on is not None and block not in on]
+            if missing:
+                messages.append(f'{key} refers to {PROPERTY} {name}, which is not declared '
+                                f'on block {" ".join(missing)}')
+        self.properties[memo] = messages
+        return messages
+
+    def _check_variable_blocks(self, variable, object_blocks):
+        # an object restricted to blocks may only act on a variable that
+        # exists on all of them
+        memo = (variable if variable.__class__ is str else id(variable), object_blocks)
+        messages = self.variable_blocks.get(memo)
+        if messages is not None:
+            return messages
+        messages = []
+        if not refers(variable):
+            for collection in (self.moose.variables, self.moose.aux_variables):
+                declared = _children(collection).get(variable) if collection else None
+                if declared is not None:
+                    variable = declared
+                    break
+        if refers(variable):
+            variable_blocks = _names(_get(variable, 'block'))
+            missing = [block for block in object_blocks if block not in variable_blocks]
+            if variable_blocks and missing:
+                messages.append(f'variable {variable.name} does not exist on block '
+                                f'{" ".join(missing)}')
+        self.variable_blocks[memo] = messages
+        return messages
@@ -1,6 +1,7 @@
 #!/usr/env/python3
 
 from enum import IntEnum, auto
+from moose.render import Renderable
 
 class Order(IntEnum):
     CONSTANT = auto()
@@ -27,7 +28,8 @@ class Family(IntEnum):
     RATIONAL_BERNSTEIN = auto()
     SIDE_HIERARCHIC = auto()
     
-class Variable():
+class Variable(Renderable):
+    __slots__ = ('name', 'order', 'family', 'block')
     def __init__(self, name = "", order = 1, family = 1, block = ""):
         self.name = name
         self.order = Order(order)
@@ -44,10 +46,11 @@ class Variable():
         return string
 
 class AuxVariable(Variable):
+    __slots__ = ()
     def __init__(self, name = "", order = 1, family = 1, block = ""):
         super().__init__(name,order,family,block)
 
-class Variables():
+class Variables(Renderable):
     def __init__(self):
         self.name = "Variables"
         self.variables = {}
@@ -59,6 +62,12 @@ class Variables():
             
         self.variables[variable.name] = variable
 
+    def children(self):
+        return self.variables
+
+    def write_hit(self, writer):
+        writer.write_collection(self.name, self.variables.values())
+
     def __str__(self):
         string = f'[{self.name}]\n'
         for variable in self.variables.keys():
@@ -0,0 +1,167 @@
+#!/usr/env/python3
+
+""" A HITWriter streams blocks straight to an output stream one line at a
+time, tracking the nesting depth as the block tree is walked rather than
+recovering it afterwards from the finished text. Renderable objects are
+written from their render cache
+"""
+
+import os
+import re
+
+from moose.render import Renderable, render_cache
+from moose.tables import format_columns, table_digest
+
+class TableFiles():
+    """ tables of threshold or more points written to csv files in
+    directory rather than inline, for the functions that can read them
+    from a data_file. Each file is named by a hash of the table's values,
+    so a table is written once however many inputs refer to it, and a file
+    of that name is never rewritten. reference is the directory as written
+    in the input, relative to the input file, directory if None """
+    def __init__(self, directory, threshold = 1000, reference = None):
+        self.directory = directory
+        self.threshold = threshold
+        self.reference = directory if reference is None else reference
+        self.written = set()
+
+    def cache_key(self):
+        # the directory too, as text cached for one directory has not
+        # written its tables to another
+        return (os.path.abspath(self.directory), self.reference, self.threshold)
+
+    def write(self, x, y):
+        """ the data_file of the table x, y, writing it if needed """
+        name = f'table_{table_digest(x, y)[:20]}.csv'
+        if name not in self.written:
+            path = os.path.join(self.directory, name)
+            if not os.path.exists(path):
+                os.makedirs(self.directory, exist_ok=True)
+                # written under a temporary name and moved into place, so
+                # another process writing the same table never sees half
+                temporary = f'{path}.{os.getpid()}.tmp'
+                with open(temporary, 'w') as file:
+                    file.write(format_columns(x, y))
+                os.replace(temporary, path)
+            self.written.add(name)
+        return f'{self.reference}/{name}' if self.reference else name
+
+class BlockFiles():
+    """ top level blocks written each to its own file in directory, for a
+    master input that joins them with !include. As with TableFiles, each
+    file is named by the block and a hash of its text, so a block is
+    written once however many inputs or rewrites share it, and a file of
+    that name is never rewritten. reference is the directory as written in
+    the master input, relative to it. Files of blocks no input includes
+    any more are left in directory until prune() """
+    _name = re.compile(r'.+_[0-9a-f]{20}\.i')
+    _include = re.compile(r'^[ \t]*!include[ \t]+(\S+)[ \t]*$', re.MULTILINE)
+
+    def __init__(self, directory, reference = None):
+        self.directory = directory
+        self.reference = directory if reference is None else reference
+        self.written = 0
+
+    def write(self, name, digest, pieces):
+        """ the path to include for the block name, its text being pieces
+        with the hex digest, writing the file if there is none """
+        filename = f'{name}_{digest[:20]}.i'
+        path = os.path.join(self.directory, filename)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            temporary = f'{path}.{os.getpid()}.tmp'
+            with open(temporary, 'w') as file:
+                file.writelines(pieces)
+            os.replace(temporary, path)
+            self.written = self.written + 1
+        return f'{self.reference}/{filename}' if self.reference else filename
+
+    def prune(self, inputs, dry_run = False):
+        """ remove every block file in directory that none of inputs, the
+        paths of master inputs, includes, and return their paths. This
+        deletes the blocks of any input not given, such as those of other
+        sweeps sharing directory, so inputs must be all that are still
+        used; with dry_run, only the paths that would be removed are
+        returned """
+        included = set()
+        for input in inputs:
+            directory = os.path.dirname(os.path.abspath(input))
+            with open(input, 'r') as file:
+                for path in self._include.findall(file.read()):
+                    included.add(os.path.normpath(os.path.join(directory, path)))
+        removed = []
+        for entry in os.scandir(self.directory):
+            if self._name.fullmatch(entry.name) and os.path.abspath(entry.path) not in included:
+                if not dry_run:
+                    os.remove(entry.path)
+                removed.append(entry.path)
+        return removed
+
+class HITWriter():
+    def __init__(self, stream, indent = 2, tables = None):
+        self.stream = stream
+        self.indent = indent
+        self.depth = 0
+        # a TableFiles to write large tables to, or None to write them inline
+        self.tables = tables
+
+    def cache_key(self):
+        # everything about this writer that changes the text it writes
+        tables = None if self.tables is None else self.tables.cache_key()
+        return (self.depth, self.indent, tables)
+
+    def branch(self, stream):
+        # a writer like this one at the same depth, writing to stream
+        writer = self.__class__.__new__(self.__class__)
+        writer.__dict__.update(self.__dict__)
+        writer.stream = stream
+        return writer
+
+    def write_line(self, line):
+        if self.depth > 0:
+            line = ' '*(self.indent*self.depth) + line
+        self.stream.write(line + '\n')
+
+    def open_block(self, name):
+        self.write_line(f'[{name}]')
+        self.depth = self.depth + 1
+
+    def close_block(self):
+        self.depth = self.depth - 1
+        self.write_line('[]')
+
+    def format_text(self, text):
+        """ text indented for the current depth; text is the __str__ of a
+        single object, so it is small. The depth is adjusted on the [name]
+        and [] lines it contains and left where text leaves it """
+        lines = text.split('\n')
+        if lines[-1] == '':
+            lines.pop()
+        depth = self.depth
+        for idx, line in enumerate(lines):
+            if line == '[]':
+                depth = depth - 1
+            if depth > 0:
+                lines[idx] = ' '*(self.indent*depth) + line
+            if line != '[]' and line.startswith('['):
+                depth = depth + 1
+        self.depth = depth
+        lines.append('')
+        return '\n'.join(lines)
+
+    def write_text(self, text):
+        self.stream.write(self.format_text(text))
+
+    def write_object(self, obj):
+        if render_cache.enabled and isinstance(obj, Renderable):
+            obj.write_rendered(self)
+        elif hasattr(obj, 'write_hit'):
+            obj.write_hit(self)
+        else:
+            self.write_text(obj.__str__())
+
+    def write_collection(self, name, objects):
+        self.open_block(name)
+        for obj in objects:
+            self.write_object(obj)
+        self.close_block()